@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+#SETMODE 777
+
+#----------------------------------------------------------------------------------------#
+#------------------------------------------------------------------------------ HEADER --#
+
+"""
+:author:
+    kpm200000
+
+:synopsis:
+    This module builds stacks of objects from the command line with mayapy.
+
+:description:
+    This module starts Maya in batch mode, opens a scene, builds stacks from the base,
+    middle, and top objects named on the command line, or from a saved stack plan, using
+    the builder module, and saves the result to a new scene. A JSON report of the
+    build, including its stack plan and seed, is written alongside it. Every run is
+    independent, so large builds can be split across farm jobs that each use their own
+    scene, seed, and output file, and within a run the stacks can be planned and laid
+    out in several processes with --processes.
+
+    Example:
+        mayapy -m td_maya_tools.batch_build --scene props.ma --output stacks.ma
+            --bases crate1 crate2 --middles box1 box2 --tops lid1 --count 1000
+            --max-height 6 --separation 0.1 --seed 7
+
+:applications:
+    Maya
+
+:see_also:
+    builder
+"""
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- IMPORTS --#
+
+# Default Python Imports
+import argparse
+import json
+import sys
+
+# Imports That You Wrote
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- FUNCTIONS --#
+
+def parse_args(argv=None):
+    """
+    This function reads the build options from the command line.
+
+    :param argv: The command line arguments, not including the program name.
+    :type: list
+
+    :return: The build options.
+    :type: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description='Build stacks of objects in batch '
+                                                 'mode.')
+    parser.add_argument('--scene', required=True,
+                        help='The scene containing the objects to stack.')
+    parser.add_argument('--output', required=True,
+                        help='Where to save the scene with the stacks.')
+    parser.add_argument('--bases', nargs='+',
+                        help='The objects to choose the base of each stack from.')
+    parser.add_argument('--middles', nargs='+',
+                        help='The objects to choose the middle pieces from.')
+    parser.add_argument('--tops', nargs='+',
+                        help='The objects to choose the top of each stack from.')
+    parser.add_argument('--count', type=int, default=3,
+                        help='The number of stacks to make.')
+    parser.add_argument('--max-height', type=int, default=3,
+                        help='The maximum number of middle pieces in a stack.')
+    parser.add_argument('--separation', type=float, default=0.1,
+                        help='The distance between neighbouring stacks.')
+    parser.add_argument('--per-row', type=int, default=None,
+                        help='The number of stacks in each row of the grid.')
+    parser.add_argument('--row-separation', type=float, default=None,
+                        help='The distance between neighbouring rows.')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='The seed for the random choices.')
+    parser.add_argument('--instance', action='store_true',
+                        help='Make instances instead of full copies.')
+    parser.add_argument('--tight', action='store_true',
+                        help='Stack pieces on their lowest and highest vertices '
+                             'instead of their bounding boxes.')
+    parser.add_argument('--target-height', type=float, default=None,
+                        help='The height to fill each stack to with middle pieces, '
+                             'instead of a random number of them.')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='How far above or below the target height a stack may '
+                             'be.')
+    parser.add_argument('--plan', default=None,
+                        help='A saved stack plan to build instead of planning one.')
+    parser.add_argument('--plan-cache', default=None,
+                        help='A directory of cached stack plans to reuse and add to.')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='The most processes to plan and lay out the stacks in.')
+    parser.add_argument('--profile', default=None,
+                        help='Where to write a JSON profile of the build\'s phases and '
+                             'Maya commands.')
+    parser.add_argument('--report', default=None,
+                        help='Where to write the JSON report. Defaults to the output '
+                             'scene path with a .json extension.')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    This function builds the stacks described on the command line and saves them.
+
+    :param argv: The command line arguments, not including the program name.
+    :type: list
+
+    :return: The exit code, zero if the build succeeded.
+    :type: int
+    """
+    args = parse_args(argv)
+    # Start Maya in batch mode before using any Maya commands
+    import maya.standalone
+    maya.standalone.initialize(name='python')
+    try:
+        import maya.cmds as cmds
+        from td_maya_tools.builder import build_stacks
+        from td_maya_tools.planner import PlanCache
+        from td_maya_tools.planner import StackPlan
+        from td_maya_tools import profiling
+
+        # Open the scene that has the objects to stack
+        cmds.file(args.scene, open=True, force=True)
+        # Profile the build if asked to
+        if args.profile:
+            profiling.enable(args.profile)
+        # Load the saved plan and the plan cache, if they were given
+        plan = StackPlan.load(args.plan) if args.plan else None
+        plan_cache = PlanCache(args.plan_cache) if args.plan_cache else None
+        # Build the stacks
+        result = build_stacks(args.bases, args.middles, args.tops, args.count,
+                              args.max_height, args.separation, args.seed,
+                              args.instance, plan_cache, plan, args.per_row,
+                              args.row_separation, processes=args.processes,
+                              tight=args.tight, target_height=args.target_height,
+                              tolerance=args.tolerance)
+        if not result:
+            return 1
+        # Save the scene with the stacks in the format of its extension
+        file_type = 'mayaBinary' if args.output.endswith('.mb') else 'mayaAscii'
+        cmds.file(rename=args.output)
+        cmds.file(save=True, type=file_type, force=True)
+
+        # Write the report of the build
+        report_path = args.report or args.output.rsplit('.', 1)[0] + '.json'
+        with open(report_path, 'w') as report_fh:
+            json.dump(result.to_dict(), report_fh, indent=2)
+    finally:
+        maya.standalone.uninitialize()
+    return 0
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- CLASSES --#
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,782 @@
+#!/usr/bin/env python
+#SETMODE 777
+
+#----------------------------------------------------------------------------------------#
+#------------------------------------------------------------------------------ HEADER --#
+
+"""
+:author:
+    kpm200000
+
+:synopsis:
+    This module is an in-memory stand-in for maya.cmds that counts every command.
+
+:description:
+    This module lets the stacking tools run outside of Maya, for benchmarks on a plain
+    Linux machine. The FakeCmds class keeps a small scene of transforms, each with a
+    translation, an optional bounding box of its own geometry, a parent, and children,
+    and implements the commands the tools use on that scene. Rotation and scale are not
+    modelled. Every command call is counted, so benchmarks can report how many Maya
+    commands a code path issues as well as how long it takes.
+
+    The OpenMaya classes the tools use to set attributes with a DG modifier are faked
+    too, along with loading Python command plugins, so that commands registered by a
+    plugin can be called from the fake maya.cmds and are counted like the others.
+
+    The install function puts the fake in sys.modules as maya.cmds and
+    maya.api.OpenMaya, and makes the repository importable as td_maya_tools, so it must
+    be called before any of the tools are imported.
+
+:applications:
+    Maya
+
+:see_also:
+    run_benchmarks
+"""
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- IMPORTS --#
+
+# Default Python Imports
+import collections
+import importlib.util
+import os
+import re
+import sys
+import types
+
+# Imports That You Wrote
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- FUNCTIONS --#
+
+def install(repo_root=None):
+    """
+    This function installs the fake as maya.cmds and makes the repository importable
+    as the td_maya_tools package.
+
+    :param repo_root: The location of the repository on disk.
+    :type: str
+
+    :return: The fake commands.
+    :type: FakeCmds
+    """
+    fake_cmds = FakeCmds()
+    maya_module = types.ModuleType('maya')
+    maya_module.__path__ = []
+    maya_module.cmds = fake_cmds
+    sys.modules['maya'] = maya_module
+    sys.modules['maya.cmds'] = fake_cmds
+    # The OpenMaya classes work on the same fake scene
+    api_module = types.ModuleType('maya.api')
+    api_module.__path__ = []
+    open_maya = types.ModuleType('maya.api.OpenMaya')
+    for fake_class in (FakeSelectionList, FakeDGModifier, FakeDependencyNode,
+                       FakeUuid, FakeFn, FakePxCommand, FakePlugin):
+        setattr(open_maya, fake_class.api_name, fake_class)
+    FakeSelectionList.cmds = fake_cmds
+    FakePlugin.cmds = fake_cmds
+    api_module.OpenMaya = open_maya
+    maya_module.api = api_module
+    sys.modules['maya.api'] = api_module
+    sys.modules['maya.api.OpenMaya'] = open_maya
+    # The tools import each other through the td_maya_tools package
+    package = types.ModuleType('td_maya_tools')
+    package.__path__ = [repo_root]
+    sys.modules['td_maya_tools'] = package
+    return fake_cmds
+
+def flatten(args=None):
+    """
+    This function flattens the object arguments of a command, which may be given as
+    separate names or as lists of names.
+
+    :param args: The object arguments.
+    :type: tuple
+
+    :return: The object names.
+    :type: list
+    """
+    names = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            names.extend(arg)
+        else:
+            names.append(arg)
+    return names
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- CLASSES --#
+
+class FakeNode(object):
+    """
+    A transform in the fake scene.
+    """
+    def __init__(self, name=None, node_type='transform', geometry_box=None, uuid=None):
+        self.name = name
+        self.node_type = node_type
+        # The bounding box of the node's own geometry around its translation
+        self.geometry_box = list(geometry_box) if geometry_box else None
+        self.translate = [0.0, 0.0, 0.0]
+        self.parent = None
+        self.children = []
+        self.uuid = uuid
+        # The vertices of the node's mesh, in object space. If not set, the corners of
+        #   the geometry box are used
+        self.points = None
+        # The rotation and scale of the node, as the 3x3 part of its world matrix
+        self.linear = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0]
+
+    def hasFn(self, fn_type=None):
+        # The node stands in for its own OpenMaya MObject
+        return fn_type == FakeFn.kTransform and self.node_type == 'transform'
+
+class FakeCmds(object):
+    """
+    The subset of maya.cmds used by the stacking tools, working on an in-memory scene.
+    """
+    def __init__(self):
+        # The nodes of the scene, keyed by name
+        self.nodes = collections.OrderedDict()
+        # The names of the selected nodes
+        self.selection = []
+        # The number of calls made to each command
+        self.calls = collections.Counter()
+        # The last number used for each base name, for naming new nodes
+        self.name_counters = {}
+        self.uuid_counter = 0
+        # The callbacks of the script jobs, keyed by job number
+        self.script_jobs = {}
+        # The loaded plugins, keyed by path, and the commands they registered
+        self.plugins = {}
+        self.plugin_commands = {}
+
+    def __getattr__(self, name):
+        # Commands registered by plugins are called like any other command
+        plugin_commands = self.__dict__.get('plugin_commands', {})
+        if name not in plugin_commands:
+            raise AttributeError(name)
+        creator = plugin_commands[name]
+
+        def run_plugin_command(*args, **kwargs):
+            self.calls[name] += 1
+            command = creator()
+            command.doIt(args)
+            return None
+        return run_plugin_command
+
+    def reset(self):
+        """
+        Empties the scene and resets the call counts.
+        """
+        self.__init__()
+
+    def reset_calls(self):
+        """
+        Resets the call counts without changing the scene.
+        """
+        self.calls.clear()
+
+    def create_node(self, name=None, geometry_box=None, node_type='transform'):
+        """
+        Creates a node without counting a command call, for setting up a scene.
+
+        :param name: The name of the node. If it is taken, a number is added to it.
+        :type: str
+
+        :param geometry_box: The bounding box of the node's geometry, in the order
+        [xmin, ymin, zmin, xmax, ymax, zmax].
+        :type: list
+
+        :param node_type: The type of the node.
+        :type: str
+
+        :return: The name of the new node.
+        :type: str
+        """
+        if name in self.nodes:
+            # Add the next unused number to the base name, the way Maya does
+            base_name = re.sub(r'\d+$', '', name)
+            number = self.name_counters.get(base_name, 0)
+            while True:
+                number += 1
+                if f"{base_name}{number}" not in self.nodes:
+                    break
+            self.name_counters[base_name] = number
+            name = f"{base_name}{number}"
+        self.uuid_counter += 1
+        node = FakeNode(name, node_type, geometry_box,
+                        f"00000000-0000-0000-0000-{self.uuid_counter:012d}")
+        self.nodes[name] = node
+        return name
+
+    def get_node(self, name=None):
+        """
+        Returns the node with the given name or DAG path, raising like Maya if there is
+        none.
+
+        :param name: The name or DAG path of the node.
+        :type: str
+
+        :return: The node.
+        :type: FakeNode
+        """
+        if name in self.nodes:
+            return self.nodes[name]
+        # A DAG path names the node after its parents, up to the world if it starts
+        #   with a bar
+        path = name.split('|')
+        node = self.nodes.get(path[-1])
+        parent_names = path[1:-1] if path[0] == '' else path[:-1]
+        parent = node.parent if node is not None else None
+        for parent_name in reversed(parent_names):
+            if parent is None or parent.name != parent_name:
+                node = None
+                break
+            parent = parent.parent
+        if len(path) == 1 or node is None or (path[0] == '' and parent is not None):
+            raise ValueError(f"No object matches name: {name}")
+        return node
+
+    def world_translation(self, node=None):
+        """
+        Returns the world space translation of a node.
+
+        :param node: The node.
+        :type: FakeNode
+
+        :return: The (x, y, z) world translation.
+        :type: list
+        """
+        translation = list(node.translate)
+        parent = node.parent
+        while parent is not None:
+            translation = [value + offset for value, offset
+                           in zip(translation, parent.translate)]
+            parent = parent.parent
+        return translation
+
+    def world_bounding_box(self, node=None):
+        """
+        Returns the world space bounding box of a node and all of its children.
+
+        :param node: The node.
+        :type: FakeNode
+
+        :return: The bounding box, or None if there is no geometry under the node.
+        :type: list
+        """
+        boxes = []
+        if node.geometry_box:
+            translation = self.world_translation(node)
+            boxes.append([value + translation[index % 3]
+                          for index, value in enumerate(node.geometry_box)])
+        for child in node.children:
+            child_box = self.world_bounding_box(child)
+            if child_box:
+                boxes.append(child_box)
+        if not boxes:
+            return None
+        return ([min(box[index] for box in boxes) for index in range(3)]
+                + [max(box[index] for box in boxes) for index in range(3, 6)])
+
+    def shape_node(self, shape=None):
+        """
+        Returns the node that a mesh shape name, such as 'pCube1Shape', or its DAG path
+        belongs to. Every node with geometry has one mesh shape named after it.
+
+        :param shape: The name or DAG path of the shape, optionally with a component
+        after a dot.
+        :type: str
+
+        :return: The node.
+        :type: FakeNode
+        """
+        shape_name = shape.split('.', 1)[0]
+        if '|' in shape_name:
+            # The shape's DAG path goes through the node it belongs to
+            return self.get_node(shape_name.rsplit('|', 1)[0])
+        return self.get_node(shape_name[:-len('Shape')])
+
+    def is_shape(self, name=None):
+        """
+        Returns whether a name is the name of a node's mesh shape.
+
+        :param name: The name.
+        :type: str
+
+        :return: Whether it names a mesh shape.
+        :type: bool
+        """
+        if not name.endswith('Shape'):
+            return False
+        try:
+            node = self.shape_node(name)
+        except ValueError:
+            return False
+        return bool(node.geometry_box)
+
+    def full_path(self, node=None):
+        """
+        Returns the DAG path of a node, from the world down.
+
+        :param node: The node.
+        :type: FakeNode
+
+        :return: The DAG path.
+        :type: str
+        """
+        names = []
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return '|' + '|'.join(reversed(names))
+
+    def world_matrix(self, node=None):
+        """
+        Returns the world matrix of a node, as 16 values in row order.
+
+        :param node: The node.
+        :type: FakeNode
+
+        :return: The world matrix.
+        :type: list
+        """
+        linear = node.linear
+        return (list(linear[0:3]) + [0.0] + list(linear[3:6]) + [0.0]
+                + list(linear[6:9]) + [0.0] + self.world_translation(node) + [1.0])
+
+    def shape_points(self, node=None):
+        """
+        Returns the object space vertices of a node's mesh.
+
+        :param node: The node.
+        :type: FakeNode
+
+        :return: The (x, y, z) of every vertex.
+        :type: list
+        """
+        if node.points is not None:
+            return node.points
+        box = node.geometry_box
+        return [(x, y, z) for x in (box[0], box[3]) for y in (box[1], box[4])
+                for z in (box[2], box[5])]
+
+    def reparent(self, node=None, parent=None):
+        """
+        Moves a node under a new parent, keeping its world position.
+
+        :param node: The node to move.
+        :type: FakeNode
+
+        :param parent: The new parent, or None for the world.
+        :type: FakeNode
+        """
+        world = self.world_translation(node)
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        node.parent = parent
+        parent_world = [0.0, 0.0, 0.0]
+        if parent is not None:
+            parent.children.append(node)
+            parent_world = self.world_translation(parent)
+        node.translate = [value - offset for value, offset in zip(world, parent_world)]
+
+    def copy_node(self, name=None, parent=None):
+        """
+        Copies a node and its children.
+
+        :param name: The name of the node to copy.
+        :type: str
+
+        :param parent: The parent of the copy. If not given, the copy has the same
+        parent as the node.
+        :type: FakeNode
+
+        :return: The name of the copy.
+        :type: str
+        """
+        node = self.get_node(name)
+        copy = self.nodes[self.create_node(name, node.geometry_box, node.node_type)]
+        copy.translate = list(node.translate)
+        copy.parent = node.parent if parent is None else parent
+        if copy.parent is not None:
+            copy.parent.children.append(copy)
+        for child in node.children:
+            self.copy_node(child.name, copy)
+        return copy.name
+
+    # The commands ---------------------------------------------------------------------#
+
+    def xform(self, *objs, **kwargs):
+        self.calls['xform'] += 1
+        names = flatten(objs) or list(self.selection)
+        if kwargs.get('query'):
+            if '.vtx' in names[0]:
+                # The vertices of a mesh shape
+                return [value for point in self.shape_points(self.shape_node(names[0]))
+                        for value in point]
+            node = self.get_node(names[0])
+            if kwargs.get('boundingBox'):
+                return self.world_bounding_box(node) or [0.0] * 6
+            if kwargs.get('matrix') and kwargs.get('worldSpace'):
+                return self.world_matrix(node)
+            if kwargs.get('translation'):
+                if kwargs.get('worldSpace'):
+                    return self.world_translation(node)
+                return list(node.translate)
+            return None
+        for name in names:
+            node = self.get_node(name)
+            if kwargs.get('translation') is not None:
+                node.translate = [float(value) for value in kwargs['translation']]
+
+    def move(self, *args, **kwargs):
+        self.calls['move'] += 1
+        values = [float(arg) for arg in args[:3]]
+        names = flatten(args[3:]) or list(self.selection)
+        for name in names:
+            node = self.get_node(name)
+            if kwargs.get('relative'):
+                node.translate = [value + offset for value, offset
+                                  in zip(node.translate, values)]
+            else:
+                parent_world = [0.0, 0.0, 0.0]
+                if node.parent is not None:
+                    parent_world = self.world_translation(node.parent)
+                node.translate = [value - offset for value, offset
+                                  in zip(values, parent_world)]
+
+    def duplicate(self, *objs, **kwargs):
+        self.calls['duplicate'] += 1
+        return [self.copy_node(name) for name in flatten(objs)]
+
+    def instance(self, *objs, **kwargs):
+        self.calls['instance'] += 1
+        return [self.copy_node(name) for name in flatten(objs)]
+
+    def group(self, *objs, **kwargs):
+        self.calls['group'] += 1
+        group_name = self.create_node(kwargs.get('name') or 'group1')
+        group_node = self.nodes[group_name]
+        for name in flatten(objs):
+            self.reparent(self.get_node(name), group_node)
+        return group_name
+
+    def parent(self, *objs, **kwargs):
+        self.calls['parent'] += 1
+        names = flatten(objs)
+        if kwargs.get('world'):
+            parent_node = None
+        else:
+            parent_node = self.get_node(names.pop())
+        for name in names:
+            self.reparent(self.get_node(name), parent_node)
+        return names
+
+    def makeIdentity(self, *objs, **kwargs):
+        self.calls['makeIdentity'] += 1
+        for name in flatten(objs):
+            node = self.get_node(name)
+            # Push the translation down into the children and the geometry
+            for child in node.children:
+                child.translate = [value + offset for value, offset
+                                   in zip(child.translate, node.translate)]
+            if node.geometry_box:
+                node.geometry_box = [value + node.translate[index % 3]
+                                     for index, value in enumerate(node.geometry_box)]
+            node.translate = [0.0, 0.0, 0.0]
+
+    def select(self, *objs, **kwargs):
+        self.calls['select'] += 1
+        names = flatten(objs)
+        if kwargs.get('clear'):
+            self.selection = []
+        elif kwargs.get('add'):
+            self.selection.extend(names)
+        elif kwargs.get('deselect'):
+            self.selection = [name for name in self.selection if name not in names]
+        else:
+            self.selection = list(names)
+        # Run the script jobs waiting for the selection to change
+        for event, callback in list(self.script_jobs.values()):
+            if event == 'SelectionChanged':
+                callback()
+
+    def ls(self, *objs, **kwargs):
+        self.calls['ls'] += 1
+        names = flatten(objs)
+        if kwargs.get('selection'):
+            found = list(self.selection)
+        elif names:
+            # Names and UUIDs are both accepted, like Maya
+            uuids = None
+            found = []
+            for name in names:
+                if name in self.nodes or self.is_shape(name):
+                    found.append(name)
+                    continue
+                if uuids is None:
+                    uuids = {node.uuid: node.name for node in self.nodes.values()}
+                if name in uuids:
+                    found.append(uuids[name])
+        else:
+            found = list(self.nodes)
+        if kwargs.get('type'):
+            found = [name for name in found
+                     if (self.nodes[name].node_type if name in self.nodes else 'mesh')
+                     == kwargs['type']]
+        if kwargs.get('uuid'):
+            # A shape's UUID is made from its node's
+            return [self.nodes[name].uuid if name in self.nodes
+                    else self.shape_node(name).uuid + '-shape' for name in found]
+        return found
+
+    def polyEvaluate(self, obj=None, **kwargs):
+        self.calls['polyEvaluate'] += 1
+        if kwargs.get('vertex'):
+            return len(self.shape_points(self.shape_node(obj)))
+        return None
+
+    def file(self, path=None, **kwargs):
+        self.calls['file'] += 1
+        if not (kwargs.get('new') or kwargs.get('open')):
+            return None
+        # Empty the scene, then run the script jobs waiting for a scene to be made or
+        #   opened
+        self.nodes.clear()
+        self.selection = []
+        event = 'NewSceneOpened' if kwargs.get('new') else 'SceneOpened'
+        for job_event, callback in list(self.script_jobs.values()):
+            if job_event == event:
+                callback()
+        return path
+
+    def scriptJob(self, *args, **kwargs):
+        self.calls['scriptJob'] += 1
+        if kwargs.get('kill') is not None:
+            self.script_jobs.pop(kwargs['kill'], None)
+            return None
+        if kwargs.get('exists') is not None:
+            return kwargs['exists'] in self.script_jobs
+        job_num = len(self.script_jobs) + 1
+        while job_num in self.script_jobs:
+            job_num += 1
+        self.script_jobs[job_num] = tuple(kwargs['event'])
+        return job_num
+
+    def objExists(self, name=None):
+        self.calls['objExists'] += 1
+        return name in self.nodes
+
+    def delete(self, *objs, **kwargs):
+        self.calls['delete'] += 1
+        for name in flatten(objs):
+            node = self.nodes.get(name)
+            if node is None:
+                continue
+            if node.parent is not None:
+                node.parent.children.remove(node)
+            self.delete_tree(node)
+
+    def delete_tree(self, node=None):
+        """
+        Removes a node and its children from the scene without counting a call.
+
+        :param node: The node to remove.
+        :type: FakeNode
+        """
+        self.nodes.pop(node.name, None)
+        for child in node.children:
+            self.delete_tree(child)
+        if node.name in self.selection:
+            self.selection.remove(node.name)
+
+    def listRelatives(self, obj=None, **kwargs):
+        self.calls['listRelatives'] += 1
+        node = self.get_node(flatten([obj])[0])
+        if kwargs.get('parent'):
+            return [node.parent.name] if node.parent is not None else None
+        if kwargs.get('shapes'):
+            return None
+        if kwargs.get('allDescendents'):
+            nodes, found = [node], []
+            while nodes:
+                descendant = nodes.pop(0)
+                if descendant.geometry_box and kwargs.get('type') in (None, 'mesh'):
+                    if kwargs.get('fullPath'):
+                        found.append(self.full_path(descendant) + '|' + descendant.name
+                                     + 'Shape')
+                    else:
+                        found.append(descendant.name + 'Shape')
+                nodes.extend(descendant.children)
+            return found or None
+        return [child.name for child in node.children] or None
+
+    def setAttr(self, plug=None, *values, **kwargs):
+        self.calls['setAttr'] += 1
+        name, attr = plug.split('.', 1)
+        if attr == 'translate':
+            self.get_node(name).translate = [float(value) for value in values]
+
+    def getAttr(self, plug=None, **kwargs):
+        self.calls['getAttr'] += 1
+        name, attr = plug.split('.', 1)
+        if attr == 'translate':
+            return [tuple(self.get_node(name).translate)]
+        if attr == 'worldMatrix[0]':
+            # The world matrix of a mesh shape, in rows
+            return self.world_matrix(self.shape_node(name))
+        return None
+
+    def loadPlugin(self, path=None, **kwargs):
+        self.calls['loadPlugin'] += 1
+        path = os.path.abspath(path)
+        # Load the plugin as a module of its own, the way Maya does
+        name = os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.initializePlugin(path)
+        self.plugins[path] = module
+        return [name]
+
+    def pluginInfo(self, path=None, **kwargs):
+        self.calls['pluginInfo'] += 1
+        if kwargs.get('loaded'):
+            return os.path.abspath(path) in self.plugins
+        return None
+
+    def warning(self, msg=None):
+        self.calls['warning'] += 1
+
+    def undoInfo(self, *args, **kwargs):
+        self.calls['undoInfo'] += 1
+        if kwargs.get('query'):
+            return True
+        return None
+
+    def refresh(self, *args, **kwargs):
+        self.calls['refresh'] += 1
+
+    def autoKeyframe(self, *args, **kwargs):
+        self.calls['autoKeyframe'] += 1
+        if kwargs.get('query'):
+            return False
+        return None
+
+class FakeSelectionList(object):
+    """
+    The part of OpenMaya's MSelectionList used by the tools. Its depend nodes are the
+    fake nodes themselves. Like Maya, adding a node that is already in the list, by any
+    of its names, does not add it again.
+    """
+    api_name = 'MSelectionList'
+    # The fake commands whose scene the nodes are found in
+    cmds = None
+
+    def __init__(self):
+        self.nodes = []
+
+    def add(self, name=None):
+        try:
+            node = self.cmds.get_node(name)
+        except ValueError:
+            raise RuntimeError('(kInvalidParameter): Object does not exist')
+        if node not in self.nodes:
+            self.nodes.append(node)
+        return self
+
+    def getDependNode(self, index=0):
+        return self.nodes[index]
+
+class FakeDependencyNode(object):
+    """
+    The part of OpenMaya's MFnDependencyNode used by the tools. Its plugs are (node,
+    attribute name) pairs.
+    """
+    api_name = 'MFnDependencyNode'
+
+    def __init__(self, node=None):
+        self.node = node
+
+    def findPlug(self, attr_name=None, want_networked=False):
+        return (self.node, attr_name)
+
+    def uuid(self):
+        return FakeUuid(self.node.uuid)
+
+class FakeUuid(object):
+    """
+    The part of OpenMaya's MUuid used by the tools.
+    """
+    api_name = 'MUuid'
+
+    def __init__(self, uuid=None):
+        self.uuid = uuid
+
+    def asString(self):
+        return self.uuid
+
+class FakeFn(object):
+    """
+    The function set types of OpenMaya's MFn used by the tools.
+    """
+    api_name = 'MFn'
+    kTransform = 'kTransform'
+
+class FakeDGModifier(object):
+    """
+    The part of OpenMaya's MDGModifier used by the tools, which can set translate
+    values and undo them.
+    """
+    api_name = 'MDGModifier'
+    # The index in the translation of each translate attribute
+    axis_indices = {'translateX': 0, 'translateY': 1, 'translateZ': 2}
+
+    def __init__(self):
+        # The plug values to set, and the values they had before
+        self.values = []
+        self.old_values = []
+
+    def newPlugValueDouble(self, plug=None, value=0.0):
+        self.values.append((plug, float(value)))
+        return self
+
+    def doIt(self):
+        self.old_values = []
+        for (node, attr_name), value in self.values:
+            index = self.axis_indices[attr_name]
+            self.old_values.append(((node, attr_name), node.translate[index]))
+            node.translate[index] = value
+
+    def undoIt(self):
+        for (node, attr_name), value in reversed(self.old_values):
+            node.translate[self.axis_indices[attr_name]] = value
+
+class FakePxCommand(object):
+    """
+    OpenMaya's MPxCommand, the base class of plugin commands.
+    """
+    api_name = 'MPxCommand'
+
+    def __init__(self):
+        pass
+
+class FakePlugin(object):
+    """
+    The part of OpenMaya's MFnPlugin used by plugins to register their commands with
+    the fake commands.
+    """
+    api_name = 'MFnPlugin'
+    # The fake commands the plugin registers its commands with
+    cmds = None
+
+    def __init__(self, plugin=None):
+        self.plugin = plugin
+
+    def registerCommand(self, name=None, creator=None):
+        self.cmds.plugin_commands[name] = creator
+
+    def deregisterCommand(self, name=None):
+        self.cmds.plugin_commands.pop(name, None)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+#SETMODE 777
+
+#----------------------------------------------------------------------------------------#
+#------------------------------------------------------------------------------ HEADER --#
+
+"""
+:author:
+    kpm200000
+
+:synopsis:
+    This module times the stacking tools outside of Maya and counts their commands.
+
+:description:
+    This module runs stack_objs, offset_objs_in_x, read_stack_xml,
+    apply_transform_table, and the full stack building flow of build_stacks against the
+    in-memory fake of maya.cmds, at several numbers of objects. For every benchmark it
+    reports the wall time and the number of calls made to each Maya command. The report
+    can be written as JSON, and compared against a baseline report so that a change
+    which issues more Maya commands than before fails, for example in CI.
+
+    The command counts at the small sizes are committed in benchmarks/baseline.json.
+    CI runs the check with --ci, which runs the sizes in the committed baseline and
+    exits with 1 if any benchmark calls a command more often than the baseline. When a
+    change is meant to issue more commands, or fewer, write the baseline again and
+    commit it with the change. Only the command counts are compared, never the times.
+
+    Example:
+        python benchmarks/run_benchmarks.py --sizes 10 1000 100000 --json report.json
+        python benchmarks/run_benchmarks.py --baseline report.json
+
+    CI, and writing the committed baseline again:
+        python benchmarks/run_benchmarks.py --ci
+        python benchmarks/run_benchmarks.py --sizes 10 1000 \\
+            --json benchmarks/baseline.json
+
+:applications:
+    Maya
+
+:see_also:
+    fake_maya
+"""
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- IMPORTS --#
+
+# Default Python Imports
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Imports That You Wrote
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fake_maya
+
+# The fake must be installed before any of the tools are imported
+cmds = fake_maya.install(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from td_maya_tools.stacker import stack_objs
+from td_maya_tools.stacker import offset_objs_in_x
+from td_maya_tools.gen_utils import read_stack_xml
+from td_maya_tools.gen_utils import write_stack_xml
+from td_maya_tools.gen_utils import TransformTable
+from td_maya_tools.gen_utils import apply_transform_table
+from td_maya_tools.builder import build_stacks
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- CONSTANTS --#
+
+# The committed command counts that CI checks against
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- FUNCTIONS --#
+
+def make_objects(count=1, prefix='obj', rng=None):
+    """
+    This function creates objects of random sizes at random places in the fake scene.
+
+    :param count: The number of objects to create.
+    :type: int
+
+    :param prefix: The start of the objects' names.
+    :type: str
+
+    :param rng: The random generator to size and place the objects with.
+    :type: random.Random
+
+    :return: The names of the objects.
+    :type: list
+    """
+    names = []
+    for num in range(count):
+        width, height, depth = [rng.uniform(0.5, 2.0) for axis in range(3)]
+        name = cmds.create_node(f"{prefix}{num + 1}",
+                                [-width / 2, -height / 2, -depth / 2,
+                                 width / 2, height / 2, depth / 2])
+        cmds.nodes[name].translate = [rng.uniform(-10, 10) for axis in range(3)]
+        names.append(name)
+    return names
+
+def bench_stack_objs(size=1, rng=None):
+    """
+    Stacks all of the objects into one stack.
+    """
+    objs = make_objects(size, 'piece', rng)
+    return lambda: stack_objs(objs)
+
+def bench_offset_objs_in_x(size=1, rng=None):
+    """
+    Offsets every object from the one before it, the way the stacks of a build are.
+    """
+    objs = make_objects(size, 'stack', rng)
+
+    def run():
+        for prev_obj, obj in zip(objs, objs[1:]):
+            offset_objs_in_x(prev_obj, obj, 0.1)
+    return run
+
+def bench_read_stack_xml(size=1, rng=None, temp_dir=None):
+    """
+    Reads an XML layout of stacks of ten objects.
+    """
+    table = TransformTable()
+    for num in range(size):
+        table.append(f"stack{num // 10 + 1:03d}", f"obj{num + 1}",
+                     [rng.uniform(-10, 10) for axis in range(3)])
+    file_path = os.path.join(temp_dir, f"layout_{size}.xml")
+    write_stack_xml(file_path, table)
+    return lambda: read_stack_xml(file_path, compact=True)
+
+def bench_apply_transform_table(size=1, rng=None):
+    """
+    Applies a layout that names every object twice, first by its name and then by its
+    DAG path, the way a hand edited layout can.
+    """
+    objs = make_objects(size, 'obj', rng)
+    table = TransformTable()
+    for obj_name in objs + ['|' + obj for obj in objs]:
+        table.append('stack001', obj_name, [rng.uniform(-10, 10) for axis in range(3)])
+    return lambda: apply_transform_table(table)
+
+def bench_build_stacks(size=1, rng=None):
+    """
+    Builds enough stacks of up to six middle pieces to make about the given number of
+    objects.
+    """
+    bases = make_objects(3, 'base', rng)
+    middles = make_objects(5, 'middle', rng)
+    tops = make_objects(3, 'top', rng)
+    # A stack averages 3.5 middle pieces plus a base and a top
+    count = max(1, int(size / 5.5))
+    return lambda: build_stacks(bases, middles, tops, count, 6, 0.1, seed=1)
+
+def run_benchmarks(sizes=None):
+    """
+    This function runs every benchmark at every size.
+
+    :param sizes: The numbers of objects to run each benchmark with.
+    :type: list
+
+    :return: For each benchmark and size, the wall time in seconds and the number of
+    calls to each command.
+    :type: list
+    """
+    benchmarks = [('stack_objs', bench_stack_objs),
+                  ('offset_objs_in_x', bench_offset_objs_in_x),
+                  ('read_stack_xml', bench_read_stack_xml),
+                  ('apply_transform_table', bench_apply_transform_table),
+                  ('build_stacks', bench_build_stacks)]
+    results = []
+    temp_dir = tempfile.mkdtemp()
+    try:
+        for name, setup in benchmarks:
+            for size in sizes:
+                # Every run starts from an empty scene and the same random numbers
+                cmds.reset()
+                rng = random.Random(size)
+                if setup is bench_read_stack_xml:
+                    run = setup(size, rng, temp_dir)
+                else:
+                    run = setup(size, rng)
+                # Only count the calls made by the code being timed
+                cmds.reset_calls()
+                start = time.perf_counter()
+                run()
+                seconds = time.perf_counter() - start
+                results.append({'name': name, 'size': size, 'seconds': seconds,
+                                'calls': dict(sorted(cmds.calls.items())),
+                                'total_calls': sum(cmds.calls.values())})
+    finally:
+        shutil.rmtree(temp_dir)
+    return results
+
+def compare_to_baseline(results=None, baseline=None):
+    """
+    This function finds the benchmarks that call any command more often than they did
+    in the baseline.
+
+    :param results: The results of this run.
+    :type: list
+
+    :param baseline: The results of an earlier run.
+    :type: list
+
+    :return: A description of each command that is called more often than before.
+    :type: list
+    """
+    baseline_calls = {(result['name'], result['size']): result['calls']
+                      for result in baseline}
+    regressions = []
+    for result in results:
+        before = baseline_calls.get((result['name'], result['size']))
+        if before is None:
+            continue
+        for command, count in result['calls'].items():
+            if count > before.get(command, 0):
+                regressions.append(f"{result['name']} at {result['size']} objects calls "
+                                   f"{command} {count} times, up from "
+                                   f"{before.get(command, 0)}")
+    return regressions
+
+def print_report(results=None):
+    """
+    This function prints the results as a table.
+
+    :param results: The results to print.
+    :type: list
+    """
+    print(f"{'benchmark':<20}{'objects':>10}{'seconds':>12}{'commands':>12}  calls")
+    for result in results:
+        calls = ', '.join(f"{command}={count}"
+                          for command, count in result['calls'].items())
+        print(f"{result['name']:<20}{result['size']:>10}{result['seconds']:>12.4f}"
+              f"{result['total_calls']:>12}  {calls}")
+
+def main(argv=None):
+    """
+    This function runs the benchmarks described on the command line.
+
+    :param argv: The command line arguments, not including the program name.
+    :type: list
+
+    :return: The exit code, which is one if any command count went up from the
+    baseline.
+    :type: int
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the stacking tools with '
+                                                 'a fake maya.cmds.')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10, 1000, 100000],
+                        help='The numbers of objects to run each benchmark with.')
+    parser.add_argument('--json', default=None,
+                        help='Where to write the results as JSON.')
+    parser.add_argument('--baseline', default=None,
+                        help='A JSON report to compare the command counts against.')
+    parser.add_argument('--ci', action='store_true',
+                        help='Run the sizes in the committed baseline and compare the '
+                             'command counts against it.')
+    args = parser.parse_args(argv)
+
+    # Check against the committed baseline at the sizes it was written at
+    if args.ci:
+        args.baseline = BASELINE_PATH
+        with open(BASELINE_PATH, 'r') as baseline_fh:
+            args.sizes = sorted(set(result['size'] for result in json.load(baseline_fh)))
+    results = run_benchmarks(args.sizes)
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w') as json_fh:
+            json.dump(results, json_fh, indent=2)
+    # Fail if any benchmark issues more commands than it did in the baseline
+    if args.baseline:
+        with open(args.baseline, 'r') as baseline_fh:
+            regressions = compare_to_baseline(results, json.load(baseline_fh))
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- CLASSES --#
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,824 @@
+#!/usr/bin/env python
+#SETMODE 777
+
+#----------------------------------------------------------------------------------------#
+#------------------------------------------------------------------------------ HEADER --#
+
+"""
+:author:
+    kpm200000
+
+:synopsis:
+    This module creates the geometry for stacks of objects in Maya.
+
+:description:
+    This module builds stacks of objects without depending on the GUI, so that builds
+    can be run from the Builder GUI, from scripts, or from mayapy in batch mode. A
+    build is a StackBuildJob, split into small steps so that the GUI can run it a few
+    steps at a time, show its progress, and cancel it, while the planning and layout
+    math runs on a worker thread. The build uses the planner module to randomly choose
+    the base, middle, and top objects of every stack from a seed, duplicates them with
+    as few duplicate or instance commands as possible, stacks and groups the pieces of
+    each stack, and spaces the stacks out in a row or a grid of rows. Stacks can be
+    given a random number of middle pieces, or be filled to a target height from the
+    measured heights of the middle pieces. A build can also update the last build,
+    rebuilding only the stacks whose objects changed.
+
+:applications:
+    Maya
+
+:see_also:
+    stacker
+"""
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- IMPORTS --#
+
+# Default Python Imports
+import threading
+import maya.cmds as cmds
+
+# Imports That You Wrote
+from td_maya_tools.stacker import arrange_stacks
+from td_maya_tools.stacker import apply_positions
+from td_maya_tools.stacker import get_local_bounding_boxes
+from td_maya_tools.stacker import BoundingBoxCache
+from td_maya_tools.layout import offset_bounding_box
+from td_maya_tools.layout import union_bounding_box
+from td_maya_tools.planner import plan_stacks
+from td_maya_tools.planner import layout_stacks
+from td_maya_tools.gen_utils import BuildContext
+from td_maya_tools.gen_utils import TransformTable
+from td_maya_tools.profiling import idle
+from td_maya_tools.profiling import phase
+from td_maya_tools.profiling import profile_build
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- CONSTANTS --#
+
+# The number of pieces or stacks handled by each step of a build
+CHUNK_SIZE = 500
+
+# How long to wait for a worker thread before letting the caller run again
+WORKER_POLL_SECONDS = 0.02
+
+# Where the bottom center of every stack is built
+ORIGIN = (0, 0, 0)
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- FUNCTIONS --#
+
+def build_stacks(bases=None, middles=None, tops=None, count=1, max_height=1,
+                 separation=0.1, seed=None, instance=False, plan_cache=None, plan=None,
+                 per_row=None, row_separation=None, previous=None, source_boxes=None,
+                 processes=None, tight=False, target_height=None, tolerance=0):
+    """
+    This function randomly chooses an object from each of the base, middle, and top
+    objects for every stack, duplicates the geometry for all of the stacks at once, then
+    creates each stack at the origin using the stacker module, groups the pieces of each
+    stack, and spaces the stacks out along the x-axis, wrapping into rows if asked to.
+
+    :param bases: The objects to choose the base of each stack from.
+    :type: list
+
+    :param middles: The objects to choose the middle pieces of each stack from.
+    :type: list
+
+    :param tops: The objects to choose the top of each stack from.
+    :type: list
+
+    :param count: The number of stacks to make.
+    :type: int
+
+    :param max_height: The maximum number of middle pieces in a stack.
+    :type: int
+
+    :param separation: The distance between neighbouring stacks.
+    :type: float
+
+    :param seed: The seed for the random choices. If not given, a seed is chosen and
+    recorded in the result.
+    :type: int
+
+    :param instance: Whether to make instances instead of full copies.
+    :type: bool
+
+    :param plan_cache: The cache of stack plans, so that building again with the same
+    seed and inputs reuses the plan.
+    :type: PlanCache
+
+    :param plan: A stack plan to build instead of planning one. The objects, count,
+    height, and seed arguments are not used when a plan is given.
+    :type: StackPlan
+
+    :param per_row: The number of stacks in each row. If not given, every stack is put
+    in one row along the x-axis.
+    :type: int
+
+    :param row_separation: The distance between neighbouring rows, along the z-axis. If
+    not given, the separation is used.
+    :type: float
+
+    :param previous: The result of the last build. If given, the last build is updated
+    to match the new arguments, rebuilding only the stacks that changed.
+    :type: BuildResult
+
+    :param source_boxes: The local bounding boxes of the source objects, from
+    get_local_bounding_boxes. Sources that are not given are measured once each.
+    :type: dict
+
+    :param processes: The most processes to plan and lay out the stacks in, for very
+    large builds. The stacks are the same however many processes are used.
+    :type: int
+
+    :param tight: Whether to measure the sources from their mesh vertices, so that
+    rotated pieces stack on their real lowest and highest points. Source boxes given
+    should be measured the same way.
+    :type: bool
+
+    :param target_height: The height to fill each stack to with middle pieces, instead
+    of a random number of them up to max_height.
+    :type: float
+
+    :param tolerance: How far above or below the target height a stack may be.
+    :type: float
+
+    :return: The stacks that were built, or None if the arguments were not valid.
+    :type: BuildResult
+    """
+    # Run every step of the build straight through
+    job = StackBuildJob(bases, middles, tops, count, max_height, separation, seed,
+                        instance, plan_cache, plan, per_row, row_separation, previous,
+                        source_boxes, processes, tight, target_height, tolerance)
+    return job.run()
+
+def verify_build_args(bases=None, middles=None, tops=None, count=1, max_height=1,
+                      target_height=None, tolerance=0):
+    """
+    This function checks that there are objects to choose from for every part of the
+    stack, that the count and height are at least one, and that any target height is
+    above zero with a tolerance that is not negative, warning about the first argument
+    that is not valid.
+
+    :param bases: The objects to choose the base of each stack from.
+    :type: list
+
+    :param middles: The objects to choose the middle pieces of each stack from.
+    :type: list
+
+    :param tops: The objects to choose the top of each stack from.
+    :type: list
+
+    :param count: The number of stacks to make.
+    :type: int
+
+    :param max_height: The maximum number of middle pieces in a stack.
+    :type: int
+
+    :param target_height: The height to fill each stack to, if any.
+    :type: float
+
+    :param tolerance: How far above or below the target height a stack may be.
+    :type: float
+
+    :return: Whether all of the arguments are valid.
+    :type: bool
+    """
+    # Check that there are objects for every part of the stack
+    for parts, part_name in ((bases, 'base'), (middles, 'middle'), (tops, 'top')):
+        if not parts:
+            cmds.warning(f"You must provide objects for the {part_name} parts.")
+            return None
+    # Check that the count and height are at least 1
+    if count < 1:
+        cmds.warning("You must make at least one stack.")
+        return None
+    if max_height < 1:
+        cmds.warning("The height must be at least 1.")
+        return None
+    # Check the target height, if stacks are filled to one
+    if target_height is not None:
+        if target_height <= 0:
+            cmds.warning("The target height must be above 0.")
+            return None
+        if tolerance < 0:
+            cmds.warning("The tolerance must not be negative.")
+            return None
+    # Return true if there are no errors
+    return True
+
+def duplicate_slots(slot_sources=None, instance=False):
+    """
+    This function creates a copy of the source object for every slot given. Rather than
+    one command per copy, each round duplicates the source together with every copy
+    already made of it, so the number of copies doubles each round, and the copies of
+    all of the sources are made by the same command. N copies of a source take about
+    log2(N) commands.
+
+    :param slot_sources: The source object needed by each slot, keyed by slot, for
+    example (stack number, piece number).
+    :type: dict
+
+    :param instance: Whether to make instances instead of full copies.
+    :type: bool
+
+    :return: The new node made for each slot, keyed by slot.
+    :type: dict
+    """
+    if not slot_sources:
+        return {}
+    # Find the slots that need each source object
+    source_slots = {}
+    for slot, source in slot_sources.items():
+        source_slots.setdefault(source, []).append(slot)
+    # The nodes that can be copied to make more of each source, and the copies made
+    copyable = {source: [source] for source in source_slots}
+    copies = {source: [] for source in source_slots}
+
+    # Keep making copies until every source has one for each of its slots
+    while True:
+        to_copy = []
+        for source, slots in source_slots.items():
+            # Copy as many of the existing nodes as are still needed
+            still_needed = len(slots) - len(copies[source])
+            to_copy.extend((source, node) for node in copyable[source][:still_needed])
+        if not to_copy:
+            break
+        # Copy every node needed this round with a single command
+        nodes = [node for source, node in to_copy]
+        if instance:
+            new_nodes = cmds.instance(nodes)
+        else:
+            new_nodes = cmds.duplicate(nodes, returnRootsOnly=True)
+        # The new nodes are returned in the order the nodes were given
+        for (source, node), new_node in zip(to_copy, new_nodes):
+            copies[source].append(new_node)
+            copyable[source].append(new_node)
+
+    # Hand out the copies of each source to its slots
+    slot_nodes = {}
+    for source, slots in source_slots.items():
+        for slot, new_node in zip(slots, copies[source]):
+            slot_nodes[slot] = new_node
+    # Return the nodes in the same slot order they were given
+    return {slot: slot_nodes[slot] for slot in slot_sources}
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- CLASSES --#
+
+class StackBuildJob(object):
+    """
+    A stack build split into steps. The steps generator runs the build a chunk at a
+    time and yields the progress after each chunk, so a caller on the main thread can
+    run it between other work, for example from a timer in the GUI. The planning and
+    the stack layout math do not use Maya, so they run on a worker thread while the
+    main thread keeps yielding. Every Maya command is run on the thread that runs the
+    steps.
+
+    Given the result of the last build, the job updates it instead of building every
+    stack again. The stacks whose objects did not change are kept as they are, the
+    pieces of the stacks that did change are reused where they have the same source,
+    and only the missing pieces are duplicated. If only the separation or rows
+    changed, the stacks are just spaced out again. The kept stacks are measured again
+    before they are spaced out, so stacks moved or edited since the last build are laid
+    out from where they are now.
+
+    Only the source objects are measured, never their duplicates. A duplicate has the
+    same bounding box around its translation as its source, so every piece is laid out
+    from its source's local bounding box and placed by its world translation. When the
+    stacks are filled to a target height, every source is measured before planning so
+    that the planner knows the height of each piece.
+
+    The build runs in one undo chunk with the viewport refresh suspended. If it is
+    cancelled, the nodes it made are deleted before the steps end.
+    """
+    def __init__(self, bases=None, middles=None, tops=None, count=1, max_height=1,
+                 separation=0.1, seed=None, instance=False, plan_cache=None, plan=None,
+                 per_row=None, row_separation=None, previous=None, source_boxes=None,
+                 processes=None, tight=False, target_height=None, tolerance=0,
+                 on_built=None):
+        # The arguments of the build, as described in build_stacks
+        self.bases = bases
+        self.middles = middles
+        self.tops = tops
+        self.count = count
+        self.max_height = max_height
+        self.separation = separation
+        self.seed = seed
+        self.instance = instance
+        self.plan_cache = plan_cache
+        self.plan = plan
+        self.per_row = per_row
+        self.row_separation = row_separation
+        self.previous = previous
+        self.source_boxes = source_boxes
+        self.processes = processes
+        self.tight = tight
+        self.target_height = target_height
+        self.tolerance = tolerance
+        # A function to call with the result once the stacks are built, inside the
+        #   build's undo chunk and profile
+        self.on_built = on_built
+        # The stacks built so far, or None if the arguments were not valid
+        self.result = None
+        # Whether the build has been asked to stop, and whether it still can be
+        self.cancelled = False
+        self.cancellable = True
+        # Whether a worker thread is doing the build's work while the build yields
+        self.worker_running = False
+        # The stage the build is in and how far through the whole build it is
+        self.stage = None
+        self.progress = 0.0
+
+    def cancel(self):
+        """
+        Asks the build to stop. The build stops at the end of the step it is in, and
+        deletes the nodes it made. An update of the last build can only be stopped while
+        it is planning, before it changes the last build's stacks.
+        """
+        if self.cancellable:
+            self.cancelled = True
+
+    def run(self):
+        """
+        Runs every step of the build.
+
+        :return: The stacks that were built, or None if the arguments were not valid or
+        the build was cancelled.
+        :type: BuildResult
+        """
+        for progress in self.steps():
+            pass
+        return self.result
+
+    def steps(self):
+        """
+        Runs the build one step at a time.
+
+        :return: A generator that yields how far through the build it is, from 0 to 1,
+        after each step.
+        :type: generator
+        """
+        # Build inside one undo chunk with the viewport refresh suspended
+        with profile_build('build_stacks'), BuildContext('build_stacks'):
+            try:
+                for progress in self.build_steps():
+                    # The time until the next step is asked for is not part of the
+                    #   build, unless a worker thread is doing the build's work meanwhile
+                    if self.worker_running:
+                        yield progress
+                        continue
+                    with idle():
+                        yield progress
+            finally:
+                # Remove what was made if the build was stopped
+                if self.cancelled:
+                    self.delete_nodes()
+                    self.result = None
+
+    def build_steps(self):
+        """
+        The steps of the build, without the undo chunk and cleanup around them.
+
+        :return: A generator that yields how far through the build it is, from 0 to 1.
+        :type: generator
+        """
+        # The local bounding boxes of the sources, measured once each
+        source_boxes = dict(self.source_boxes or {})
+        if self.plan is None:
+            # Verify the arguments are valid
+            if not verify_build_args(self.bases, self.middles, self.tops, self.count,
+                                     self.max_height, self.target_height,
+                                     self.tolerance):
+                return
+            # Stacks filled to a height are planned from the height of every source
+            heights = None
+            if self.target_height is not None:
+                with phase('measure'):
+                    sources = set(self.bases) | set(self.middles) | set(self.tops)
+                    source_boxes.update(get_local_bounding_boxes(
+                        [source for source in sources if source not in source_boxes],
+                        self.tight))
+                    heights = {source: source_boxes[source][4] - source_boxes[source][1]
+                               for source in sources}
+                    yield self.set_progress('measure', 0.0)
+            # Choose the objects of every stack, or reuse the cached plan
+            with phase('plan'):
+                for waiting in self.run_in_worker(lambda: self.make_plan(heights)):
+                    yield self.set_progress('plan', 0.0)
+            if self.cancelled:
+                return
+            # Let the user know about stacks that no mix of pieces could fill
+            missed_count = self.plan.count_missed()
+            if missed_count:
+                cmds.warning(f"{missed_count} of {self.count} stacks could not be filled "
+                             f"to within {self.tolerance} of {self.target_height}, so "
+                             f"they were filled as close as the pieces allow.")
+
+        # Compare the new plan with the last build, which is empty for a new build
+        previous = self.check_previous()
+        old_sources = previous.stack_sources if previous else []
+        old_pieces = previous.stack_pieces if previous else []
+        old_groups = previous.stack_groups if previous else []
+        new_sources = self.plan.stacks
+        # The number of stacks the last build and the new plan both have
+        kept_count = min(len(old_sources), len(new_sources))
+        # Pieces can only be reused if they are the same kind of copy
+        same_kind = previous is not None and previous.instance == self.instance
+        # The stacks that changed and the stacks that are new, in order
+        changed_nums = [num for num in range(kept_count)
+                        if not same_kind or old_sources[num] != new_sources[num]]
+        build_nums = changed_nums + list(range(kept_count, len(new_sources)))
+        if previous is not None:
+            # An update changes the stacks of the last build from here on, so it can no
+            #   longer be cancelled
+            self.cancellable = False
+
+        # Start from the stacks of the last build that are kept
+        result = self.result = BuildResult(self.plan, self.instance)
+        result.stack_groups = old_groups[:kept_count]
+        result.stack_pieces = [list(pieces) for pieces in old_pieces[:kept_count]]
+        result.stack_pieces.extend([] for num in range(kept_count, len(new_sources)))
+        # Measure the kept stacks as they are now, since they may have been moved after
+        #   the last build
+        bbox_cache = result.bbox_cache = BoundingBoxCache(tight=self.tight)
+        changed_set = set(changed_nums)
+        kept_nums = [num for num in range(kept_count) if num not in changed_set]
+        if kept_nums and not self.tight:
+            with phase('measure'):
+                bbox_cache.fill([result.stack_groups[num] for num in kept_nums])
+        elif kept_nums:
+            with phase('measure'):
+                # Scanning the vertices of every kept piece would scan each duplicate of
+                #   a source again, so each piece gets its source's tight box around
+                #   where the piece is now. Rotating, scaling or editing a kept piece
+                #   needs a new build to be seen
+                kept_sources = set(source for num in kept_nums
+                                   for source in new_sources[num])
+                source_boxes.update(get_local_bounding_boxes(
+                    [source for source in kept_sources if source not in source_boxes],
+                    self.tight))
+                for num in kept_nums:
+                    bbox_cache.store(result.stack_groups[num], union_bounding_box(
+                        [offset_bounding_box(source_boxes[source], cmds.xform(
+                            piece, query=True, worldSpace=True, translation=True))
+                         for source, piece in zip(new_sources[num],
+                                                  result.stack_pieces[num])]))
+
+        # Pool the pieces of the changed and removed stacks by source, and by the stack
+        #   they are in, so they can be reused instead of duplicated
+        pool = {}
+        if same_kind:
+            for num in changed_nums + list(range(kept_count, len(old_sources))):
+                for source, piece in zip(old_sources[num], old_pieces[num]):
+                    pool.setdefault(source, {}).setdefault(num, []).append(piece)
+
+        with phase('duplicate'):
+            yield self.set_progress('duplicate', 0.05)
+            # The slots that need a duplicate, and the reused pieces that are in another
+            #   stack and have to be moved to the stack they are reused in
+            slot_sources = {}
+            moved_slots = []
+            for num in build_nums:
+                pieces = result.stack_pieces[num] = []
+                for piece_num, source in enumerate(new_sources[num]):
+                    stacks = pool.get(source)
+                    if not stacks:
+                        # Nothing to reuse, so duplicate the source
+                        pieces.append(None)
+                        slot_sources[(num, piece_num)] = source
+                        continue
+                    # Prefer a piece that is already in this stack
+                    old_num = num if num in stacks else next(iter(stacks))
+                    pieces.append(stacks[old_num].pop())
+                    if not stacks[old_num]:
+                        del stacks[old_num]
+                    if old_num != num:
+                        moved_slots.append((num, piece_num))
+            # Duplicate the objects for every slot with as few commands as possible
+            slot_nodes = duplicate_slots(slot_sources, self.instance)
+            for (num, piece_num), node in slot_nodes.items():
+                result.stack_pieces[num][piece_num] = node
+
+        # Put the changed stacks back together at the origin
+        leftovers = [piece for stacks in pool.values()
+                     for num, pieces in stacks.items() if num < kept_count
+                     for piece in pieces]
+        if not same_kind:
+            leftovers = [piece for num in changed_nums for piece in old_pieces[num]]
+        removed_groups = old_groups[kept_count:]
+        if changed_nums or removed_groups:
+            with phase('reuse'):
+                # New duplicates only need moving if their stack already has a group
+                moved_slots.extend(slot for slot in slot_nodes if slot[0] < kept_count)
+                self.reuse_pieces(changed_nums, moved_slots, leftovers + removed_groups,
+                                  kept_count)
+
+        # Every piece has the same bounding box around its translation as its source,
+        #   so only the sources that were not measured beforehand are measured
+        with phase('measure'):
+            sources = set(source for num in build_nums for source in new_sources[num])
+            source_boxes.update(get_local_bounding_boxes(
+                [source for source in sources if source not in source_boxes],
+                self.tight))
+            yield self.set_progress('measure', 0.45)
+        if self.cancelled:
+            return
+
+        # Work out where every piece goes, with the bottom center of each stack at the
+        #   origin, on a worker thread. Laying out the sources' local bounding boxes gives
+        #   the world translation of every piece
+        build_sources = [new_sources[num] for num in build_nums]
+        stack_translations = []
+        with phase('layout'):
+            for waiting in self.run_in_worker(lambda: stack_translations.extend(
+                    layout_stacks(build_sources, source_boxes, ORIGIN,
+                                  self.processes))):
+                yield self.set_progress('layout', 0.45)
+        if self.cancelled:
+            return
+
+        # Place the pieces of every stack, wherever they were before
+        with phase('stack_objs'):
+            for start in range(0, len(build_nums), CHUNK_SIZE):
+                if self.cancelled:
+                    return
+                end = start + CHUNK_SIZE
+                apply_positions(
+                    [obj for num in build_nums[start:end]
+                     for obj in result.stack_pieces[num]],
+                    [translation for translations in stack_translations[start:end]
+                     for translation in translations])
+                # The bounding box of each piece is its source's box at its position
+                for index in range(start, min(end, len(build_nums))):
+                    for obj, source, translation in zip(
+                            result.stack_pieces[build_nums[index]], build_sources[index],
+                            stack_translations[index]):
+                        bbox_cache.store(obj, offset_bounding_box(source_boxes[source],
+                                                                  translation))
+                yield self.set_progress('stack_objs', 0.5 + 0.2 * end / len(build_nums))
+
+        with phase('group'):
+            for start in range(0, len(build_nums), CHUNK_SIZE):
+                if self.cancelled:
+                    return
+                for num in build_nums[start:start + CHUNK_SIZE]:
+                    obj_to_stack = result.stack_pieces[num]
+                    if num >= kept_count:
+                        # Group the pieces of the stack together; the pieces are
+                        #   already around the origin, so the group has no translation
+                        #   to move or freeze
+                        group = cmds.group(obj_to_stack, name="stack%03d" % (num + 1))
+                        # Adding to list of stacks
+                        result.stack_groups.append(group)
+                    # The group's bounding box is the one around its pieces
+                    bbox_cache.store(result.stack_groups[num], union_bounding_box(
+                        [bbox_cache.get_bounding_box(obj) for obj in obj_to_stack]))
+                yield self.set_progress('group', 0.7 + 0.2 * (start + CHUNK_SIZE)
+                                        / len(build_nums))
+
+        new_groups = result.stack_groups[kept_count:]
+        if new_groups:
+            with phase('pivot'):
+                # Move pivot of every new group to origin with one command
+                cmds.xform(new_groups, absolute=True, worldSpace=True, pivots=[0, 0, 0])
+        if result.stack_groups:
+            # Adding offset between every stack in one pass using stacker module
+            with phase('offset'):
+                arrange_stacks(result.stack_groups, self.separation, self.per_row,
+                               self.row_separation, bbox_cache)
+        if self.on_built is not None:
+            self.on_built(result)
+        yield self.set_progress('done', 1.0)
+
+    def check_previous(self):
+        """
+        Returns the last build to update, if every one of its nodes still exists.
+
+        :return: The last build, or None if there is none or it cannot be updated.
+        :type: BuildResult
+        """
+        if self.previous is None:
+            return None
+        nodes = list(self.previous.stack_groups)
+        for pieces in self.previous.stack_pieces:
+            nodes.extend(pieces)
+        # Check every node with one command
+        if len(cmds.ls(nodes)) != len(nodes):
+            cmds.warning('Some nodes of the last build no longer exist, so new stacks '
+                         'will be built instead of updating it.')
+            return None
+        return self.previous
+
+    def reuse_pieces(self, changed_nums=None, moved_slots=None, unused=None,
+                     kept_count=0):
+        """
+        Gets the changed stacks of the last build ready to be stacked again. Their
+        groups are moved back to the origin, the pieces that belong in a different
+        stack or are new are moved under the right group, and the pieces and stacks
+        that are no longer used are deleted.
+
+        :param changed_nums: The numbers of the stacks that changed.
+        :type: list
+
+        :param moved_slots: The (stack, piece) numbers of the pieces that are not in the
+        right stack.
+        :type: list
+
+        :param unused: The pieces and groups that are no longer used.
+        :type: list
+
+        :param kept_count: The number of stacks kept from the last build. Stacks after
+        these are new and do not have a group yet.
+        :type: int
+        """
+        result = self.result
+        bbox_cache = result.bbox_cache
+        # Move the groups of the changed stacks back to the origin with one command
+        changed_groups = [result.stack_groups[num] for num in changed_nums]
+        if changed_groups:
+            cmds.xform(changed_groups, translation=[0, 0, 0])
+            for group in changed_groups:
+                bbox_cache.invalidate(group)
+
+        # Move the pieces under the group of their stack, one command per group, or to
+        #   the world if their stack is new and is grouped later
+        parent_slots = {}
+        for num, piece_num in moved_slots:
+            parent_slots.setdefault(num if num < kept_count else None, []).append(
+                (num, piece_num))
+        for num, slots in parent_slots.items():
+            nodes = [result.stack_pieces[slot_num][piece_num]
+                     for slot_num, piece_num in slots]
+            if num is None:
+                new_names = cmds.parent(nodes, world=True)
+            else:
+                new_names = cmds.parent(nodes, result.stack_groups[num])
+            # Moving a node can rename it if its new siblings have the same name
+            for (slot_num, piece_num), name in zip(slots, new_names):
+                result.stack_pieces[slot_num][piece_num] = name
+
+        # Delete everything that is no longer used with one command
+        if unused:
+            cmds.delete(unused)
+            for node in unused:
+                bbox_cache.invalidate(node)
+
+    def make_plan(self, heights=None):
+        """
+        Plans the stacks, or reuses the cached plan. This does not use Maya, so it can
+        run on a worker thread.
+
+        :param heights: The height of each source object, keyed by name, for stacks
+        that are filled to a target height.
+        :type: dict
+        """
+        self.plan = plan_stacks(self.bases, self.middles, self.tops, self.count,
+                                self.max_height, self.seed, self.plan_cache,
+                                self.processes, self.target_height, self.tolerance,
+                                heights)
+
+    def run_in_worker(self, function=None):
+        """
+        Runs a function that does not use Maya on a worker thread, yielding while it
+        runs so that the caller can keep going. If the build is cancelled, it stops
+        waiting and the function's work is thrown away.
+
+        :param function: The function to run.
+        :type: function
+
+        :return: A generator that yields until the function is done.
+        :type: generator
+        """
+        errors = []
+
+        def run_function():
+            try:
+                function()
+            except Exception as error:
+                errors.append(error)
+        worker = threading.Thread(target=run_function)
+        worker.daemon = True
+        worker.start()
+        self.worker_running = True
+        try:
+            while worker.is_alive():
+                if self.cancelled:
+                    return
+                yield
+                worker.join(WORKER_POLL_SECONDS)
+        finally:
+            self.worker_running = False
+        # Raise errors from the worker on the caller's thread
+        if errors:
+            raise errors[0]
+
+    def set_progress(self, stage=None, progress=0.0):
+        """
+        Records the stage of the build and how far through it is.
+
+        :param stage: The name of the stage.
+        :type: str
+
+        :param progress: How far through the whole build it is, from 0 to 1.
+        :type: float
+
+        :return: The progress.
+        :type: float
+        """
+        self.stage = stage
+        self.progress = min(progress, 1.0)
+        return self.progress
+
+    def delete_nodes(self):
+        """
+        Deletes the groups and pieces made by the build so far.
+        """
+        if not self.result:
+            return
+        # Deleting a group deletes its pieces, so only delete the ungrouped pieces
+        grouped_count = len(self.result.stack_groups)
+        nodes = list(self.result.stack_groups)
+        for obj_to_stack in self.result.stack_pieces[grouped_count:]:
+            nodes.extend(obj_to_stack)
+        if nodes:
+            cmds.delete(nodes)
+
+class BuildResult(object):
+    """
+    The stacks made by a build, in the order they were made.
+    """
+    def __init__(self, plan=None, instance=False):
+        # The plan that was built
+        self.plan = plan
+        # Whether the pieces are instances instead of full copies
+        self.instance = instance
+        # The group node of each stack
+        self.stack_groups = []
+        # The pieces of each stack, from base to top
+        self.stack_pieces = []
+        # The bounding boxes of the groups, measured in the build's undo chunk
+        self.bbox_cache = None
+
+    @property
+    def seed(self):
+        """
+        The seed used for the random choices.
+
+        :return: The seed of the plan.
+        :type: int
+        """
+        return self.plan.seed
+
+    @property
+    def stack_sources(self):
+        """
+        The source object each piece was duplicated from.
+
+        :return: The sources of each stack, from base to top.
+        :type: list
+        """
+        return self.plan.stacks
+
+    def to_dict(self):
+        """
+        Returns the build as a dictionary that can be written out as JSON.
+
+        :return: The plan and, for every stack, its group and pieces.
+        :type: dict
+        """
+        return {'plan': self.plan.to_dict(),
+                'stacks': [{'group': group, 'pieces': pieces}
+                           for group, pieces in zip(self.stack_groups,
+                                                    self.stack_pieces)]}
+
+    def get_uuids(self):
+        """
+        Returns the UUID of every stack's group and pieces, which stay the same when the
+        nodes are renamed or moved. Every node is looked up with one command.
+
+        :return: For every stack, the UUID of its group and the UUIDs of its pieces.
+        :type: list
+        """
+        nodes = list(self.stack_groups)
+        for pieces in self.stack_pieces:
+            nodes.extend(pieces)
+        uuids = iter(cmds.ls(nodes, uuid=True))
+        group_uuids = [next(uuids) for group in self.stack_groups]
+        return [(group_uuid, [next(uuids) for piece in pieces])
+                for group_uuid, pieces in zip(group_uuids, self.stack_pieces)]
+
+    def to_transform_table(self):
+        """
+        Returns the current translation of every stack's group and pieces, so that the
+        build can be written out with write_stack_xml or write_stack_bin. Each stack's
+        group is the first row of its stack, followed by its pieces from base to top.
+
+        :return: The translation of every group and piece, grouped by stack.
+        :type: TransformTable
+        """
+        table = TransformTable()
+        for group, pieces in zip(self.stack_groups, self.stack_pieces):
+            for node in [group] + pieces:
+                table.append(group, node, cmds.getAttr(node + '.translate')[0])
+        return table
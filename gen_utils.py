@@ -9,14 +9,29 @@
     kpm200000
 
 :synopsis:
-    This module contains the Autovivification class and reads the contents of
-    an XML file.
+    This module contains the Autovivification class and reads and writes the contents
+    of stack layout files.
 
 :description:
     This module contains the Autovivification class, which allows easier/more
     comprehensive access to a dictionary's contents than a normal dictionary. It also
-    contains the function to read the contents of an XML file and format them into an
-    Autovivification dictionary.
+    contains the functions to stream the contents of an XML file and to read them into
+    an Autovivification dictionary or a TransformTable, and to write a TransformTable
+    back out as XML or as a compact binary layout file. Binary layout files can also be
+    memory-mapped with MappedLayout, so very large files can be sliced without being
+    read into memory.
+
+    The binary layout file is little-endian and made of, in order:
+        - a 24 byte header: the magic bytes STKL, the version, a reserved short, the
+          number of stacks, the number of rows, and the size of the string table
+        - the first row of each stack plus the total number of rows, as unsigned ints,
+          padded to a multiple of 8 bytes
+        - where the object names of each stack start in the string table plus the
+          size of the string table, as unsigned long longs
+        - the tx, ty, tz translation of each row, as doubles, with the rows of each
+          stack next to each other
+        - the string table: the stack names then the object names, in UTF-8, each
+          followed by a null byte
 
 :applications:
     Maya
@@ -30,43 +45,391 @@
 
 # Default Python Imports
 import maya.cmds as cmds
+import math
+import mmap
+import re
+import struct
+import sys
 import xml.etree.ElementTree as et
+from array import array
+from xml.sax.saxutils import quoteattr
+try:
+    import numpy
+except ImportError:
+    # NumPy is optional, transform tables keep their translations in an array either way
+    numpy = None
 
 # Imports That You Wrote
 
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- CONSTANTS --#
+
+# The header of binary layout files
+BIN_HEADER = struct.Struct('<4sHHIIQ')
+BIN_MAGIC = b'STKL'
+BIN_VERSION = 2
+
+# The names that can be written as XML element names. Others, such as names with a
+#   namespace or DAG paths, are written in a name attribute instead
+XML_TAG_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_.-]*\Z')
+
 #----------------------------------------------------------------------------------------#
 #--------------------------------------------------------------------------- FUNCTIONS --#
 
-def read_stack_xml(file_path=None):
+def read_stack_xml(file_path=None, compact=False):
     """
-    This function reads the contents of a given XML file into a dictionary.
+    This function reads the contents of a given XML file into a dictionary, or into a
+    compact transform table.
 
     :param file_path: The location of the XML file on disk.
     :type: str
 
+    :param compact: Whether to return a TransformTable instead of a dictionary. The
+    table supports the same stack[obj]['tx'] access as the dictionary.
+    :type: bool
+
     :return: The success of the operation
-    :type: Autovivificiation dictionary
+    :type: Autovivificiation dictionary or TransformTable
     """
     # Check the argument
     if not file_path:
         cmds.warning("You must provide a location to write the file.")
         return None
 
-    # Read the XML data from the document
-    xml_fh = et.parse(file_path)
-    root = xml_fh.getroot()
+    # Put every object of every stack listed in the file into a table
+    if compact:
+        table = TransformTable()
+        for stack, obj, translation in iter_stack_xml(file_path):
+            table.append(stack, obj, translation)
+        return table
 
     # Create the auto dictionary
     contents = Autovivification()
-    # Put in the values for every stack listed in the file
-    for stack in root:
-        for obj in root[0]:
-            contents[stack.tag][obj.tag]['tx'] = obj[0].attrib['value']
-            contents[stack.tag][obj.tag]['ty'] = obj[1].attrib['value']
-            contents[stack.tag][obj.tag]['tz'] = obj[2].attrib['value']
+    # Put in the values for every object of every stack listed in the file
+    for stack, obj, translation in iter_stack_xml(file_path):
+        contents[stack][obj]['tx'] = translation[0]
+        contents[stack][obj]['ty'] = translation[1]
+        contents[stack][obj]['tz'] = translation[2]
     # Return the auto dictionary
     return contents
 
+def iter_stack_xml(file_path=None):
+    """
+    This function streams the objects of every stack in a given XML file. Elements are
+    cleared as soon as they have been read, so memory does not grow with the number of
+    objects read, apart from the parser's table of element names, which holds each
+    distinct stack and object name once.
+
+    The file has a root element holding one element per stack, named after the stack,
+    which holds one element per object, named after the object. Each object holds tx,
+    ty, and tz elements with the translation in their value attribute. A stack or
+    object whose name cannot be an element name, such as a name with a namespace or a
+    DAG path, has its name in a name attribute instead.
+
+    :param file_path: The location of the XML file on disk.
+    :type: str
+
+    :return: A generator of (stack, obj, (tx, ty, tz)) records, with the translation
+    already converted to floats.
+    :type: generator
+    """
+    # How deep the parser is in the document, where the root is at depth 1
+    depth = 0
+    root = None
+    stack_elem = None
+    stack = None
+    for event, elem in et.iterparse(file_path, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            # Keep the root and the current stack so they can be cleared
+            if depth == 1:
+                root = elem
+            elif depth == 2:
+                stack_elem = elem
+                # Read the stack's name now, as clearing the stack also clears its
+                #   attributes
+                stack = elem.get('name', elem.tag)
+            continue
+
+        depth -= 1
+        # The end of an object, whose children hold its translation
+        if depth == 2:
+            yield stack, elem.get('name', elem.tag), read_translation(elem)
+            # Drop the object now that it has been read
+            stack_elem.clear()
+        # The end of a stack
+        elif depth == 1:
+            root.clear()
+
+def read_translation(obj_elem=None):
+    """
+    This function reads the translation of an object element from its tx, ty, and tz
+    children. If the children are not named tx, ty, and tz, they are read in order.
+
+    :param obj_elem: The element of the object.
+    :type: xml.etree.ElementTree.Element
+
+    :return: The translation of the object as floats.
+    :type: tuple
+    """
+    values = {child.tag: child.attrib['value'] for child in obj_elem}
+    # Read the translation by name, falling back to the order of the children
+    if 'tx' in values and 'ty' in values and 'tz' in values:
+        return float(values['tx']), float(values['ty']), float(values['tz'])
+    tx, ty, tz = [float(child.attrib['value']) for child in obj_elem][:3]
+    return tx, ty, tz
+
+def apply_transform_table(table=None, undoable=True):
+    """
+    This function sets the translation of every object in a transform table in one
+    pass. Each name in the table is looked up once with OpenMaya, without a command per
+    object, and every translation is set by a single OpenMaya DG modifier rather than
+    one command per object. A table can name the same node more than once, or in more
+    than one way, such as by its short name and its DAG path, in which case its last row
+    is the one applied. By default the modifier is run through the undoable command in
+    the undo_modifier module, inside a single undo chunk, so the whole layout undoes in
+    one step. When the layout does not need to be undone, such as in batch builds, the
+    modifier is run directly and is not added to the undo queue.
+
+    :param table: The translations to apply.
+    :type: TransformTable
+
+    :param undoable: Whether the changes can be undone.
+    :type: bool
+
+    :return: The number of rows that were applied, skipped because the object is not a
+    transform or the translation is not a number, and missing from the scene.
+    :type: dict
+    """
+    report = {'applied': 0, 'skipped': 0, 'missing': 0}
+    if not table:
+        return report
+    # Look up the node of every name once. A selection list merges a node that is
+    #   already in it, so each name gets a list of its own to keep them apart
+    import maya.api.OpenMaya as om
+    name_nodes = {}
+    for obj in set(table.objects):
+        sel_list = om.MSelectionList()
+        try:
+            sel_list.add(obj)
+        except RuntimeError:
+            # The object does not exist
+            name_nodes[obj] = None
+            continue
+        name_nodes[obj] = sel_list.getDependNode(0)
+
+    # Gather the rows that can be applied, keeping the last row for each node
+    to_apply = {}
+    for row, obj in enumerate(table.objects):
+        translation = table.translation(row)
+        node = name_nodes[obj]
+        if node is None:
+            report['missing'] += 1
+        elif (not node.hasFn(om.MFn.kTransform)
+              or not all(map(math.isfinite, translation))):
+            report['skipped'] += 1
+        else:
+            node_fn = om.MFnDependencyNode(node)
+            to_apply[node_fn.uuid().asString()] = (node_fn, translation)
+            report['applied'] += 1
+    if not to_apply:
+        return report
+
+    # Set every translation with one DG modifier
+    modifier = om.MDGModifier()
+    for node_fn, translation in to_apply.values():
+        for attr_name, value in zip(('translateX', 'translateY', 'translateZ'),
+                                    translation):
+            modifier.newPlugValueDouble(node_fn.findPlug(attr_name, False), value)
+    if undoable:
+        # Run the modifier as one undoable command inside one undo chunk with the
+        #   viewport suspended
+        from td_maya_tools.undo_modifier import run_modifier
+        with BuildContext('apply_transform_table'):
+            run_modifier(modifier)
+    else:
+        modifier.doIt()
+    return report
+
+def write_stack_xml(file_path=None, table=None):
+    """
+    This function writes the contents of a transform table to an XML file that
+    read_stack_xml can read back. Stacks and objects are written as elements named after
+    them, unless their name cannot be an element name, in which case they are written
+    as stack and object elements with the name in a name attribute.
+
+    :param file_path: The location of the XML file on disk.
+    :type: str
+
+    :param table: The translations to write.
+    :type: TransformTable
+
+    :return: The success of the operation
+    :type: bool
+    """
+    # Check the arguments
+    if not file_path or table is None:
+        cmds.warning("You must provide a location to write the file and the contents"
+                     " to write.")
+        return None
+
+    with open(file_path, 'w', encoding='utf-8') as xml_fh:
+        xml_fh.write('<?xml version="1.0" encoding="utf-8"?>\n<stacks>\n')
+        # Write every stack with its objects nested under it
+        for stack, rows in table.rows_by_stack():
+            stack_tag, stack_attrs = xml_element_name(stack, 'stack')
+            xml_fh.write(f'  <{stack_tag}{stack_attrs}>\n')
+            for row in rows:
+                obj_tag, obj_attrs = xml_element_name(table.objects[row], 'object')
+                # Write the floats with repr so that they read back exactly
+                tx, ty, tz = [quoteattr(repr(value)) for value in table.translation(row)]
+                xml_fh.write(f'    <{obj_tag}{obj_attrs}><tx value={tx}/><ty value={ty}/>'
+                             f'<tz value={tz}/></{obj_tag}>\n')
+            xml_fh.write(f'  </{stack_tag}>\n')
+        xml_fh.write('</stacks>\n')
+    return True
+
+def xml_element_name(name=None, fallback_tag=None):
+    """
+    This function works out how to write a stack or object name in a layout XML file.
+
+    :param name: The name of the stack or object.
+    :type: str
+
+    :param fallback_tag: The element name to use if the name cannot be one.
+    :type: str
+
+    :return: The element name, and the attributes to write after it, which hold the
+    name if it could not be the element name.
+    :type: tuple
+    """
+    if XML_TAG_PATTERN.match(name):
+        return name, ''
+    return fallback_tag, f' name={quoteattr(name)}'
+
+def write_stack_bin(file_path=None, table=None):
+    """
+    This function writes the contents of a transform table to a binary layout file,
+    which reads back much faster than XML. The format is described at the top of this
+    module.
+
+    :param file_path: The location of the binary file on disk.
+    :type: str
+
+    :param table: The translations to write.
+    :type: TransformTable
+
+    :return: The success of the operation
+    :type: bool
+    """
+    # Check the arguments
+    if not file_path or table is None:
+        cmds.warning("You must provide a location to write the file and the contents"
+                     " to write.")
+        return None
+
+    # Order the rows so that the rows of each stack are next to each other
+    stacks = []
+    stack_starts = array('I')
+    row_order = []
+    # The object names of each stack are encoded together, so that where they start
+    #   can be stored and a reader can decode the names of one stack on their own
+    name_chunks = []
+    for stack, rows in table.rows_by_stack():
+        stacks.append(stack)
+        stack_starts.append(len(row_order))
+        row_order.extend(rows)
+        name_chunks.append(''.join(table.objects[row] + '\0'
+                                   for row in rows).encode('utf-8'))
+    stack_starts.append(len(row_order))
+    translations = array('d')
+    for row in row_order:
+        translations.extend(table.translation(row))
+    strings = ''.join(stack + '\0' for stack in stacks).encode('utf-8')
+    name_starts = array('Q', [len(strings)])
+    for chunk in name_chunks:
+        name_starts.append(name_starts[-1] + len(chunk))
+    strings += b''.join(name_chunks)
+    # Layout files are always little-endian
+    if sys.byteorder == 'big':
+        stack_starts.byteswap()
+        name_starts.byteswap()
+        translations.byteswap()
+
+    with open(file_path, 'wb') as bin_fh:
+        bin_fh.write(BIN_HEADER.pack(BIN_MAGIC, BIN_VERSION, 0, len(stacks),
+                                     len(row_order), len(strings)))
+        bin_fh.write(stack_starts.tobytes())
+        # Pad so that the name starts and translations start on an 8 byte boundary
+        bin_fh.write(b'\0' * (-len(stack_starts) * 4 % 8))
+        bin_fh.write(name_starts.tobytes())
+        bin_fh.write(translations.tobytes())
+        bin_fh.write(strings)
+    return True
+
+def read_stack_bin(file_path=None):
+    """
+    This function reads a binary layout file written by write_stack_bin into a
+    transform table.
+
+    :param file_path: The location of the binary file on disk.
+    :type: str
+
+    :return: The contents of the file.
+    :type: TransformTable
+    """
+    # Check the argument
+    if not file_path:
+        cmds.warning("You must provide a location to read the file.")
+        return None
+
+    with open(file_path, 'rb') as bin_fh:
+        data = bin_fh.read()
+    stack_count, row_count, starts_offset, name_starts_offset, translations_offset, \
+        strings_offset = read_bin_header(data)
+
+    # Read each section straight into its array
+    stack_starts = array('I')
+    stack_starts.frombytes(data[starts_offset:starts_offset + (stack_count + 1) * 4])
+    table = TransformTable()
+    table.translations.frombytes(data[translations_offset:strings_offset])
+    if sys.byteorder == 'big':
+        stack_starts.byteswap()
+        table.translations.byteswap()
+    names = data[strings_offset:].decode('utf-8').split('\0')
+    table.stacks = names[:stack_count]
+    table.objects = names[stack_count:stack_count + row_count]
+    table.stack_indices = {stack: index for index, stack in enumerate(table.stacks)}
+    # Every row of a stack is between its start and the next stack's start
+    for stack_id in range(stack_count):
+        table.stack_ids.extend([stack_id] * (stack_starts[stack_id + 1]
+                                             - stack_starts[stack_id]))
+    return table
+
+def read_bin_header(data=None):
+    """
+    This function reads the header of a binary layout file and works out where each of
+    its sections start.
+
+    :param data: The contents of the file, or at least its first bytes.
+    :type: bytes
+
+    :return: The number of stacks, the number of rows, and the offsets of the stack
+    starts, name starts, translations, and string table.
+    :type: tuple
+    """
+    magic, version, reserved, stack_count, row_count, strings_size = \
+        BIN_HEADER.unpack_from(data, 0)
+    if magic != BIN_MAGIC or version != BIN_VERSION:
+        raise ValueError("The file is not a version %d stack layout file." % BIN_VERSION)
+    starts_offset = BIN_HEADER.size
+    name_starts_offset = starts_offset + (stack_count + 1) * 4
+    name_starts_offset += -name_starts_offset % 8
+    translations_offset = name_starts_offset + (stack_count + 1) * 8
+    strings_offset = translations_offset + row_count * 24
+    return (stack_count, row_count, starts_offset, name_starts_offset,
+            translations_offset, strings_offset)
+
 #----------------------------------------------------------------------------------------#
 #----------------------------------------------------------------------------- CLASSES --#
 
@@ -79,4 +442,410 @@ class Autovivification(dict):
             return dict.__getitem__(self, item)
         except KeyError:
             value = self[item] = type(self)()
-            return value
\ No newline at end of file
+            return value
+
+class BuildContext(object):
+    """
+    A context manager for making many changes to the scene at once. The changes are put
+    in a single undo chunk, so they undo in one step, and the viewport refresh and auto
+    keying are suspended until the changes are done. Everything is restored even if an
+    exception is raised. Contexts opened inside another context do nothing, so the
+    outermost context decides when the build is done.
+
+    For builds that are spread over several calls, open and close can be called
+    directly instead of using a with statement.
+
+    Every outermost context has its own generation number, so caches of the scene can
+    tell whether what they cached was read inside the context that is open now.
+    """
+    # The number of contexts that are open
+    depth = 0
+    # The number of the outermost context that is open or was opened last
+    generation = 0
+
+    def __init__(self, chunk_name='stack_build', suspend_refresh=True):
+        # The name of the undo chunk
+        self.chunk_name = chunk_name
+        # Whether to suspend the viewport refresh
+        self.suspend_refresh = suspend_refresh
+        # Whether this context is the outermost one and has changed the settings
+        self.is_outermost = False
+        # Whether auto keying was on before the context was opened
+        self.auto_key_state = False
+
+    def open(self):
+        """
+        Opens the undo chunk and suspends the refresh and auto keying, unless another
+        context is already open.
+        """
+        if BuildContext.depth:
+            BuildContext.depth += 1
+            return
+        cmds.undoInfo(openChunk=True, chunkName=self.chunk_name)
+        # Only count the context as open once its chunk is, so that a chunk that fails
+        #   to open does not leave every later context doing nothing
+        BuildContext.depth += 1
+        BuildContext.generation += 1
+        self.is_outermost = True
+        try:
+            # Stop every move from setting keys
+            self.auto_key_state = cmds.autoKeyframe(query=True, state=True)
+            if self.auto_key_state:
+                cmds.autoKeyframe(state=False)
+            # Stop the viewport and outliner from redrawing after every change
+            if self.suspend_refresh:
+                cmds.refresh(suspend=True)
+        except Exception:
+            # Put everything back if the context could not be opened
+            self.close()
+            raise
+
+    def close(self):
+        """
+        Restores the refresh and auto keying and closes the undo chunk, if this context
+        opened them.
+        """
+        BuildContext.depth -= 1
+        if not self.is_outermost:
+            return
+        self.is_outermost = False
+        try:
+            if self.suspend_refresh:
+                cmds.refresh(suspend=False)
+            if self.auto_key_state:
+                cmds.autoKeyframe(state=True)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+class TransformTable(object):
+    """
+    A compact, column based table of the translation of every object of every stack.
+    Each row holds the index of its stack, the object's name, and three floats in one
+    flat array, so large layouts do not need a dictionary per object. For
+    compatibility with Autovivification dictionaries, table[stack][obj]['tx'] also
+    works, but looking up a missing stack raises a KeyError rather than adding it.
+    """
+    def __init__(self):
+        # The names of the stacks, in the order they were first seen
+        self.stacks = []
+        # The index into the stacks of each row
+        self.stack_ids = array('i')
+        # The object of each row
+        self.objects = []
+        # The translations of every row, stored flat as tx, ty, tz, tx, ty, tz, ...
+        self.translations = array('d')
+        # The index of each stack's name
+        self.stack_indices = {}
+        # The rows of each stack, built the first time a stack is looked up
+        self.stack_rows = None
+
+    def append(self, stack=None, obj=None, translation=None):
+        """
+        Adds the translation of an object in a stack to the end of the table.
+
+        :param stack: The name of the stack.
+        :type: str
+
+        :param obj: The name of the object.
+        :type: str
+
+        :param translation: The (tx, ty, tz) translation of the object.
+        :type: tuple
+        """
+        stack_id = self.stack_indices.get(stack)
+        if stack_id is None:
+            stack_id = self.stack_indices[stack] = len(self.stacks)
+            self.stacks.append(stack)
+        self.stack_ids.append(stack_id)
+        self.objects.append(obj)
+        self.translations.extend(translation)
+        self.stack_rows = None
+
+    def translation(self, row=0):
+        """
+        Returns the translation of a row.
+
+        :param row: The index of the row.
+        :type: int
+
+        :return: The (tx, ty, tz) translation of the row.
+        :type: tuple
+        """
+        return tuple(self.translations[row * 3:row * 3 + 3])
+
+    def rows(self):
+        """
+        Returns every row of the table in order.
+
+        :return: A generator of (stack, obj, (tx, ty, tz)) records.
+        :type: generator
+        """
+        for row, obj in enumerate(self.objects):
+            yield self.stacks[self.stack_ids[row]], obj, self.translation(row)
+
+    def rows_by_stack(self):
+        """
+        Returns the rows of every stack, with the stacks in the order they were first
+        seen.
+
+        :return: A list of (stack, rows) pairs.
+        :type: list
+        """
+        # Find the rows of every stack once
+        if self.stack_rows is None:
+            self.stack_rows = {}
+            for row, stack_id in enumerate(self.stack_ids):
+                self.stack_rows.setdefault(self.stacks[stack_id], []).append(row)
+        return [(stack, self.stack_rows.get(stack, [])) for stack in self.stacks]
+
+    def as_numpy(self):
+        """
+        Returns the translations as an (N, 3) NumPy float64 array that shares memory
+        with the table, so nothing is copied. Rows cannot be appended to the table while
+        the array is still in use.
+
+        :return: The translation of every row.
+        :type: numpy.ndarray
+        """
+        if numpy is None:
+            raise ImportError("NumPy is needed to view the translations as an array.")
+        return numpy.frombuffer(self.translations, dtype=numpy.float64).reshape(-1, 3)
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __iter__(self):
+        return iter(self.stacks)
+
+    def __contains__(self, stack):
+        return stack in self.stack_indices
+
+    def __getitem__(self, stack):
+        # Find the rows of every stack once
+        if self.stack_rows is None:
+            self.rows_by_stack()
+        # Build the stack's objects the way an Autovivification dictionary holds them
+        stack_contents = {}
+        for row in self.stack_rows[stack]:
+            tx, ty, tz = self.translation(row)
+            stack_contents[self.objects[row]] = {'tx': tx, 'ty': ty, 'tz': tz}
+        return stack_contents
+
+    def keys(self):
+        return list(self.stacks)
+
+    def items(self):
+        return [(stack, self[stack]) for stack in self.stacks]
+
+class MappedLayout(object):
+    """
+    A binary layout file written by write_stack_bin, memory-mapped so that nothing is
+    read until it is used. The translations are exposed as a zero-copy view of the
+    file, and the rows of any stack can be sliced out of it without reading the rest of
+    the file. Names are only decoded when they are asked for, and only for the stacks
+    they are asked for.
+
+    This can be used as a context manager, which closes the file on exit. The memory
+    map cannot be closed while views or arrays of it are still referenced, so closing
+    leaves it open until the last of them is deleted.
+    """
+    def __init__(self, file_path=None):
+        # The file and its memory map
+        self.file_handle = open(file_path, 'rb')
+        self.mapped = mmap.mmap(self.file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        # The number of stacks and rows, and where each section of the file starts
+        self.stack_count, self.row_count, starts_offset, name_starts_offset, \
+            translations_offset, self.strings_offset = read_bin_header(self.mapped)
+        # The views of the stack starts, name starts and translations; the file is
+        #   little-endian, so the views can only be used as is on little-endian hosts
+        if sys.byteorder == 'big':
+            self.close()
+            raise ValueError("Binary layout files can only be memory-mapped on "
+                             "little-endian hosts, use read_stack_bin instead.")
+        view = memoryview(self.mapped)
+        self.stack_starts = view[starts_offset:starts_offset
+                                 + (self.stack_count + 1) * 4].cast('I')
+        self.name_starts = view[name_starts_offset:translations_offset].cast('Q')
+        self.translations = view[translations_offset:self.strings_offset].cast('d')
+        view.release()
+        # The names, decoded the first time they are needed
+        self.stack_names = None
+        self.stack_indices = None
+        self.object_names = None
+
+    def stack_index(self, stack=None):
+        """
+        Returns the index of a stack.
+
+        :param stack: The name or index of the stack.
+        :type: str or int
+
+        :return: The index of the stack.
+        :type: int
+        """
+        return stack if isinstance(stack, int) else self.get_stack_indices()[stack]
+
+    def stack_rows(self, stack=None):
+        """
+        Returns the range of rows that belong to a stack.
+
+        :param stack: The name or index of the stack.
+        :type: str or int
+
+        :return: The first row of the stack and the row after its last row.
+        :type: tuple
+        """
+        stack_id = self.stack_index(stack)
+        return self.stack_starts[stack_id], self.stack_starts[stack_id + 1]
+
+    def stack_translations(self, stack=None):
+        """
+        Returns a zero-copy view of a stack's translations, flat as tx, ty, tz, tx, ...
+
+        :param stack: The name or index of the stack.
+        :type: str or int
+
+        :return: The translations of the stack's rows.
+        :type: memoryview
+        """
+        start, end = self.stack_rows(stack)
+        return self.translations[start * 3:end * 3]
+
+    def as_numpy(self):
+        """
+        Returns the translations as an (N, 3) NumPy float64 array backed by the memory
+        map, so nothing is copied or read until it is used. The array keeps the memory
+        map open after the layout is closed, until the array is deleted.
+
+        :return: The translation of every row.
+        :type: numpy.ndarray
+        """
+        if numpy is None:
+            raise ImportError("NumPy is needed to view the translations as an array.")
+        return numpy.frombuffer(self.translations, dtype=numpy.float64).reshape(-1, 3)
+
+    def get_stack_names(self):
+        """
+        Returns the names of the stacks, reading only the start of the string table.
+
+        :return: The name of each stack.
+        :type: list
+        """
+        if self.stack_names is None:
+            # The stack names come first, each ending in a null byte
+            end = self.strings_offset + self.name_starts[0]
+            self.stack_names = self.mapped[self.strings_offset:end].decode(
+                'utf-8').split('\0')[:self.stack_count]
+        return self.stack_names
+
+    def get_stack_indices(self):
+        """
+        Returns the index of each stack's name.
+
+        :return: The index of each stack, keyed by name.
+        :type: dict
+        """
+        if self.stack_indices is None:
+            self.stack_indices = {stack: index for index, stack
+                                  in enumerate(self.get_stack_names())}
+        return self.stack_indices
+
+    def get_object_names(self):
+        """
+        Returns the name of the object of every row.
+
+        :return: The name of each row's object.
+        :type: list
+        """
+        if self.object_names is None:
+            start = self.strings_offset + self.name_starts[0]
+            self.object_names = self.mapped[start:].decode('utf-8').split('\0')[:-1]
+        return self.object_names
+
+    def get_stack_objects(self, stack=None):
+        """
+        Returns the name of the object of every row of a stack, decoding only the
+        stack's names unless every name has already been decoded.
+
+        :param stack: The name or index of the stack.
+        :type: str or int
+
+        :return: The name of each of the stack's objects.
+        :type: list
+        """
+        stack_id = self.stack_index(stack)
+        if self.object_names is not None:
+            start, end = self.stack_rows(stack_id)
+            return self.object_names[start:end]
+        start = self.strings_offset + self.name_starts[stack_id]
+        end = self.strings_offset + self.name_starts[stack_id + 1]
+        return self.mapped[start:end].decode('utf-8').split('\0')[:-1]
+
+    def to_table(self, stacks=None):
+        """
+        Copies the rows of the given stacks into a transform table, for example to
+        apply them with apply_transform_table.
+
+        :param stacks: The names or indices of the stacks to copy. If not given, every
+        stack is copied.
+        :type: list
+
+        :return: The rows of the stacks.
+        :type: TransformTable
+        """
+        if stacks is None:
+            stacks = range(self.stack_count)
+        stack_names = self.get_stack_names()
+        table = TransformTable()
+        for stack in stacks:
+            stack_id = self.stack_index(stack)
+            start, end = self.stack_rows(stack_id)
+            # Copy the stack's rows in bulk
+            table.stack_indices[stack_names[stack_id]] = len(table.stacks)
+            table.stack_ids.extend([len(table.stacks)] * (end - start))
+            table.stacks.append(stack_names[stack_id])
+            table.objects.extend(self.get_stack_objects(stack_id))
+            table.translations.extend(self.translations[start * 3:end * 3])
+        return table
+
+    def close(self):
+        """
+        Releases the views and closes the memory map and the file. Views and arrays of
+        the translations that are still referenced keep the memory map open, and it is
+        closed once the last of them is deleted.
+        """
+        for view_name in ('stack_starts', 'name_starts', 'translations'):
+            view = getattr(self, view_name, None)
+            if view is not None:
+                try:
+                    view.release()
+                except BufferError:
+                    # An array still uses the view, which is released with it
+                    pass
+                setattr(self, view_name, None)
+        if self.mapped is not None:
+            try:
+                self.mapped.close()
+            except BufferError:
+                # A view or array is still in use, and the memory map is closed when
+                #   the last of them is deleted
+                pass
+            self.mapped = None
+        self.file_handle.close()
+
+    def __len__(self):
+        return self.row_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
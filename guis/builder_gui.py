@@ -17,7 +17,9 @@
     stacks to make, maximum height of a stack, and distance between stacks. The GUI will
     duplicate the geometry specified in order to create the stack of objects, will use the
     stacker module in order to stack the objects, and will also warn users if any fields
-    are missing information or given the wrong information.
+    are missing information or given the wrong information. Builds run a few steps at a
+    time from a timer, so the GUI shows their progress and can cancel them, and can
+    update the last build instead of making every stack again.
 
 :applications:
     Maya
@@ -30,17 +32,30 @@
 #----------------------------------------------------------------------------- IMPORTS --#
 
 # Default Python Imports
-import random
+import time
+from PySide2 import QtCore
 from PySide2 import QtWidgets
 import maya.cmds as cmds
 
 # Imports That You Wrote
 
 from td_maya_tools.guis.maya_gui_utils import get_maya_window
-from td_maya_tools.stacker import stack_objs
-from td_maya_tools.stacker import get_center_point
-from td_maya_tools.stacker import offset_objs_in_x
+from td_maya_tools.guis.stack_tree_model import StackTreeModel
 from td_maya_tools.gen_utils import read_stack_xml
+from td_maya_tools.gen_utils import apply_transform_table
+from td_maya_tools.gen_utils import read_stack_bin
+from td_maya_tools.gen_utils import write_stack_xml
+from td_maya_tools.gen_utils import write_stack_bin
+from td_maya_tools.builder import StackBuildJob
+from td_maya_tools.stacker import get_local_bounding_boxes
+from td_maya_tools.planner import PlanCache
+from td_maya_tools.profiling import phase
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- CONSTANTS --#
+
+# How long each tick of a build may run before letting Maya handle events, in seconds
+BUILD_TICK_SECONDS = 0.05
 
 #----------------------------------------------------------------------------------------#
 #--------------------------------------------------------------------------- FUNCTIONS --#
@@ -63,13 +78,50 @@ class BuilderGUI(QtWidgets.QDialog):
         self.base_objects = None
         self.middle_objects = None
         self.top_objects = None
+        # The local bounding box of every object chosen, measured when it is chosen
+        self.source_boxes = {}
         # The QSpinBoxes for stack count and max height
         self.stack_count_box = None
         self.max_height_box = None
         # The QDoubleSpinBox for the separation
         self.set_separation_box = None
-        # The tree view
+        # The QCheckBox for making instances instead of copies
+        self.instance_cb = None
+        # The QCheckBox for updating the last build instead of making new stacks
+        self.update_cb = None
+        # The QCheckBox for stacking on mesh vertices instead of bounding boxes
+        self.tight_cb = None
+        # The QSpinBox for the seed
+        self.seed_box = None
+        # The QSpinBox for the number of stacks in each row
+        self.per_row_box = None
+        # The QDoubleSpinBoxes for the height to fill stacks to and its tolerance
+        self.target_height_box = None
+        self.tolerance_box = None
+        # The cache of stack plans, so rebuilding with the same seed reuses the plan
+        self.plan_cache = PlanCache()
+        # The tree view and its model
         self.tree_view = None
+        self.tree_model = None
+        # The script job that follows the scene selection, and whether the tree view is
+        #   being updated to match it
+        self.selection_job = None
+        self.syncing_selection = False
+        # The result of the last build, and the inputs it was made from other than the
+        #   seed
+        self.build_result = None
+        self.build_inputs = None
+        # The build that is running, its steps, and the timer that runs them
+        self.build_job = None
+        self.build_steps = None
+        self.build_timer = None
+        # The progress bar for the running build, and the widgets that are locked while
+        #   it runs
+        self.progress_bar = None
+        self.options_widget = None
+        self.load_xml_btn = None
+        self.save_xml_btn = None
+        self.make_stacks_btn = None
 
     def init_gui(self):
         """
@@ -80,42 +132,68 @@ class BuilderGUI(QtWidgets.QDialog):
 
         # Create horizontal layout for QFormLayout and tree view
         qform_and_tree_view_hb = QtWidgets.QHBoxLayout()
-        # Getting and adding QFormLayout to horizontal layout
+        # Getting and adding QFormLayout to horizontal layout, in a widget of its own so
+        #   that the options can be locked while a build runs
         qform_layout = self.make_options_layout()
-        qform_and_tree_view_hb.addLayout(qform_layout)
-        # Creating tree view
-        self.tree_view = QtWidgets.QTreeWidget()
+        qform_layout.setContentsMargins(0, 0, 0, 0)
+        self.options_widget = QtWidgets.QWidget()
+        self.options_widget.setLayout(qform_layout)
+        qform_and_tree_view_hb.addWidget(self.options_widget)
+        # Creating tree view over a model that is filled lazily from the build
+        self.tree_view = QtWidgets.QTreeView()
+        self.tree_model = StackTreeModel(self)
+        self.tree_view.setModel(self.tree_model)
         # Customizing tree view
         self.tree_view.setAlternatingRowColors(True)
         self.tree_view.setMinimumWidth(200)
         self.tree_view.setMinimumHeight(140)
-        self.tree_view.setHeaderLabel('Object Stacks')
+        self.tree_view.setUniformRowHeights(True)
+        self.tree_view.setSelectionMode(
+            QtWidgets.QAbstractItemView.ExtendedSelection)
         # Connect click function to whenever something is selected in tree view
         self.tree_view.selectionModel().selectionChanged.connect(
             self.tree_item_clicked)
+        # Highlight the rows of the objects selected in the scene
+        self.selection_job = cmds.scriptJob(
+            event=['SelectionChanged', self.scene_selection_changed])
 
         # Adding tree view to layout
         qform_and_tree_view_hb.addWidget(self.tree_view)
         # Add the horizontal layout to the main layout
         main_vb.addLayout(qform_and_tree_view_hb)
 
+        # Create a progress bar that is shown while stacks are being built
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.hide()
+        main_vb.addWidget(self.progress_bar)
+        # Create the timer that runs the steps of a build between events
+        self.build_timer = QtCore.QTimer(self)
+        self.build_timer.setInterval(0)
+        self.build_timer.timeout.connect(self.continue_build)
+
         # Create horizontal layout for load xml, make stacks, and cancel buttons
         btns_hb = QtWidgets.QHBoxLayout()
         # Create Load XML button and customize it
-        load_xml_btn = QtWidgets.QPushButton('Load XML')
-        load_xml_btn.clicked.connect(self.apply_xml)
-        load_xml_btn.setStyleSheet('background-color: OrangeRed')
+        self.load_xml_btn = QtWidgets.QPushButton('Load XML')
+        self.load_xml_btn.clicked.connect(self.apply_xml)
+        self.load_xml_btn.setStyleSheet('background-color: OrangeRed')
+        # Create Save XML button and customize it
+        self.save_xml_btn = QtWidgets.QPushButton('Save XML')
+        self.save_xml_btn.clicked.connect(self.save_xml)
+        self.save_xml_btn.setStyleSheet('background-color: DarkOrange')
         # Create Make Stacks button and customize it
-        make_stacks_btn = QtWidgets.QPushButton('Make Stacks')
-        make_stacks_btn.clicked.connect(self.make_stacks)
-        make_stacks_btn.setStyleSheet('background-color: ForestGreen')
-        # Create Cancel button and customize it
+        self.make_stacks_btn = QtWidgets.QPushButton('Make Stacks')
+        self.make_stacks_btn.clicked.connect(self.make_stacks)
+        self.make_stacks_btn.setStyleSheet('background-color: ForestGreen')
+        # Create Cancel button, which stops a running build or closes the GUI
         cancel_btn = QtWidgets.QPushButton('Cancel')
-        cancel_btn.clicked.connect(self.close)
+        cancel_btn.clicked.connect(self.cancel_build)
         cancel_btn.setStyleSheet('background-color: LightCoral')
         # Add buttons to horizontal layout
-        btns_hb.addWidget(load_xml_btn)
-        btns_hb.addWidget(make_stacks_btn)
+        btns_hb.addWidget(self.load_xml_btn)
+        btns_hb.addWidget(self.save_xml_btn)
+        btns_hb.addWidget(self.make_stacks_btn)
         btns_hb.addWidget(cancel_btn)
         # Add the horizontal layout to the main layout
         main_vb.addLayout(btns_hb)
@@ -199,10 +277,47 @@ class BuilderGUI(QtWidgets.QDialog):
         # Making increment 0.1 and setting default value and minimum value to 0.1
         self.set_separation_box.setValue(0.1)
         self.set_separation_box.setSingleStep(0.1)
+        # Create a QCheckBox for making instances instead of copies
+        self.instance_cb = QtWidgets.QCheckBox('Use Instances')
+        # Create a QSpinBox for the seed, where zero picks a new random seed
+        seed_lbl = QtWidgets.QLabel('Set Seed')
+        self.seed_box = QtWidgets.QSpinBox()
+        self.seed_box.setRange(0, 2 ** 31 - 1)
+        self.seed_box.setSpecialValueText('Random')
+        # Create a QSpinBox for the stacks in each row, where zero keeps one row
+        per_row_lbl = QtWidgets.QLabel('Set Stacks Per Row')
+        self.per_row_box = QtWidgets.QSpinBox()
+        self.per_row_box.setRange(0, 100000)
+        self.per_row_box.setSpecialValueText('One Row')
+        # Create a QDoubleSpinBox for the height to fill each stack to, where zero
+        #   uses a random number of middle pieces up to the max height instead
+        target_height_lbl = QtWidgets.QLabel('Set Target Height')
+        self.target_height_box = QtWidgets.QDoubleSpinBox()
+        self.target_height_box.setRange(0, 100000)
+        self.target_height_box.setSpecialValueText('Off')
+        # Create a QDoubleSpinBox for how far a stack may be from the target height
+        tolerance_lbl = QtWidgets.QLabel('Set Height Tolerance')
+        self.tolerance_box = QtWidgets.QDoubleSpinBox()
+        self.tolerance_box.setValue(0.1)
+        self.tolerance_box.setSingleStep(0.1)
         # Add each to the QFormLayout
         layout.addRow(num_stacks_lbl, self.stack_count_box)
         layout.addRow(max_height_lbl, self.max_height_box)
         layout.addRow(separation_lbl, self.set_separation_box)
+        layout.addRow(seed_lbl, self.seed_box)
+        layout.addRow(per_row_lbl, self.per_row_box)
+        layout.addRow(target_height_lbl, self.target_height_box)
+        layout.addRow(tolerance_lbl, self.tolerance_box)
+        layout.addRow(self.instance_cb)
+        # Create a QCheckBox for updating the last build, rebuilding only the stacks
+        #   that changed, instead of making a new set of stacks
+        self.update_cb = QtWidgets.QCheckBox('Update Last Build')
+        self.update_cb.setChecked(True)
+        layout.addRow(self.update_cb)
+        # Create a QCheckBox for stacking rotated pieces on their lowest and highest
+        #   vertices instead of their bounding boxes
+        self.tight_cb = QtWidgets.QCheckBox('Tight Fit')
+        layout.addRow(self.tight_cb)
 
         # Return the layout
         return layout
@@ -210,7 +325,9 @@ class BuilderGUI(QtWidgets.QDialog):
     def set_selection(self):
         """
         This function gets the current selection and updates the appropriate line edit
-        by displaying the number of objects, making it uneditable, and changing its color
+        by displaying the number of objects, making it uneditable, and changing its color.
+        The bounding box of each object is measured here, so set the parts again after
+        rotating or scaling them.
 
         :return: Whether the function completed without error
         :type: bool
@@ -222,6 +339,8 @@ class BuilderGUI(QtWidgets.QDialog):
             # If selection does not exist, warn the user
             self.warn_user('Builder - Selection', 'You must have objects selected.')
             return None
+        # Measure every object once, so that its duplicates never have to be measured
+        self.source_boxes.update(get_local_bounding_boxes(sel))
         # Getting size of selection and formatting into string
         sel_size = len(sel)
         num_objects_str = f"{sel_size} objects"
@@ -258,91 +377,164 @@ class BuilderGUI(QtWidgets.QDialog):
 
     def make_stacks(self):
         """
-        This function randomly chooses an object given from each of the base, middle,
-        and top categories, duplicates the geometry, then creates the stack using the
-        stacker module and groups the pieces of the stack.
+        This function starts building the stacks from the objects given for each of the
+        base, middle, and top categories using the builder module. The build runs a few
+        steps at a time from a timer, and adds the stacks to the tree view when it is
+        done.
 
-        :return: Whether the function completed without error.
+        :return: Whether the build was started without error.
         :type: bool
         """
+        # Only run one build at a time
+        if self.build_job:
+            return None
         # Verify the arguments entered are valid
         valid_args = self.verify_args()
         # If the arguments are not valid, immediately end function
         if not valid_args:
             return None
 
-        # Creating list of stacks
-        list_of_stacks = []
-        # Create the stacks
-        for num in range(self.stack_count_box.value()):
-            # Randomly choose an option from each category
-            base = random.choice(self.base_objects)
-            top = random.choice(self.top_objects)
-            # Duplicate the base object and save in list of objects to duplicate
-            obj_to_stack = cmds.duplicate([base])
-
-            # Find how many random middle objects to add
-            num_middle_objs = random.randint(1, self.max_height_box.value())
-            # Make all middle object duplicates
-            for mid_num in range(num_middle_objs):
-                # Get random middle object
-                middle = random.choice(self.middle_objects)
-                # Duplicate the middle
-                mid_dup = cmds.duplicate([middle])
-                # Append it to the list of objects to duplicate
-                obj_to_stack.append(mid_dup[0])
-
-            # Append top object to list of objects to duplicate
-            obj_to_stack.append(cmds.duplicate([top])[0])
-
-            # Use stacker module to stack the objects
-            stack_objs(obj_to_stack)
-            # Group the pieces of the stack together
-            group = cmds.group(obj_to_stack, name="stack%03d" % (num + 1))
-            # Adding to list of stacks
-            list_of_stacks.append(group)
-            # Get center point of group using stacker module
-            curr_pos = get_center_point(group, bottom_center_flag=True)
-            # Use center point to move the group to the origin
-            cmds.move(-(curr_pos[0]), -(curr_pos[1]), -(curr_pos[2]), group,
-                      relative=True)
-            # Freeze transformations so translation values for the group are all zero
-            cmds.makeIdentity(group, apply=True, translate=True)
-            # Move pivot of group to origin
-            cmds.xform(group, absolute=True, worldSpace=True, pivots=[0, 0, 0])
-            # Adding the stack to the tree view
-            self.add_stack_to_tree_view(obj_to_stack, "stack%03d" % (num + 1))
-
-        # Adding offset between each stack using stacker module
-        prev_stack = list_of_stacks[0]
-        for stack in list_of_stacks:
-            # Skipping first stack
-            if stack is list_of_stacks[0]:
-                continue
-            # Offset the previous stack and the current stack
-            offset_objs_in_x(prev_stack, stack, self.set_separation_box.value())
-            # Updating previous stack
-            prev_stack = stack
+        # The inputs of the build other than the seed
+        build_inputs = (tuple(self.base_objects), tuple(self.middle_objects),
+                        tuple(self.top_objects), self.stack_count_box.value(),
+                        self.max_height_box.value(), self.set_separation_box.value(),
+                        self.per_row_box.value(), self.instance_cb.isChecked(),
+                        self.tight_cb.isChecked(), self.target_height_box.value(),
+                        self.tolerance_box.value())
+        # Update the last build if asked to. If the seed is random, the last build's
+        #   seed is kept when other inputs changed so that only the stacks they affect
+        #   are rebuilt, and a new one is drawn when nothing else changed so that making
+        #   the stacks again still shuffles them
+        previous = None
+        if self.update_cb.isChecked():
+            previous = self.build_result
+        seed = self.seed_box.value() or None
+        if seed is None and previous and build_inputs != self.build_inputs:
+            seed = previous.seed
+        # The boxes measured when the parts were set are not tight, so a tight build
+        #   measures the sources from their vertices itself
+        tight = self.tight_cb.isChecked()
+        source_boxes = None if tight else self.source_boxes
+        # Set up the build with the builder module, reusing the cached plan if the same
+        #   seed and selections were built before
+        self.build_job = StackBuildJob(self.base_objects, self.middle_objects,
+                                       self.top_objects, self.stack_count_box.value(),
+                                       self.max_height_box.value(),
+                                       self.set_separation_box.value(), seed,
+                                       self.instance_cb.isChecked(), self.plan_cache,
+                                       per_row=self.per_row_box.value() or None,
+                                       previous=previous,
+                                       source_boxes=source_boxes, tight=tight,
+                                       target_height=self.target_height_box.value()
+                                       or None,
+                                       tolerance=self.tolerance_box.value(),
+                                       on_built=lambda result: self.show_build_result(
+                                           result, build_inputs))
+        self.build_steps = self.build_job.steps()
+        # Show the progress and lock everything but Cancel
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat('Starting - %p%')
+        self.lock_gui(True)
+        # Run the build from the timer
+        self.build_timer.start()
 
         # Return true if there are no errors
         return True
 
-    def add_stack_to_tree_view(self, obj_to_stack=None, stack_name=None):
+    def continue_build(self):
+        """
+        This function runs the steps of the current build for a short time, then updates
+        the progress bar so that Maya can handle events before the next tick.
         """
-        This function adds the stack given to the tree view, with the group name as the
-        parent and the transform nodes nested under it
+        if not self.build_steps:
+            return
+        end_time = time.perf_counter() + BUILD_TICK_SECONDS
+        try:
+            # Run at least one step, then keep going until this tick's time is used up
+            next(self.build_steps)
+            while time.perf_counter() < end_time:
+                next(self.build_steps)
+        except StopIteration:
+            # The build is done or was cancelled
+            self.finish_build()
+            return
+        except Exception:
+            # Put the GUI back before passing the error on
+            self.finish_build()
+            raise
+        # Show which stage the build is in and how far through it is
+        self.progress_bar.setValue(int(self.build_job.progress * 100))
+        self.progress_bar.setFormat(f"{self.build_job.stage.title()} - %p%")
+
+    def show_build_result(self, result=None, build_inputs=None):
+        """
+        This function keeps the result of a build so that it can be saved, and adds its
+        stacks to the tree view.
 
-        :param obj_to_stack: The contents of the stack to add to the tree view.
-        :type: list
+        :param result: The stacks that were built.
+        :type: BuildResult
 
-        :param stack_name: The name of the stack's group.
-        :type: str
+        :param build_inputs: The inputs the stacks were built from other than the seed.
+        :type: tuple
+        """
+        # Keep the result so that it can be saved, and its inputs so that the next
+        #   build can tell whether anything changed
+        self.build_result = result
+        self.build_inputs = build_inputs
+        # Adding every stack to the tree view at once, indexed by the UUIDs of its
+        #   nodes so that the tree and the scene selection can follow each other
+        with phase('tree_view'):
+            self.tree_model.set_build_result(result, result.get_uuids())
+
+    def finish_build(self):
+        """
+        This function stops running the current build and puts the GUI back so that
+        another build can be made.
+        """
+        self.build_timer.stop()
+        self.build_job = None
+        self.build_steps = None
+        self.lock_gui(False)
+
+    def lock_gui(self, locked=False):
+        """
+        This function locks every control but Cancel while a build runs and shows its
+        progress. The build keeps its undo chunk open and the viewport refresh suspended
+        between timer ticks, so nothing else the GUI does, such as loading a layout or
+        selecting from the tree view, may run until the build is done. The GUI is also
+        made application modal, so that nothing done in the rest of Maya is added to the
+        build's undo chunk.
+
+        :param locked: Whether a build is running.
+        :type: bool
+        """
+        for widget in (self.options_widget, self.tree_view, self.load_xml_btn,
+                       self.save_xml_btn, self.make_stacks_btn):
+            widget.setEnabled(not locked)
+        self.progress_bar.setVisible(locked)
+        # Qt only applies a new modality when the window is shown again
+        modality = QtCore.Qt.ApplicationModal if locked else QtCore.Qt.NonModal
+        if self.windowModality() != modality:
+            visible = self.isVisible()
+            if visible:
+                self.hide()
+            self.setWindowModality(modality)
+            if visible:
+                self.show()
+
+    def cancel_build(self):
+        """
+        This function cancels the running build, which deletes what it made so far. If
+        no build is running it closes the GUI.
         """
-        # Adding group to tree view
-        group_list = QtWidgets.QTreeWidgetItem(self.tree_view, [stack_name])
-        # Add every object that is in the group to the group in tree view
-        for obj in obj_to_stack:
-            QtWidgets.QTreeWidgetItem(group_list, [obj])
+        if not self.build_job:
+            self.close()
+            return
+        # Ask the build to stop; its next step deletes what it made. An update that has
+        #   started changing the last build's stacks can no longer be stopped
+        self.build_job.cancel()
+        if self.build_job.cancelled:
+            self.progress_bar.setFormat('Cancelling - %p%')
 
     def apply_xml(self):
         """
@@ -356,25 +548,57 @@ class BuilderGUI(QtWidgets.QDialog):
         filename, file_filter = QtWidgets.QFileDialog.getOpenFileName(
             caption="Select File",
             dir="C:/Users/kpm200000/Code/class_13",
-            filter="Files (*.xml)")
+            filter="Files (*.xml *.stk)")
         # If user did not select an XML file, return none
         if not filename:
             self.warn_user('Builder - XML File', 'You must select a file.')
             return None
 
-        # Get contents of file
-        contents = read_stack_xml(filename)
+        # Get contents of file as a compact transform table
+        if filename.endswith('.stk'):
+            contents = read_stack_bin(filename)
+        else:
+            contents = read_stack_xml(filename, compact=True)
         # If the file is empty, return none
         if not contents:
             return None
-        # Applying attributes of each stack to objects in Maya
-        for stack in contents:
-            for obj in contents[stack]:
-                cmds.xform(obj, translation=[float(contents[stack][obj]['tx']),
-                                               float(contents[stack][obj]['ty']),
-                                               float(contents[stack][obj]['tz'])])
+        # Applying the translation of each object of each stack in Maya in one pass
+        report = apply_transform_table(contents)
+        # Let the user know about any objects that could not be applied
+        if report['missing'] or report['skipped']:
+            self.warn_user('Builder - XML File',
+                           f"Applied {report['applied']} objects. {report['missing']} "
+                           f"objects were not found and {report['skipped']} were "
+                           f"skipped.")
         return True
 
+    def save_xml(self):
+        """
+        This function allows the user to choose a file and saves the stacks of the last
+        build to it, as XML or, for .stk files, in the binary layout format
+
+        :return: Whether the stacks were successfully saved
+        :type: bool
+        """
+        # Check that there are stacks to save
+        if not self.build_result:
+            self.warn_user('Builder - Save', 'You must make stacks before saving them.')
+            return None
+        # Allowing user to choose where to save the file
+        filename, file_filter = QtWidgets.QFileDialog.getSaveFileName(
+            caption="Save File",
+            dir="C:/Users/kpm200000/Code/class_13",
+            filter="XML Files (*.xml);;Binary Layout Files (*.stk)")
+        # If user did not choose a file, return none
+        if not filename:
+            return None
+
+        # Write the translation of every stack to the file
+        contents = self.build_result.to_transform_table()
+        if filename.endswith('.stk'):
+            return write_stack_bin(filename, contents)
+        return write_stack_xml(filename, contents)
+
     def verify_args(self):
         """
         This function checks that the GUI has all the information it needs and verifies
@@ -422,17 +646,70 @@ class BuilderGUI(QtWidgets.QDialog):
 
     def tree_item_clicked(self):
         """
-        This function selects the object that is selected in the tree view whenever
-        a new selection in the tree view is made
-        """
-        # Getting the index of the selected item
-        index = self.tree_view.currentIndex()
-        # Getting the object that was selected
-        obj = self.tree_view.model().data(index)
-        # Removing all previous selections
-        cmds.select(clear=True)
-        # Selecting the object
-        cmds.select([obj])
+        This function selects the objects that are selected in the tree view whenever
+        a new selection in the tree view is made. The objects are found by UUID, so
+        renamed or reparented objects are still found, and are all selected at once.
+        """
+        # Ignore the changes made to match the scene selection
+        if self.syncing_selection:
+            return
+        # Getting the UUIDs of the selected items
+        uuids = [self.tree_model.node_uuid(index)
+                 for index in self.tree_view.selectionModel().selectedIndexes()]
+        uuids = [uuid for uuid in uuids if uuid]
+        if not uuids:
+            # Removing all previous selections
+            cmds.select(clear=True)
+            return
+        # Selecting every object with one command, replacing the previous selection
+        cmds.select(cmds.ls(uuids, long=True), replace=True)
+
+    def scene_selection_changed(self):
+        """
+        This function highlights the rows of the objects selected in the scene, looking
+        them up by UUID in the tree model's index.
+        """
+        # The tree view is locked while a build runs
+        if self.syncing_selection or self.build_job or not self.tree_model.uuid_rows:
+            return
+        # Find the rows of the selected objects that are in the tree
+        selection = QtCore.QItemSelection()
+        for uuid in cmds.ls(selection=True, uuid=True) or []:
+            index = self.tree_model.index_from_uuid(uuid)
+            if index.isValid():
+                selection.select(index, index)
+        # Select the rows without selecting the objects again
+        self.syncing_selection = True
+        try:
+            self.tree_view.selectionModel().select(
+                selection, QtCore.QItemSelectionModel.ClearAndSelect)
+            if selection.indexes():
+                self.tree_view.scrollTo(selection.indexes()[0])
+        finally:
+            self.syncing_selection = False
+
+    def closeEvent(self, event):
+        """
+        Stops the running build and stops following the scene selection when the GUI is
+        closed. A build that can still be cancelled deletes what it made, and an update
+        that no longer can be is finished, so that its undo chunk is always closed.
+
+        :param event: The close event.
+        :type: QCloseEvent
+        """
+        if self.build_job:
+            # The GUI is closing, so it does not need to be shown again as not modal
+            self.setWindowModality(QtCore.Qt.NonModal)
+            self.build_job.cancel()
+            try:
+                for progress in self.build_steps:
+                    pass
+            finally:
+                self.finish_build()
+        if self.selection_job is not None:
+            cmds.scriptJob(kill=self.selection_job, force=True)
+            self.selection_job = None
+        QtWidgets.QDialog.closeEvent(self, event)
 
     @classmethod
     def warn_user(cls, title=None, msg=None):
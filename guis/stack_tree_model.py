@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+#SETMODE 777
+
+#----------------------------------------------------------------------------------------#
+#------------------------------------------------------------------------------ HEADER --#
+
+"""
+:author:
+    kpm200000
+
+:synopsis:
+    This module contains the item model that shows the stacks of a build in a tree view.
+
+:description:
+    This module contains a QAbstractItemModel over the result of a build, with the
+    stack groups as the top level items and the pieces of each stack nested under them.
+    The model is filled once after the build and makes no items up front. The view asks
+    for the stacks in batches as it scrolls, and for the pieces of a stack only when
+    that stack is expanded, so showing thousands of stacks costs about the same as
+    showing a few. The model also keeps an index between its rows and the UUIDs of
+    their nodes, so that rows and scene nodes can be matched up without looking up
+    names or scanning the rows.
+
+:applications:
+    Maya
+
+:see_also:
+    builder_gui
+"""
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- IMPORTS --#
+
+# Default Python Imports
+from PySide2 import QtCore
+
+# Imports That You Wrote
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- CONSTANTS --#
+
+# The number of stacks to add to the view each time it asks for more
+FETCH_BATCH_SIZE = 200
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- FUNCTIONS --#
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- CLASSES --#
+
+class StackItem(object):
+    """
+    A stack that has been added to the model.
+    """
+    def __init__(self, row=0, group=None, pieces=None, group_uuid=None,
+                 piece_uuids=None):
+        # The row of the stack in the model
+        self.row = row
+        # The name of the stack's group
+        self.group = group
+        # The names of the stack's pieces, from base to top
+        self.pieces = pieces
+        # The UUIDs of the group and pieces
+        self.group_uuid = group_uuid
+        self.piece_uuids = piece_uuids
+        # Whether the pieces have been added to the model
+        self.pieces_fetched = False
+
+class StackTreeModel(QtCore.QAbstractItemModel):
+    """
+    A lazily filled tree model of the stacks of a build, with one column holding the
+    names of the groups and their pieces.
+    """
+    def __init__(self, parent=None):
+        QtCore.QAbstractItemModel.__init__(self, parent)
+        # The group and pieces of every stack in the build
+        self.stack_groups = []
+        self.stack_pieces = []
+        # The UUIDs of the group and pieces of every stack
+        self.stack_uuids = []
+        # The (stack row, piece row) of every UUID, where the piece row is None for a
+        #   stack's group
+        self.uuid_rows = {}
+        # The stacks that have been added to the model so far
+        self.stack_items = []
+
+    def set_build_result(self, result=None, uuids=None):
+        """
+        Replaces the contents of the model with the stacks of a build. No items are
+        made until the view asks for them.
+
+        :param result: The build to show, or None to empty the model.
+        :type: BuildResult
+
+        :param uuids: The UUIDs of the build's nodes, from BuildResult.get_uuids. If not
+        given, the rows cannot be matched to scene nodes.
+        :type: list
+        """
+        self.beginResetModel()
+        self.stack_groups = list(result.stack_groups) if result else []
+        self.stack_pieces = list(result.stack_pieces) if result else []
+        self.stack_uuids = list(uuids or [])
+        # Index the rows by UUID
+        self.uuid_rows = {}
+        for stack_row, (group_uuid, piece_uuids) in enumerate(self.stack_uuids):
+            self.uuid_rows[group_uuid] = (stack_row, None)
+            for piece_row, piece_uuid in enumerate(piece_uuids):
+                self.uuid_rows[piece_uuid] = (stack_row, piece_row)
+        self.stack_items = []
+        self.endResetModel()
+
+    def node_uuid(self, index=None):
+        """
+        Returns the UUID of the group or piece at the given index.
+
+        :param index: The index of the item.
+        :type: QModelIndex
+
+        :return: The UUID of the node, or None if it is not known.
+        :type: str
+        """
+        if not index.isValid():
+            return None
+        stack_item = index.internalPointer()
+        # Pieces point at the stack they belong to, stacks point at nothing
+        if stack_item is None:
+            return self.stack_items[index.row()].group_uuid
+        if stack_item.piece_uuids is None:
+            return None
+        return stack_item.piece_uuids[index.row()]
+
+    def index_from_uuid(self, uuid=None):
+        """
+        Returns the index of the group or piece with the given UUID, adding its stack
+        and pieces to the model first if the view has not asked for them yet.
+
+        :param uuid: The UUID of the node.
+        :type: str
+
+        :return: The index of the node, which is not valid if the node is not in the
+        model.
+        :type: QModelIndex
+        """
+        rows = self.uuid_rows.get(uuid)
+        if rows is None:
+            return QtCore.QModelIndex()
+        stack_row, piece_row = rows
+        # Add the stacks up to this one
+        while len(self.stack_items) <= stack_row:
+            self.fetchMore(QtCore.QModelIndex())
+        stack_index = self.index(stack_row, 0)
+        if piece_row is None:
+            return stack_index
+        # Add the pieces of the stack
+        self.fetchMore(stack_index)
+        return self.index(piece_row, 0, stack_index)
+
+    def node_name(self, index=None):
+        """
+        Returns the name of the group or piece at the given index.
+
+        :param index: The index of the item.
+        :type: QModelIndex
+
+        :return: The name of the node, or None if the index is not valid.
+        :type: str
+        """
+        if not index.isValid():
+            return None
+        stack_item = index.internalPointer()
+        # Pieces point at the stack they belong to, stacks point at nothing
+        if stack_item is None:
+            return self.stack_items[index.row()].group
+        return stack_item.pieces[index.row()]
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column)
+        return self.createIndex(row, column, self.stack_items[parent.row()])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        stack_item = index.internalPointer()
+        if stack_item is None:
+            return QtCore.QModelIndex()
+        return self.createIndex(stack_item.row, 0)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        if not parent.isValid():
+            return len(self.stack_items)
+        # Only stacks have children, once their pieces have been fetched
+        if parent.internalPointer() is not None:
+            return 0
+        stack_item = self.stack_items[parent.row()]
+        return len(stack_item.pieces) if stack_item.pieces_fetched else 0
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        if not parent.isValid():
+            return bool(self.stack_groups)
+        # Show stacks as expandable before their pieces have been fetched
+        return parent.internalPointer() is None
+
+    def canFetchMore(self, parent):
+        if not parent.isValid():
+            return len(self.stack_items) < len(self.stack_groups)
+        if parent.internalPointer() is not None:
+            return False
+        return not self.stack_items[parent.row()].pieces_fetched
+
+    def fetchMore(self, parent):
+        if not parent.isValid():
+            # Add the next batch of stacks
+            start = len(self.stack_items)
+            end = min(start + FETCH_BATCH_SIZE, len(self.stack_groups))
+            if end <= start:
+                return
+            self.beginInsertRows(QtCore.QModelIndex(), start, end - 1)
+            for row in range(start, end):
+                group_uuid, piece_uuids = None, None
+                if row < len(self.stack_uuids):
+                    group_uuid, piece_uuids = self.stack_uuids[row]
+                self.stack_items.append(StackItem(row, self.stack_groups[row],
+                                                  self.stack_pieces[row], group_uuid,
+                                                  piece_uuids))
+            self.endInsertRows()
+            return
+        # Add the pieces of the stack being expanded
+        stack_item = self.stack_items[parent.row()]
+        if stack_item.pieces_fetched or parent.internalPointer() is not None:
+            return
+        if stack_item.pieces:
+            self.beginInsertRows(parent, 0, len(stack_item.pieces) - 1)
+            stack_item.pieces_fetched = True
+            self.endInsertRows()
+        else:
+            stack_item.pieces_fetched = True
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole:
+            return self.node_name(index)
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return 'Object Stacks'
+        return None
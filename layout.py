@@ -0,0 +1,484 @@
+#!/usr/bin/env python
+#SETMODE 777
+
+#----------------------------------------------------------------------------------------#
+#------------------------------------------------------------------------------ HEADER --#
+
+"""
+:author:
+    kpm200000
+
+:synopsis:
+    This module computes where stacked objects need to move, without using Maya.
+
+:description:
+    This module is the layout engine used by the stacker module. It takes bounding boxes,
+    each given as a list in the order [xmin, ymin, zmin, xmax, ymax, zmax], and returns
+    the translation that each object needs in order to be stacked or laid out in a row.
+    Stacks and rows are both layouts along an axis, so they share compute_axis_layout,
+    which lays objects out along any axis with their edges or centers lined up.
+    Nothing in this module touches the scene, so layouts can be planned, checked, and
+    timed outside of Maya and then applied to the scene in a single pass. With NumPy,
+    large grids and large batches of stacks are laid out with array operations instead
+    of one object at a time.
+
+:applications:
+    Maya
+
+:see_also:
+    stacker
+"""
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- IMPORTS --#
+
+# Default Python Imports
+try:
+    import numpy
+except ImportError:
+    # NumPy is optional, large layouts are computed one object at a time without it
+    numpy = None
+
+# Imports That You Wrote
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- CONSTANTS --#
+
+# The axes, in the order of their index in an (x, y, z) point
+AXES = ('x', 'y', 'z')
+
+# The ways objects can be lined up on the axes they are not laid out along
+ALIGNMENTS = ('center', 'min', 'max')
+
+# The fewest objects or stacks worth laying out with NumPy arrays; smaller layouts
+#   cost more to convert to and from arrays than to lay out in Python
+ARRAY_LAYOUT_MIN = 1000
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- FUNCTIONS --#
+
+def compute_axis_layout(bounding_boxes=None, axis='y', offset=0, align='center',
+                        origin=None):
+    """
+    This function computes the translation that places each object after the one before
+    it along the given axis, the given offset away from it, and aligns the objects with
+    the first object on the other two axes. Stacking is laying out along +y with no
+    offset and center alignment, and a row is laying out along +x with no alignment.
+    The first object does not move, unless an origin is given, in which case all of the
+    objects are also moved so that the starting face of their combined bounding box
+    sits at the origin, aligned the same way on the other two axes.
+
+    :param bounding_boxes: The bounding boxes of the objects to lay out, first object
+    first.
+    :type: list
+
+    :param axis: The axis to lay the objects out along, one of 'x', 'y', or 'z', with a
+    leading '-' to lay them out in the negative direction.
+    :type: str
+
+    :param offset: The distance/separation between neighbouring objects along the axis.
+    :type: float
+
+    :param align: How to line the objects up on the other two axes: 'center' lines up
+    their centers, 'min' and 'max' line up their lower or upper edges, and None leaves
+    them where they are.
+    :type: str
+
+    :param origin: The (x, y, z) point to place the starting face of all the objects at.
+    :type: list
+
+    :return: The (x, y, z) translation for each object, in the order given.
+    :type: list
+    """
+    if not bounding_boxes:
+        return []
+    index, direction = parse_axis(axis)
+    cross_indices = [cross_index for cross_index in range(3) if cross_index != index]
+    # The first object does not move, and its far face is where the next object goes
+    base_box = bounding_boxes[0]
+    far_face = base_box[index + 3] if direction > 0 else base_box[index]
+    translations = [(0.0, 0.0, 0.0)]
+    for bounding_box in bounding_boxes[1:]:
+        translation = [0.0, 0.0, 0.0]
+        # Place the object's near face the offset past the current far face
+        if direction > 0:
+            translation[index] = far_face + offset - bounding_box[index]
+            far_face = bounding_box[index + 3] + translation[index]
+        else:
+            translation[index] = far_face - offset - bounding_box[index + 3]
+            far_face = bounding_box[index] + translation[index]
+        # Line the object up with the first object on the other axes
+        if align:
+            for cross_index in cross_indices:
+                translation[cross_index] = (align_value(base_box, cross_index, align)
+                                            - align_value(bounding_box, cross_index,
+                                                          align))
+        translations.append(tuple(translation))
+    if origin is None:
+        return translations
+
+    # Move all of the objects so that their starting face is at the origin
+    layout_box = union_bounding_box([offset_bounding_box(bounding_box, translation)
+                                     for bounding_box, translation
+                                     in zip(bounding_boxes, translations)])
+    start_point = bounding_box_point(layout_box, axis, 'min' if direction > 0 else 'max',
+                                     align or 'center')
+    shift = [origin[point_index] - start_point[point_index] for point_index in range(3)]
+    return [(translation[0] + shift[0], translation[1] + shift[1],
+             translation[2] + shift[2]) for translation in translations]
+
+def compute_stack_layout(bounding_boxes=None, origin=None):
+    """
+    This function computes the translation that stacks each object on top of the one
+    before it, all centered around the top center point of the first object. The first
+    object does not move, unless an origin is given, in which case the whole stack is
+    also moved so that its bottom center point sits at the origin.
+
+    :param bounding_boxes: The bounding boxes of the objects to stack, base first.
+    :type: list
+
+    :param origin: The (x, y, z) point to place the bottom center of the stack at.
+    :type: list
+
+    :return: The (x, y, z) translation for each object, in the order given.
+    :type: list
+    """
+    return compute_axis_layout(bounding_boxes, 'y', 0, 'center', origin)
+
+def compute_row_layout(bounding_boxes=None, offset=0):
+    """
+    This function computes the translation along the x-axis that places each object the
+    given offset away from the object before it. The offset is the distance between the
+    edges of the two bounding boxes, and the first object does not move.
+
+    :param bounding_boxes: The bounding boxes of the objects to lay out, in row order.
+    :type: list
+
+    :param offset: The distance/separation between neighbouring objects.
+    :type: float
+
+    :return: The (x, y, z) translation for each object, in the order given.
+    :type: list
+    """
+    return compute_axis_layout(bounding_boxes, 'x', offset, None)
+
+def compute_grid_layout(bounding_boxes=None, offset=0, per_row=None, row_offset=None):
+    """
+    This function computes the translation that lays objects out in rows along the
+    x-axis, the same way as compute_row_layout, but starts a new row after every
+    per_row objects. Each new row starts level with the first object in x, and is moved
+    along the z-axis so that it is the row offset away from the row before it. The
+    objects of a row are centered in z on the row, and the first row is centered on the
+    first object, so objects that are already laid out can be laid out again. The first
+    object does not move. Large grids are laid out with compute_grid_layout_array when
+    NumPy is available.
+
+    :param bounding_boxes: The bounding boxes of the objects to lay out, in order.
+    :type: list
+
+    :param offset: The distance/separation between neighbouring objects in a row.
+    :type: float
+
+    :param per_row: The number of objects in each row. If not given, every object is
+    put in one row.
+    :type: int
+
+    :param row_offset: The distance/separation between neighbouring rows. If not given,
+    the offset is used.
+    :type: float
+
+    :return: The (x, y, z) translation for each object, in the order given.
+    :type: list
+    """
+    if not bounding_boxes:
+        return []
+    if numpy is not None and len(bounding_boxes) >= ARRAY_LAYOUT_MIN:
+        return array_to_points(compute_grid_layout_array(bounding_boxes, offset,
+                                                         per_row, row_offset))
+    if not per_row:
+        per_row = len(bounding_boxes)
+    if row_offset is None:
+        row_offset = offset
+    # Every row starts level with the first object in x, and the first row is centered
+    #   on the first object in z
+    row_xmin = bounding_boxes[0][0]
+    row_center_z = (bounding_boxes[0][2] + bounding_boxes[0][5]) / 2
+    translations = []
+    prev_half_depth = None
+    for row_start in range(0, len(bounding_boxes), per_row):
+        row_boxes = bounding_boxes[row_start:row_start + per_row]
+        # Move the row along z so that it is the row offset past the previous row
+        half_depth = max(box[5] - box[2] for box in row_boxes) / 2
+        if prev_half_depth is not None:
+            row_center_z += prev_half_depth + row_offset + half_depth
+        prev_half_depth = half_depth
+        # Lay the row out along x, starting level with the first object
+        x_start = row_xmin - row_boxes[0][0]
+        for bounding_box, translation in zip(row_boxes,
+                                             compute_row_layout(row_boxes, offset)):
+            # Center the object on the row in z
+            z_move_amt = row_center_z - (bounding_box[2] + bounding_box[5]) / 2
+            translations.append((translation[0] + x_start, 0.0, z_move_amt))
+    return translations
+
+def compute_stack_layouts_array(boxes=None, counts=None, origin=None):
+    """
+    This function computes the stack layout of N stacks of up to M objects with NumPy
+    array operations, the same layout as compute_stack_layout gives each stack. Each
+    object's y translation is the running sum of the heights below it, and its x and z
+    translations are the difference between its center and the base's center. It needs
+    NumPy; callers fall back to compute_stack_layout without it.
+
+    :param boxes: The bounding boxes as an (N, M, 6) array, base first in each stack.
+    :type: numpy.ndarray
+
+    :param counts: The number of objects in each stack. Boxes past the count are padding
+    and are given no translation. If not given, every stack has M objects.
+    :type: numpy.ndarray
+
+    :param origin: The (x, y, z) point to place the bottom center of every stack at. If
+    not given, the base of each stack does not move.
+    :type: list
+
+    :return: The (x, y, z) translation of every object as an (N, M, 3) array.
+    :type: numpy.ndarray
+    """
+    if numpy is None:
+        raise ImportError("NumPy is needed to compute array layouts.")
+    boxes = numpy.asarray(boxes, dtype=numpy.float64)
+    translations = numpy.zeros(boxes.shape[:2] + (3,))
+    # Centers in x and z and heights of every object
+    centers_x = (boxes[:, :, 0] + boxes[:, :, 3]) / 2
+    centers_z = (boxes[:, :, 2] + boxes[:, :, 5]) / 2
+    heights = boxes[:, 1:, 4] - boxes[:, 1:, 1]
+    # Each object rests on the base's top plus the heights of the objects below it
+    heights_below = numpy.cumsum(heights, axis=1) - heights
+    translations[:, 1:, 0] = centers_x[:, :1] - centers_x[:, 1:]
+    translations[:, 1:, 1] = boxes[:, :1, 4] + heights_below - boxes[:, 1:, 1]
+    translations[:, 1:, 2] = centers_z[:, :1] - centers_z[:, 1:]
+    # Every object is centered on its base, so the bottom center of the stack is the
+    #   bottom center of the base
+    if origin is not None:
+        translations[:, :, 0] += origin[0] - centers_x[:, :1]
+        translations[:, :, 1] += origin[1] - boxes[:, :1, 1]
+        translations[:, :, 2] += origin[2] - centers_z[:, :1]
+    # Padding past the end of each stack does not move
+    if counts is not None:
+        mask = numpy.arange(boxes.shape[1]) < numpy.asarray(counts)[:, None]
+        translations[~mask] = 0.0
+    return translations
+
+def compute_grid_layout_array(boxes=None, offset=0, per_row=None, row_offset=None):
+    """
+    This function computes the same layout as compute_grid_layout for N objects with
+    NumPy array operations. The x translations are a running sum of the widths along
+    each row, and the row centers are a running sum of the depths of the rows. It needs
+    NumPy; callers fall back to compute_grid_layout without it.
+
+    :param boxes: The bounding boxes as an (N, 6) array, in order.
+    :type: numpy.ndarray
+
+    :param offset: The distance/separation between neighbouring objects in a row.
+    :type: float
+
+    :param per_row: The number of objects in each row. If not given, every object is
+    put in one row.
+    :type: int
+
+    :param row_offset: The distance/separation between neighbouring rows. If not given,
+    the offset is used.
+    :type: float
+
+    :return: The (x, y, z) translation of every object as an (N, 3) array.
+    :type: numpy.ndarray
+    """
+    if numpy is None:
+        raise ImportError("NumPy is needed to compute array layouts.")
+    boxes = numpy.asarray(boxes, dtype=numpy.float64)
+    translations = numpy.zeros((len(boxes), 3))
+    if not len(boxes):
+        return translations
+    if not per_row:
+        per_row = len(boxes)
+    if row_offset is None:
+        row_offset = offset
+    row_starts = numpy.arange(0, len(boxes), per_row)
+    # Each object starts after the first object of its row, the widths of the objects
+    #   between them, and one offset per gap; every row starts level with the first
+    #   object in x
+    spans = boxes[:, 3] - boxes[:, 0] + offset
+    spans_before = numpy.cumsum(spans) - spans
+    spans_before -= numpy.repeat(spans_before[row_starts], per_row)[:len(boxes)]
+    translations[:, 0] = boxes[0, 0] + spans_before - boxes[:, 0]
+    # Each row is the row offset past the previous row, and the first row is centered
+    #   on the first object in z
+    half_depths = numpy.maximum.reduceat(boxes[:, 5] - boxes[:, 2], row_starts) / 2
+    row_steps = numpy.zeros(len(row_starts))
+    row_steps[1:] = half_depths[:-1] + row_offset + half_depths[1:]
+    row_centers = (boxes[0, 2] + boxes[0, 5]) / 2 + numpy.cumsum(row_steps)
+    translations[:, 2] = (numpy.repeat(row_centers, per_row)[:len(boxes)]
+                          - (boxes[:, 2] + boxes[:, 5]) / 2)
+    return translations
+
+def array_to_points(point_array=None):
+    """
+    This function turns an (N, 3) array of points back into a list of (x, y, z) tuples,
+    the way the other layouts return them.
+
+    :param point_array: The points.
+    :type: numpy.ndarray
+
+    :return: The (x, y, z) of every point.
+    :type: list
+    """
+    # Converting one column at a time is much faster than one row at a time
+    return list(zip(*numpy.asarray(point_array).T.tolist()))
+
+def parse_axis(axis='y'):
+    """
+    This function reads an axis name such as 'y' or '-x'.
+
+    :param axis: The axis, one of 'x', 'y', or 'z', with a leading '-' for the negative
+    direction.
+    :type: str
+
+    :return: The index of the axis in an (x, y, z) point, and 1 or -1 for its direction.
+    :type: tuple
+    """
+    name = axis.lower()
+    direction = -1 if name.startswith('-') else 1
+    name = name.lstrip('+-')
+    if name not in AXES:
+        raise ValueError(f"The axis must be one of x, y, or z, not {axis!r}.")
+    return AXES.index(name), direction
+
+def align_value(bounding_box=None, index=0, align='center'):
+    """
+    This function returns the coordinate of a bounding box on one axis that is lined up
+    when aligning objects.
+
+    :param bounding_box: The bounding box in the order [xmin, ymin, zmin, xmax, ymax,
+    zmax].
+    :type: list
+
+    :param index: The index of the axis in an (x, y, z) point.
+    :type: int
+
+    :param align: 'center' for the center of the box, or 'min' or 'max' for its lower or
+    upper edge.
+    :type: str
+
+    :return: The coordinate on the axis.
+    :type: float
+    """
+    if align == 'center':
+        return (bounding_box[index] + bounding_box[index + 3]) / 2
+    if align == 'min':
+        return bounding_box[index]
+    if align == 'max':
+        return bounding_box[index + 3]
+    raise ValueError(f"The alignment must be one of {ALIGNMENTS}, not {align!r}.")
+
+def bounding_box_point(bounding_box=None, axis='y', side='max', align='center'):
+    """
+    This function returns a point on one face of a bounding box, such as its top center
+    point, which is the 'max' side along 'y' with 'center' alignment.
+
+    :param bounding_box: The bounding box in the order [xmin, ymin, zmin, xmax, ymax,
+    zmax].
+    :type: list
+
+    :param axis: The axis the face is on, one of 'x', 'y', or 'z'. Its direction is not
+    used.
+    :type: str
+
+    :param side: 'min' or 'max' for the lower or upper face along the axis.
+    :type: str
+
+    :param align: Where the point is on the other two axes: 'center', 'min', or 'max'.
+    :type: str
+
+    :return: The (x, y, z) point.
+    :type: list
+    """
+    index = parse_axis(axis)[0]
+    point = [align_value(bounding_box, point_index, align) for point_index in range(3)]
+    point[index] = align_value(bounding_box, index, side)
+    return point
+
+def compute_point_extents(points=None, linear=None):
+    """
+    This function computes the bounding box around a mesh's vertices after rotating and
+    scaling them, which fits a rotated mesh much more tightly than rotating its bounding
+    box does. With NumPy, the vertices are transformed and measured as one array.
+
+    :param points: The object space vertices, as a flat list of x, y, z values or a list
+    of (x, y, z) points.
+    :type: list
+
+    :param linear: The rotation and scale to apply, as the nine values of the top left
+    3x3 of a Maya matrix in row order, which multiplies row vector points. If not given,
+    the points are measured as they are.
+    :type: list
+
+    :return: The bounding box in the order [xmin, ymin, zmin, xmax, ymax, zmax], around
+    the points' origin.
+    :type: list
+    """
+    if numpy is not None:
+        point_array = numpy.asarray(points, dtype=numpy.float64).reshape(-1, 3)
+        if linear is not None:
+            point_array = point_array @ numpy.asarray(linear,
+                                                      dtype=numpy.float64).reshape(3, 3)
+        return point_array.min(axis=0).tolist() + point_array.max(axis=0).tolist()
+
+    # Fall back to pure Python, one point at a time
+    flat_points = list(points)
+    if flat_points and not isinstance(flat_points[0], (int, float)):
+        flat_points = [value for point in flat_points for value in point]
+    bounding_box = [float('inf')] * 3 + [float('-inf')] * 3
+    for start in range(0, len(flat_points), 3):
+        point = flat_points[start:start + 3]
+        if linear is not None:
+            point = [point[0] * linear[column] + point[1] * linear[column + 3]
+                     + point[2] * linear[column + 6] for column in range(3)]
+        for index in range(3):
+            bounding_box[index] = min(bounding_box[index], point[index])
+            bounding_box[index + 3] = max(bounding_box[index + 3], point[index])
+    return bounding_box
+
+def offset_bounding_box(bounding_box=None, translation=None):
+    """
+    This function returns the bounding box moved by the given translation.
+
+    :param bounding_box: The bounding box in the order [xmin, ymin, zmin, xmax, ymax,
+    zmax].
+    :type: list
+
+    :param translation: The (x, y, z) amount to move the bounding box.
+    :type: list
+
+    :return: The moved bounding box.
+    :type: list
+    """
+    return [bounding_box[0] + translation[0], bounding_box[1] + translation[1],
+            bounding_box[2] + translation[2], bounding_box[3] + translation[0],
+            bounding_box[4] + translation[1], bounding_box[5] + translation[2]]
+
+def union_bounding_box(bounding_boxes=None):
+    """
+    This function returns the bounding box that holds all of the given bounding boxes.
+
+    :param bounding_boxes: The bounding boxes, each in the order [xmin, ymin, zmin,
+    xmax, ymax, zmax].
+    :type: list
+
+    :return: The bounding box around all of them.
+    :type: list
+    """
+    return [min(bounding_box[0] for bounding_box in bounding_boxes),
+            min(bounding_box[1] for bounding_box in bounding_boxes),
+            min(bounding_box[2] for bounding_box in bounding_boxes),
+            max(bounding_box[3] for bounding_box in bounding_boxes),
+            max(bounding_box[4] for bounding_box in bounding_boxes),
+            max(bounding_box[5] for bounding_box in bounding_boxes)]
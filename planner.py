@@ -0,0 +1,866 @@
+#!/usr/bin/env python
+#SETMODE 777
+
+#----------------------------------------------------------------------------------------#
+#------------------------------------------------------------------------------ HEADER --#
+
+"""
+:author:
+    kpm200000
+
+:synopsis:
+    This module plans which objects make up each stack, without using Maya.
+
+:description:
+    This module randomly chooses the base, middle, and top objects of every stack from a
+    seed, and records the choices in a stack plan that can be saved to and loaded from
+    JSON. The random choices for each stack come from their own generator seeded by the
+    build's seed and the stack's number, so the same seed and inputs always give the
+    same plan. Plans are kept in a plan cache keyed by their seed and inputs, so that
+    running the same build again reuses the plan instead of planning it again.
+
+    Stacks can also be planned to a target height instead of a number of middle
+    pieces. The middle pieces are indexed by their measured height in a piece catalog,
+    so each piece that fits the height left in a stack is found with a binary search,
+    and the catalog backtracks when the pieces chosen so far leave a height that no mix
+    of pieces can fill.
+
+    Because every stack can be planned on its own, very large builds can be planned in
+    a pool of processes. Each process plans its own slice of the stacks, and lays them
+    out from the bounding boxes of the sources, and the slices are put back together in
+    order, so the plan is the same as one planned in a single process.
+
+:applications:
+    Maya
+
+:see_also:
+    builder
+"""
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- IMPORTS --#
+
+# Default Python Imports
+import bisect
+import concurrent.futures
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+try:
+    import numpy
+except ImportError:
+    # NumPy is optional, stacks are laid out one at a time without it
+    numpy = None
+
+# Imports That You Wrote
+from td_maya_tools.layout import compute_stack_layout
+from td_maya_tools.layout import compute_stack_layouts_array
+from td_maya_tools.layout import array_to_points
+from td_maya_tools.layout import ARRAY_LAYOUT_MIN
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- CONSTANTS --#
+
+# The fewest stacks worth sending to another process; smaller slices cost more to send
+#   than to plan
+MIN_SHARD_SIZE = 20000
+
+# The most middle pieces to put in a stack that is planned to a target height, which
+#   stops pieces with no height from filling a stack forever
+MAX_FILL_PIECES = 1000
+
+# How far past the tolerance a stack's height may add up to, from rounding
+HEIGHT_EPSILON = 1e-6
+
+# The most pieces a stack's search for a mix of middle pieces may try before the stack
+#   reuses the mix found when its height was checked
+FILL_SEARCH_BUDGET = 200
+
+# The most pieces the search that checks whether a height can be filled at all may try
+FILL_CHECK_BUDGET = 20000
+
+# The number of decimal places of the height left in a stack that are used to remember
+#   the heights no mix of pieces can fill
+FILL_KEY_DIGITS = 9
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- FUNCTIONS --#
+
+def plan_stacks(bases=None, middles=None, tops=None, count=1, max_height=1, seed=None,
+                plan_cache=None, processes=None, target_height=None, tolerance=0,
+                heights=None):
+    """
+    This function randomly chooses a base, a number of middle objects, and a top for
+    every stack. If a target height is given, each stack gets as many middle objects as
+    it takes to reach that height instead of a random number of them. If a plan cache is
+    given and already has a plan for the same seed and inputs, that plan is returned
+    instead. The stacks can be planned in a pool of processes, which gives the same plan
+    as planning them in this process.
+
+    :param bases: The objects to choose the base of each stack from.
+    :type: list
+
+    :param middles: The objects to choose the middle pieces of each stack from.
+    :type: list
+
+    :param tops: The objects to choose the top of each stack from.
+    :type: list
+
+    :param count: The number of stacks to plan.
+    :type: int
+
+    :param max_height: The maximum number of middle pieces in a stack.
+    :type: int
+
+    :param seed: The seed for the random choices. If not given, a seed is chosen and
+    recorded in the plan.
+    :type: int
+
+    :param plan_cache: The cache to look the plan up in and to store it in.
+    :type: PlanCache
+
+    :param processes: The most processes to plan in. If not given, or if there are too
+    few stacks to be worth splitting, the stacks are planned in this process.
+    :type: int
+
+    :param target_height: The height to build each stack to. If not given, the number
+    of middle pieces is chosen at random up to max_height.
+    :type: float
+
+    :param tolerance: How far above or below the target height a stack may be.
+    :type: float
+
+    :param heights: The height of each source object, keyed by name. Needed when a
+    target height is given.
+    :type: dict
+
+    :return: The plan of every stack.
+    :type: StackPlan
+    """
+    # Choose a seed so that the plan can be reproduced
+    if seed is None:
+        seed = random.randrange(2 ** 31)
+    plan = StackPlan(bases, middles, tops, count, max_height, seed, target_height,
+                     tolerance, heights)
+    # Reuse the cached plan for the same seed and inputs
+    if plan_cache is not None:
+        cached_plan = plan_cache.get(plan.key)
+        if cached_plan is not None:
+            return cached_plan
+
+    # Plan every stack from its own random generator, one slice of stacks per process
+    for stacks in map_shards(plan_stack_range, count, processes,
+                             (bases, middles, tops, max_height, seed, target_height,
+                              tolerance, plan.heights)):
+        plan.stacks.extend(stacks)
+    if plan_cache is not None:
+        plan_cache.put(plan)
+    return plan
+
+def plan_stack(bases=None, middles=None, tops=None, max_height=1, rng=None):
+    """
+    This function randomly chooses the objects of a single stack.
+
+    :param bases: The objects to choose the base of the stack from.
+    :type: list
+
+    :param middles: The objects to choose the middle pieces of the stack from.
+    :type: list
+
+    :param tops: The objects to choose the top of the stack from.
+    :type: list
+
+    :param max_height: The maximum number of middle pieces in the stack.
+    :type: int
+
+    :param rng: The random generator to choose with.
+    :type: random.Random
+
+    :return: The objects of the stack, from base to top.
+    :type: list
+    """
+    # Randomly choose a base and a number of middle objects
+    stack = [rng.choice(bases)]
+    num_middle_objs = rng.randint(1, max_height)
+    for mid_num in range(num_middle_objs):
+        stack.append(rng.choice(middles))
+    # Randomly choose a top to finish the stack
+    stack.append(rng.choice(tops))
+    return stack
+
+def plan_stack_to_height(bases=None, tops=None, catalog=None, heights=None,
+                         target_height=0, tolerance=0, rng=None):
+    """
+    This function randomly chooses the objects of a single stack so that it comes as
+    close as it can to a target height. The catalog searches for a random mix of middle
+    pieces that fills the height between the base and the top to within the tolerance.
+    If it finds none, the stack is filled as close to the target as the pieces allow.
+
+    :param bases: The objects to choose the base of the stack from.
+    :type: list
+
+    :param tops: The objects to choose the top of the stack from.
+    :type: list
+
+    :param catalog: The middle pieces to choose from, indexed by height.
+    :type: PieceCatalog
+
+    :param heights: The height of each source object, keyed by name.
+    :type: dict
+
+    :param target_height: The height to build the stack to.
+    :type: float
+
+    :param tolerance: How far above or below the target height the stack may be.
+    :type: float
+
+    :param rng: The random generator to choose with.
+    :type: random.Random
+
+    :return: The objects of the stack, from base to top.
+    :type: list
+    """
+    # Randomly choose a base and a top, and fill the height left between them
+    stack = [rng.choice(bases)]
+    top = rng.choice(tops)
+    height_left = target_height - heights[stack[0]] - heights[top]
+    middles = catalog.fill(height_left, tolerance, rng)
+    if middles is None:
+        middles = catalog.fill_closest(height_left, tolerance, rng)
+    stack.extend(middles)
+    stack.append(top)
+    return stack
+
+def plan_stack_range(bases=None, middles=None, tops=None, max_height=1, seed=None,
+                     target_height=None, tolerance=0, heights=None, start=0, stop=0):
+    """
+    This function plans a slice of the stacks of a build. It is run in the processes
+    that plan a build.
+
+    :param bases: The objects to choose the base of each stack from.
+    :type: list
+
+    :param middles: The objects to choose the middle pieces of each stack from.
+    :type: list
+
+    :param tops: The objects to choose the top of each stack from.
+    :type: list
+
+    :param max_height: The maximum number of middle pieces in a stack.
+    :type: int
+
+    :param seed: The seed of the build.
+    :type: int
+
+    :param target_height: The height to build each stack to, if any.
+    :type: float
+
+    :param tolerance: How far above or below the target height a stack may be.
+    :type: float
+
+    :param heights: The height of each source object, keyed by name.
+    :type: dict
+
+    :param start: The number of the first stack to plan.
+    :type: int
+
+    :param stop: The number after the last stack to plan.
+    :type: int
+
+    :return: The objects of each stack in the slice, from base to top.
+    :type: list
+    """
+    if target_height is None:
+        return [plan_stack(bases, middles, tops, max_height, stack_rng(seed, num))
+                for num in range(start, stop)]
+    # Index the middle pieces by height once for the whole slice
+    catalog = PieceCatalog({middle: heights[middle] for middle in middles})
+    return [plan_stack_to_height(bases, tops, catalog, heights, target_height, tolerance,
+                                 stack_rng(seed, num))
+            for num in range(start, stop)]
+
+def layout_stacks(stacks=None, source_boxes=None, origin=None, processes=None):
+    """
+    This function computes the stack layout of every planned stack from the bounding
+    boxes of its sources, such as those from stacker.get_local_bounding_boxes. The
+    stacks can be laid out in a pool of processes, which gives the same layout as
+    laying them out in this process.
+
+    :param stacks: The objects of each stack, from base to top.
+    :type: list
+
+    :param source_boxes: The bounding box of each source object, keyed by name.
+    :type: dict
+
+    :param origin: The point to put the bottom center of each stack at.
+    :type: list
+
+    :param processes: The most processes to lay out in. If not given, or if there are
+    too few stacks to be worth splitting, the stacks are laid out in this process.
+    :type: int
+
+    :return: The (x, y, z) translation of each object of each stack.
+    :type: list
+    """
+    translations = []
+    # Send each process only its own slice of the stacks
+    for shard_translations in map_shards(layout_stack_range, len(stacks), processes,
+                                         (source_boxes, origin), stacks):
+        translations.extend(shard_translations)
+    return translations
+
+def layout_stack_range(source_boxes=None, origin=None, stacks=None):
+    """
+    This function lays out a slice of the stacks of a build. It is run in the processes
+    that lay out a build. Large slices are laid out together as one (N, M, 6) array of
+    bounding boxes when NumPy is available.
+
+    :param source_boxes: The bounding box of each source object, keyed by name.
+    :type: dict
+
+    :param origin: The point to put the bottom center of each stack at.
+    :type: list
+
+    :param stacks: The objects of each stack in the slice, from base to top.
+    :type: list
+
+    :return: The (x, y, z) translation of each object of each stack.
+    :type: list
+    """
+    if numpy is None or len(stacks) < ARRAY_LAYOUT_MIN:
+        return [compute_stack_layout([source_boxes[source] for source in stack], origin)
+                for stack in stacks]
+
+    # Look up every piece's box by the index of its source, padding short stacks with
+    #   an empty box past the last source
+    sources = list(source_boxes)
+    source_indices = {source: index for index, source in enumerate(sources)}
+    box_table = numpy.array([source_boxes[source] for source in sources] + [[0.0] * 6],
+                            dtype=numpy.float64)
+    counts = numpy.fromiter(map(len, stacks), dtype=numpy.intp, count=len(stacks))
+    in_stack = numpy.arange(counts.max()) < counts[:, None]
+    box_indices = numpy.full(in_stack.shape, len(sources), dtype=numpy.intp)
+    box_indices[in_stack] = numpy.fromiter(
+        (source_indices[source] for stack in stacks for source in stack),
+        dtype=numpy.intp, count=int(counts.sum()))
+    translations = compute_stack_layouts_array(box_table[box_indices], counts, origin)
+
+    # Split the translations of the real pieces back into stacks
+    points = array_to_points(translations[in_stack])
+    stack_translations = []
+    start = 0
+    for count in counts.tolist():
+        stack_translations.append(points[start:start + count])
+        start += count
+    return stack_translations
+
+def map_shards(function=None, count=0, processes=None, args=(), items=None):
+    """
+    This function splits the numbers from zero to count into slices and runs the
+    function on each slice, in a pool of processes if there are enough to be worth it.
+    The function is given the arguments followed by the start and stop of its slice, or,
+    if a list of items is given, the arguments followed by its slice of the items. The
+    results are returned in the order of the slices.
+
+    :param function: The function to run on each slice. It must be defined at the top
+    level of a module, so that the other processes can import it.
+    :type: function
+
+    :param count: The number of things to split.
+    :type: int
+
+    :param processes: The most processes to use.
+    :type: int
+
+    :param args: The arguments to give the function before its slice.
+    :type: tuple
+
+    :param items: The things to split, if the function is given them instead of the
+    start and stop of its slice.
+    :type: list
+
+    :return: The result of the function for each slice, in order.
+    :type: list
+    """
+    # Only use as many processes as there are slices worth sending
+    processes = min(processes or 1, count // MIN_SHARD_SIZE)
+    if processes <= 1:
+        slices = [(0, count)]
+    else:
+        bounds = [count * shard // processes for shard in range(processes + 1)]
+        slices = list(zip(bounds[:-1], bounds[1:]))
+    shard_args = [args + ((items[start:stop],) if items is not None else (start, stop))
+                  for start, stop in slices]
+    if len(slices) == 1:
+        return [function(*shard_args[0])]
+
+    # Spawn fresh processes, which is the only start method that works inside Maya
+    context = multiprocessing.get_context('spawn')
+    # Inside Maya the executable is Maya itself, so start the processes with mayapy
+    executable = get_python_executable()
+    if executable != sys.executable:
+        context.set_executable(executable)
+    with concurrent.futures.ProcessPoolExecutor(len(slices),
+                                                mp_context=context) as executor:
+        futures = [executor.submit(function, *arguments) for arguments in shard_args]
+        return [future.result() for future in futures]
+
+def get_python_executable():
+    """
+    This function returns the Python interpreter to start other processes with. Inside
+    an interactive Maya session this is the mayapy next to the Maya executable.
+
+    :return: The path of the Python interpreter.
+    :type: str
+    """
+    folder, name = os.path.split(sys.executable)
+    base_name, extension = os.path.splitext(name)
+    if base_name.lower() == 'maya':
+        mayapy = os.path.join(folder, 'mayapy' + extension)
+        if os.path.isfile(mayapy):
+            return mayapy
+    return sys.executable
+
+def stack_rng(seed=None, num=0):
+    """
+    This function returns the random generator for one stack of a build. It depends
+    only on the build's seed and the stack's number, so every stack can be planned on
+    its own.
+
+    :param seed: The seed of the build.
+    :type: int
+
+    :param num: The number of the stack in the build, starting at zero.
+    :type: int
+
+    :return: The random generator for the stack.
+    :type: random.Random
+    """
+    # String seeds are hashed the same way in every Python process
+    return random.Random(f"{seed}:{num}")
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- CLASSES --#
+
+class StackPlan(object):
+    """
+    The objects chosen for every stack of a build, along with the seed and inputs that
+    were used to choose them.
+    """
+    def __init__(self, bases=None, middles=None, tops=None, count=1, max_height=1,
+                 seed=None, target_height=None, tolerance=0, heights=None):
+        # The inputs to the plan
+        self.bases = list(bases or [])
+        self.middles = list(middles or [])
+        self.tops = list(tops or [])
+        self.count = count
+        self.max_height = max_height
+        self.seed = seed
+        # The height to build each stack to, and the heights of the sources it used
+        self.target_height = target_height
+        self.tolerance = tolerance
+        self.heights = None
+        if target_height is not None:
+            sources = set(self.bases + self.middles + self.tops)
+            self.heights = {source: heights[source] for source in sorted(sources)}
+        # The objects of each stack, from base to top
+        self.stacks = []
+
+    @property
+    def key(self):
+        """
+        A key that is the same for any two plans with the same seed and inputs.
+
+        :return: The key of the plan.
+        :type: str
+        """
+        inputs = [self.bases, self.middles, self.tops, self.count, self.max_height,
+                  self.seed]
+        # Plans to a target height also depend on the heights of their sources
+        if self.target_height is not None:
+            inputs += [self.target_height, self.tolerance, self.heights]
+        return hashlib.sha1(json.dumps(inputs).encode('utf-8')).hexdigest()
+
+    def count_missed(self):
+        """
+        Counts the stacks whose height is not within the tolerance of the target
+        height, because no mix of the middle pieces could fill them.
+
+        :return: The number of stacks that missed the target height, which is zero if
+        the plan has none.
+        :type: int
+        """
+        if self.target_height is None:
+            return 0
+        missed_count = 0
+        for stack in self.stacks:
+            height = sum(self.heights[source] for source in stack)
+            if abs(height - self.target_height) > self.tolerance + HEIGHT_EPSILON:
+                missed_count += 1
+        return missed_count
+
+    def to_dict(self):
+        """
+        Returns the plan as a dictionary that can be written out as JSON.
+
+        :return: The inputs and stacks of the plan.
+        :type: dict
+        """
+        return {'bases': self.bases, 'middles': self.middles, 'tops': self.tops,
+                'count': self.count, 'max_height': self.max_height, 'seed': self.seed,
+                'target_height': self.target_height, 'tolerance': self.tolerance,
+                'heights': self.heights, 'stacks': self.stacks}
+
+    @classmethod
+    def from_dict(cls, plan_dict=None):
+        """
+        Creates a plan from a dictionary made by to_dict.
+
+        :param plan_dict: The inputs and stacks of the plan.
+        :type: dict
+
+        :return: The plan.
+        :type: StackPlan
+        """
+        # Plans saved before target heights were added have none
+        plan = cls(plan_dict['bases'], plan_dict['middles'], plan_dict['tops'],
+                   plan_dict['count'], plan_dict['max_height'], plan_dict['seed'],
+                   plan_dict.get('target_height'), plan_dict.get('tolerance', 0),
+                   plan_dict.get('heights'))
+        plan.stacks = [list(stack) for stack in plan_dict['stacks']]
+        return plan
+
+    def save(self, file_path=None):
+        """
+        Writes the plan to a JSON file.
+
+        :param file_path: The location of the JSON file on disk.
+        :type: str
+        """
+        with open(file_path, 'w') as plan_fh:
+            json.dump(self.to_dict(), plan_fh)
+
+    @classmethod
+    def load(cls, file_path=None):
+        """
+        Reads a plan from a JSON file written by save.
+
+        :param file_path: The location of the JSON file on disk.
+        :type: str
+
+        :return: The plan.
+        :type: StackPlan
+        """
+        with open(file_path, 'r') as plan_fh:
+            return cls.from_dict(json.load(plan_fh))
+
+class PlanCache(object):
+    """
+    A cache of stack plans keyed by their seed and inputs. Plans are kept in memory and,
+    if a directory is given, also saved as JSON files so that they can be reused by
+    later sessions.
+    """
+    def __init__(self, directory=None):
+        # The directory to save plans in
+        self.directory = directory
+        # The plans in memory, keyed by plan key
+        self.plans = {}
+
+    def get(self, key=None):
+        """
+        Returns the plan with the given key, or None if it is not cached.
+
+        :param key: The key of the plan.
+        :type: str
+
+        :return: The cached plan.
+        :type: StackPlan
+        """
+        if key in self.plans:
+            return self.plans[key]
+        # Look for a plan saved by an earlier session
+        if self.directory:
+            file_path = os.path.join(self.directory, key + '.json')
+            if os.path.isfile(file_path):
+                self.plans[key] = StackPlan.load(file_path)
+                return self.plans[key]
+        return None
+
+    def put(self, plan=None):
+        """
+        Stores the plan in the cache.
+
+        :param plan: The plan to store.
+        :type: StackPlan
+        """
+        self.plans[plan.key] = plan
+        if self.directory:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            plan.save(os.path.join(self.directory, plan.key + '.json'))
+
+class PieceCatalog(object):
+    """
+    The middle pieces of a build indexed by their height. The heights are kept sorted,
+    so the pieces within a range of heights are found with a binary search.
+
+    A height is filled with a depth first search that tries the pieces in a random
+    order and backtracks from the heights left that no mix of pieces can fill. The
+    first time a height is filled, a search with a fixed seed checks whether it can be
+    filled at all, and the mix it finds is kept for every stack with the same height to
+    fill, so stacks that cannot be filled are not searched each time. If the check took
+    longer than a stack's search may, or a stack's own search finds nothing, the stack
+    uses the kept mix in a random order. The check only depends on the height, so the
+    plan is the same whichever stacks a process planned before. Each stack's search
+    draws from a generator seeded once from the stack's, so the stack's other choices
+    do not depend on how far its search went.
+    """
+    def __init__(self, heights=None):
+        # The height of each piece, keyed by name
+        self.piece_heights = dict(heights)
+        # The pieces sorted by height, with ties in name order so picks are repeatable
+        entries = sorted((height, piece) for piece, height in heights.items())
+        self.heights = [height for height, piece in entries]
+        self.pieces = [piece for height, piece in entries]
+        # Every height that pieces have, each with the (start, stop) of its pieces
+        self.distinct_heights = []
+        self.height_ranges = []
+        for index, height in enumerate(self.heights):
+            if not self.distinct_heights or height != self.distinct_heights[-1]:
+                self.distinct_heights.append(height)
+                self.height_ranges.append([index, index])
+            self.height_ranges[-1][1] = index + 1
+        # The mix of pieces found for each height checked, or None if it cannot be
+        #   filled, and whether a stack's own search is likely to find one, keyed by
+        #   height and tolerance
+        self.checked_fills = {}
+
+    @property
+    def shortest(self):
+        """
+        The height of the shortest piece that has a height, which is the least a piece
+        can add to a stack. Pieces no taller than HEIGHT_EPSILON, such as planes, are
+        left out.
+
+        :return: The shortest height, or 0 if no piece has a height.
+        :type: float
+        """
+        index = bisect.bisect_right(self.heights, HEIGHT_EPSILON)
+        if index == len(self.heights):
+            return 0.0
+        return self.heights[index]
+
+    def pick(self, low=None, high=None, rng=None):
+        """
+        Randomly picks a piece whose height is within a range.
+
+        :param low: The lowest height to pick.
+        :type: float
+
+        :param high: The highest height to pick.
+        :type: float
+
+        :param rng: The random generator to pick with.
+        :type: random.Random
+
+        :return: The picked piece, or None if no piece is within the range.
+        :type: str
+        """
+        # Widen the range by the rounding error a sum of heights can have
+        start = bisect.bisect_left(self.heights, low - HEIGHT_EPSILON)
+        stop = bisect.bisect_right(self.heights, high + HEIGHT_EPSILON)
+        if start >= stop:
+            return None
+        return self.pieces[rng.randrange(start, stop)]
+
+    def fill(self, height=0, tolerance=0, rng=None):
+        """
+        Randomly picks middle pieces whose heights add up to within the tolerance of a
+        height, if the height can be filled.
+
+        :param height: The height to fill.
+        :type: float
+
+        :param tolerance: How far above or below the height the pieces may add up to.
+        :type: float
+
+        :param rng: The random generator of the stack, which is drawn from once.
+        :type: random.Random
+
+        :return: The picked pieces, or None if no mix of pieces was found.
+        :type: list
+        """
+        search_rng = random.Random(rng.random())
+        # Check whether the height can be filled once for every stack
+        key = (round(height, FILL_KEY_DIGITS), tolerance)
+        if key not in self.checked_fills:
+            # Try with a stack's budget first, to learn whether stacks should search
+            checked = self.search(height, tolerance, random.Random(0),
+                                  FILL_SEARCH_BUDGET)
+            searchable = checked is not None
+            if not searchable:
+                checked = self.search(height, tolerance, random.Random(0),
+                                      FILL_CHECK_BUDGET)
+            self.checked_fills[key] = (checked, searchable)
+        checked, searchable = self.checked_fills[key]
+        if checked is None:
+            return None
+        picked = None
+        if searchable:
+            picked = self.search(height, tolerance, search_rng, FILL_SEARCH_BUDGET)
+        if picked is None:
+            # The mixes that fit are too few to find quickly, so reuse the checked one
+            picked = list(checked)
+            search_rng.shuffle(picked)
+        return picked
+
+    def search(self, height=0, tolerance=0, rng=None, budget=0):
+        """
+        Searches for a random mix of middle pieces whose heights add up to within the
+        tolerance of a height. Pieces that close the height left are tried first;
+        otherwise each height of piece that leaves room for another piece is tried in a
+        random order, and the search backs up from the heights left that it has found
+        cannot be filled.
+
+        :param height: The height to fill.
+        :type: float
+
+        :param tolerance: How far above or below the height the pieces may add up to.
+        :type: float
+
+        :param rng: The random generator to search with.
+        :type: random.Random
+
+        :param budget: The most pieces to try.
+        :type: int
+
+        :return: The picked pieces, or None if no mix of pieces was found.
+        :type: list
+        """
+        # The heights left that cannot be filled, the picked pieces, and for the height
+        #   left before each piece and after the last one, the heights still to try
+        failed = set()
+        picked = []
+        branches = []
+        height_left = height
+        for attempt in range(budget):
+            # Finish with a piece that closes the height left, if there is one
+            middle = self.pick(height_left - tolerance, height_left + tolerance, rng)
+            if middle is not None:
+                picked.append(middle)
+                return picked
+            if len(picked) >= MAX_FILL_PIECES:
+                return None
+            branches.append((height_left, self.fill_options(height_left, tolerance)))
+            # Go down to the next height left that is not known to fail, backing up
+            #   past the heights left that have no options left
+            next_index = None
+            while branches:
+                branch_left, options = branches[-1]
+                while options:
+                    # Take a random one of the options left
+                    choice = rng.randrange(len(options))
+                    options[choice], options[-1] = options[-1], options[choice]
+                    index = options.pop()
+                    if (round(branch_left - self.distinct_heights[index],
+                              FILL_KEY_DIGITS) not in failed):
+                        next_index = index
+                        break
+                if next_index is not None:
+                    break
+                failed.add(round(branch_left, FILL_KEY_DIGITS))
+                branches.pop()
+                if picked:
+                    picked.pop()
+            if next_index is None:
+                # Every mix was tried
+                return None
+            start, stop = self.height_ranges[next_index]
+            picked.append(self.pieces[rng.randrange(start, stop)])
+            height_left = branches[-1][0] - self.distinct_heights[next_index]
+        return None
+
+    def fill_options(self, height_left=0, tolerance=0):
+        """
+        Returns the heights of piece that can be added to a stack without closing it,
+        each leaving room for at least the shortest piece.
+
+        :param height_left: The height left to fill.
+        :type: float
+
+        :param tolerance: How far above or below the height the pieces may add up to.
+        :type: float
+
+        :return: The indices of the heights in distinct_heights.
+        :type: list
+        """
+        # Pieces with no height never change the height left, so they are left out
+        start = bisect.bisect_right(self.distinct_heights, HEIGHT_EPSILON)
+        stop = bisect.bisect_right(self.distinct_heights, height_left - self.shortest
+                                   + tolerance + HEIGHT_EPSILON)
+        return list(range(start, stop))
+
+    def fill_closest(self, height=0, tolerance=0, rng=None):
+        """
+        Randomly picks middle pieces that fill a height as closely as they can, for
+        heights no mix of pieces was found for. Each piece either closes the height
+        left or has a height and leaves room for the shortest piece after it, and if no
+        piece fits, the piece that brings the stack closest to the height finishes it.
+
+        :param height: The height to fill.
+        :type: float
+
+        :param tolerance: How far above or below the height the pieces may add up to.
+        :type: float
+
+        :param rng: The random generator to pick with.
+        :type: random.Random
+
+        :return: The picked pieces, at least one.
+        :type: list
+        """
+        picked = []
+        height_left = height
+        while len(picked) < MAX_FILL_PIECES:
+            # Finish with a piece that closes the height left, if there is one
+            middle = self.pick(height_left - tolerance, height_left + tolerance, rng)
+            if middle is not None:
+                picked.append(middle)
+                break
+            # Otherwise add a piece that leaves room for the shortest piece after it.
+            #   Pieces with no height would never use up the height left, so they are
+            #   not added here
+            options = self.fill_options(height_left, tolerance)
+            if not options:
+                # Nothing fits, so finish with the closest piece if it gets any closer
+                middle = self.closest(height_left)
+                if not picked or (abs(height_left - self.piece_heights[middle])
+                                  < abs(height_left)):
+                    picked.append(middle)
+                break
+            start = self.height_ranges[options[0]][0]
+            stop = self.height_ranges[options[-1]][1]
+            middle = self.pieces[rng.randrange(start, stop)]
+            picked.append(middle)
+            height_left -= self.piece_heights[middle]
+        return picked
+
+    def closest(self, height=None):
+        """
+        Returns the piece whose height is closest to the given height.
+
+        :param height: The height to match.
+        :type: float
+
+        :return: The closest piece.
+        :type: str
+        """
+        index = bisect.bisect_left(self.heights, height)
+        # The closest height is either side of where the height would be inserted
+        if index == len(self.heights) or (index > 0 and height - self.heights[index - 1]
+                                          <= self.heights[index] - height):
+            index -= 1
+        return self.pieces[index]
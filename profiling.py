@@ -0,0 +1,318 @@
+#!/usr/bin/env python
+#SETMODE 777
+
+#----------------------------------------------------------------------------------------#
+#------------------------------------------------------------------------------ HEADER --#
+
+"""
+:author:
+    kpm200000
+
+:synopsis:
+    This module profiles stack builds by timing their phases and Maya commands.
+
+:description:
+    This module is an opt-in profiling layer for the stacking tools. While it is
+    enabled, the cmds of the stacker, gen_utils, builder, and Builder GUI modules is
+    swapped for a proxy that counts and times every Maya command, and the time spent in
+    each phase of a build, such as duplication or grouping, is recorded along with the
+    commands called in it. At the end of each build a JSON report is written.
+
+    When profiling is disabled the modules use maya.cmds directly, so the only cost
+    left is the check made when a phase or build starts.
+
+    Builds that run a few steps at a time, such as those run by the Builder GUI, mark
+    the time between their steps as idle, so that time spent handling other events is
+    left out of the times of the build and its phases.
+
+    Example:
+        from td_maya_tools import profiling
+        profiling.enable('C:/temp/stack_profiles')
+        build_stacks(...)
+        profiling.disable()
+
+:applications:
+    Maya
+
+:see_also:
+    builder
+"""
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- IMPORTS --#
+
+# Default Python Imports
+import contextlib
+import json
+import os
+import sys
+import time
+
+# Imports That You Wrote
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- CONSTANTS --#
+
+# The modules whose Maya commands are profiled
+PROFILED_MODULES = ('td_maya_tools.stacker', 'td_maya_tools.gen_utils',
+                    'td_maya_tools.builder', 'td_maya_tools.guis.builder_gui')
+
+# The profiler in use, or None when profiling is disabled
+ACTIVE_PROFILER = None
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- FUNCTIONS --#
+
+def enable(report_path=None):
+    """
+    This function starts profiling the Maya commands and build phases of the stacking
+    tools.
+
+    :param report_path: Where to write the report at the end of each build. A path
+    ending in .json is overwritten by each build, any other path is used as a directory
+    that gets one report per build. If not given, no reports are written, but the
+    profiler's results can still be read with get_profiler.
+    :type: str
+
+    :return: The profiler.
+    :type: Profiler
+    """
+    global ACTIVE_PROFILER
+    if ACTIVE_PROFILER is not None:
+        disable()
+    ACTIVE_PROFILER = Profiler(report_path)
+    # Swap the cmds of every profiled module that has been imported for the proxy
+    for module_name in PROFILED_MODULES:
+        module = sys.modules.get(module_name)
+        if module is not None and hasattr(module, 'cmds'):
+            ACTIVE_PROFILER.patched_modules[module] = module.cmds
+            module.cmds = CommandProxy(module.cmds, ACTIVE_PROFILER)
+    return ACTIVE_PROFILER
+
+def disable():
+    """
+    This function stops profiling and puts the real Maya commands back.
+    """
+    global ACTIVE_PROFILER
+    if ACTIVE_PROFILER is None:
+        return
+    for module, real_cmds in ACTIVE_PROFILER.patched_modules.items():
+        module.cmds = real_cmds
+    ACTIVE_PROFILER = None
+
+def get_profiler():
+    """
+    This function returns the profiler in use.
+
+    :return: The profiler, or None if profiling is disabled.
+    :type: Profiler
+    """
+    return ACTIVE_PROFILER
+
+@contextlib.contextmanager
+def phase(name=None):
+    """
+    This function times a phase of a build, such as duplication or grouping, and
+    records the Maya commands called during it under that phase.
+
+    :param name: The name of the phase.
+    :type: str
+    """
+    profiler = ACTIVE_PROFILER
+    if profiler is None:
+        yield
+        return
+    outer_phase = profiler.current_phase
+    profiler.current_phase = name
+    start = time.perf_counter()
+    idle_start = profiler.idle_seconds
+    try:
+        yield
+    finally:
+        profiler.record_phase(name, time.perf_counter() - start
+                              - (profiler.idle_seconds - idle_start))
+        profiler.current_phase = outer_phase
+
+@contextlib.contextmanager
+def idle():
+    """
+    This function stops the clocks of the build and its phases while a build that runs
+    a few steps at a time waits for its next step. Commands called while waiting are
+    not recorded under the phase the build is in.
+    """
+    profiler = ACTIVE_PROFILER
+    if profiler is None:
+        yield
+        return
+    build_phase = profiler.current_phase
+    profiler.current_phase = None
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.idle_seconds += time.perf_counter() - start
+        profiler.current_phase = build_phase
+
+@contextlib.contextmanager
+def profile_build(name=None):
+    """
+    This function profiles a whole build and writes its report at the end. Builds
+    started inside another build are part of the outer build's report.
+
+    :param name: The name of the build.
+    :type: str
+    """
+    profiler = ACTIVE_PROFILER
+    if profiler is None:
+        yield
+        return
+    profiler.build_depth += 1
+    if profiler.build_depth == 1:
+        profiler.start_build(name)
+    try:
+        yield
+    finally:
+        profiler.build_depth -= 1
+        if profiler.build_depth == 0:
+            profiler.finish_build()
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- CLASSES --#
+
+class Profiler(object):
+    """
+    The counts and times of the Maya commands and phases of the current build.
+    """
+    def __init__(self, report_path=None):
+        # Where to write the reports
+        self.report_path = report_path
+        # The modules whose cmds were swapped, and their real cmds
+        self.patched_modules = {}
+        # The build being profiled and how deep in nested builds the profiler is
+        self.build_name = None
+        self.build_depth = 0
+        self.build_start = None
+        # The time the build spent waiting between its steps
+        self.idle_seconds = 0.0
+        # The phase the commands are being called in
+        self.current_phase = None
+        # The time spent in each phase
+        self.phase_seconds = {}
+        # The [count, seconds] of each command, keyed by phase and then command
+        self.command_stats = {}
+        # The report of the last build that finished
+        self.last_report = None
+
+    def start_build(self, name=None):
+        """
+        Clears the counts and times for a new build.
+
+        :param name: The name of the build.
+        :type: str
+        """
+        self.build_name = name
+        self.build_start = time.perf_counter()
+        self.idle_seconds = 0.0
+        self.phase_seconds = {}
+        self.command_stats = {}
+
+    def record_command(self, command=None, seconds=0.0):
+        """
+        Adds a call to a command to the current phase.
+
+        :param command: The name of the command.
+        :type: str
+
+        :param seconds: How long the call took.
+        :type: float
+        """
+        phase_stats = self.command_stats.setdefault(self.current_phase, {})
+        stats = phase_stats.get(command)
+        if stats is None:
+            stats = phase_stats[command] = [0, 0.0]
+        stats[0] += 1
+        stats[1] += seconds
+
+    def record_phase(self, name=None, seconds=0.0):
+        """
+        Adds time spent in a phase.
+
+        :param name: The name of the phase.
+        :type: str
+
+        :param seconds: How long the phase took.
+        :type: float
+        """
+        self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + seconds
+
+    def get_report(self):
+        """
+        Returns the counts and times of the current build.
+
+        :return: The total time of the build and the time it spent waiting between
+        steps, the time and commands of each phase, and the count and time of each
+        command over the whole build.
+        :type: dict
+        """
+        seconds = 0.0
+        if self.build_start is not None:
+            seconds = time.perf_counter() - self.build_start - self.idle_seconds
+        phases = {}
+        totals = {}
+        for phase_name, phase_stats in self.command_stats.items():
+            phase_name = phase_name or 'other'
+            phase_report = phases.setdefault(phase_name, {'seconds': 0.0, 'commands': {}})
+            for command, (count, command_seconds) in sorted(phase_stats.items()):
+                phase_report['commands'][command] = {'count': count,
+                                                     'seconds': command_seconds}
+                total = totals.setdefault(command, {'count': 0, 'seconds': 0.0})
+                total['count'] += count
+                total['seconds'] += command_seconds
+        for phase_name, phase_seconds in self.phase_seconds.items():
+            phases.setdefault(phase_name, {'seconds': 0.0, 'commands': {}})
+            phases[phase_name]['seconds'] = phase_seconds
+        return {'build': self.build_name, 'seconds': seconds,
+                'idle_seconds': self.idle_seconds, 'phases': phases,
+                'commands': dict(sorted(totals.items()))}
+
+    def finish_build(self):
+        """
+        Writes the report of the build that just finished, if there is a report path.
+        """
+        self.last_report = self.get_report()
+        if not self.report_path:
+            return
+        # Write to the file given, or to a new file in the directory given
+        file_path = self.report_path
+        if not file_path.endswith('.json'):
+            if not os.path.isdir(file_path):
+                os.makedirs(file_path)
+            file_path = os.path.join(file_path, "%s_%s.json" % (
+                self.build_name or 'build', time.strftime('%Y%m%d_%H%M%S')))
+        with open(file_path, 'w') as report_fh:
+            json.dump(self.last_report, report_fh, indent=2)
+
+class CommandProxy(object):
+    """
+    Stands in for maya.cmds while profiling, timing each command before passing the
+    call on to the real command.
+    """
+    def __init__(self, real_cmds=None, profiler=None):
+        self.real_cmds = real_cmds
+        self.profiler = profiler
+
+    def __getattr__(self, command):
+        real_command = getattr(self.real_cmds, command)
+        if not callable(real_command):
+            return real_command
+        profiler = self.profiler
+
+        def timed_command(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return real_command(*args, **kwargs)
+            finally:
+                profiler.record_command(command, time.perf_counter() - start)
+        # Keep the wrapper so later calls skip the lookup
+        setattr(self, command, timed_command)
+        return timed_command
@@ -17,6 +17,8 @@
     objects on top of, but does not move. The rest of the objects in the list are stacked
     in the order that they are given, with the last object in the list being the top.
     All the objects are centered around the base's top center point.
+    Stacking on top is one case of stack_along_axis, which lays objects out along any
+    axis with their centers or edges lined up, reading each object's bounding box once.
 
 :applications:
     Maya
@@ -32,20 +34,68 @@
 import maya.cmds as cmds
 
 # Imports That You Wrote
+from td_maya_tools.layout import compute_axis_layout
+from td_maya_tools.layout import compute_grid_layout
+from td_maya_tools.layout import bounding_box_point
+from td_maya_tools.layout import compute_point_extents
+from td_maya_tools.layout import union_bounding_box
+from td_maya_tools.layout import AXES
+from td_maya_tools.layout import ALIGNMENTS
+from td_maya_tools.layout import offset_bounding_box
+from td_maya_tools.gen_utils import BuildContext
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- CONSTANTS --#
+
+# Translations smaller than this in every axis are rounding error and are not applied
+MOVE_TOLERANCE = 1e-9
+
+# The number of decimal places of a shape's rotation and scale that are used to look up
+#   its cached extents
+SHAPE_KEY_DIGITS = 6
+
+# The events after which no cached shape extents can be trusted
+SCENE_EVENTS = ('SceneOpened', 'NewSceneOpened')
 
 #----------------------------------------------------------------------------------------#
 #--------------------------------------------------------------------------- FUNCTIONS --#
 
-def stack_objs(obj_trans_list=None):
+def stack_along_axis(obj_trans_list=None, axis='y', offset=0, align='center',
+                     bbox_cache=None, origin=None, tight=False):
     """
-    This function stacks the given objects on top of one another, all centered
-    around the top center point of the base object. The objects are stacked in the order
-    they are passed, the first object being the base and the last object being the top.
+    This function lays the given objects out one after another along any axis, each
+    the given offset away from the one before it, with their centers or edges lined up
+    with the first object on the other two axes. The bounding box of every object is
+    read once, whatever the axis and alignment, and all of the objects are moved in one
+    pass. The first object does not move, unless an origin is given.
 
-    :param obj_trans_list: The translational nodes of the objects to stack
+    :param obj_trans_list: The translational nodes of the objects, first object first.
     :type: list
 
-    :return: Indicates if the objects were stacked successfully.
+    :param axis: The axis to lay the objects out along, one of 'x', 'y', or 'z', with a
+    leading '-' for the negative direction.
+    :type: str
+
+    :param offset: The distance/separation between neighbouring objects along the axis.
+    :type: float
+
+    :param align: How to line the objects up on the other two axes: 'center', 'min',
+    'max', or None to leave them where they are.
+    :type: str
+
+    :param bbox_cache: The bounding box cache to read from and update. If none is given,
+    a new cache is filled with every object in the list.
+    :type: BoundingBoxCache
+
+    :param origin: The (x, y, z) point to place the starting face of all the objects at,
+    aligned the same way. If not given, the first object does not move.
+    :type: list
+
+    :param tight: Whether to measure the objects from their mesh vertices, which fits
+    rotated objects tightly, when no cache is given.
+    :type: bool
+
+    :return: Indicates if the objects were laid out successfully.
     :type: bool
     """
     # Check to see if the correct arguments were passed
@@ -53,25 +103,57 @@ def stack_objs(obj_trans_list=None):
         cmds.warning("You need to provide a list that contains the translational"
                      " nodes of objects.")
         return None
+    if str(axis).lower().lstrip('+-') not in AXES:
+        cmds.warning("The axis must be one of x, y, or z, optionally starting with -.")
+        return None
+    if align is not None and align not in ALIGNMENTS:
+        cmds.warning(f"The alignment must be one of {', '.join(ALIGNMENTS)}, or None.")
+        return None
 
-    # Getting the first base object of the list
-    base_obj = obj_trans_list[0]
-    # For every object in the list, stack it on object listed before it
-    for top_obj in obj_trans_list:
-        # Skip the first object since it is the first base object
-        if top_obj is obj_trans_list[0]:
-            continue
-        # Get the top center of the base object
-        bases_top_center = get_center_point(base_obj, True, False)
-        # Get the bottom center of the top object
-        tops_bottom_center = get_center_point(top_obj, False, True)
-        # Move the top object so that it is resting on the base object
-        create_stack(top_obj, tops_bottom_center, bases_top_center)
-        # Changing next base object to current top object
-        base_obj = top_obj
+    # Measure and move inside one context, undoing in one step, so that the bounding
+    #   boxes stay cached from the query to the move
+    with BuildContext('stack_along_axis'):
+        # Query the bounding box of every object in one pass up front
+        if bbox_cache is None:
+            bbox_cache = BoundingBoxCache(tight=tight)
+        bbox_cache.fill(obj_trans_list)
+
+        # Compute where every object needs to move without touching the scene
+        bounding_boxes = [bbox_cache.get_bounding_box(obj) for obj in obj_trans_list]
+        translations = compute_axis_layout(bounding_boxes, axis, offset, align, origin)
+        # Move all of the objects in one pass
+        apply_translations(obj_trans_list, translations, bbox_cache)
     return True
 
-def create_stack(obj_trans=None, bottom_center_point=None, point_to_place=None):
+def stack_objs(obj_trans_list=None, bbox_cache=None, origin=None, tight=False):
+    """
+    This function stacks the given objects on top of one another, all centered
+    around the top center point of the base object. The objects are stacked in the order
+    they are passed, the first object being the base and the last object being the top.
+
+    :param obj_trans_list: The translational nodes of the objects to stack
+    :type: list
+
+    :param bbox_cache: The bounding box cache to read from and update. If none is given,
+    a new cache is filled with every object in the list.
+    :type: BoundingBoxCache
+
+    :param origin: The (x, y, z) point to place the bottom center of the whole stack
+    at. If not given, the base object does not move.
+    :type: list
+
+    :param tight: Whether to stack the objects on their lowest and highest vertices
+    instead of their bounding boxes, when no cache is given.
+    :type: bool
+
+    :return: Indicates if the objects were stacked successfully.
+    :type: bool
+    """
+    # Stacking is laying out along +y with the centers lined up
+    return stack_along_axis(obj_trans_list, 'y', 0, 'center', bbox_cache, origin, tight)
+
+def create_stack(obj_trans=None, bottom_center_point=None, point_to_place=None,
+                 bbox_cache=None):
     """
     This function moves the object given so that its bottom center point is sitting at
     the point in space given to place the object.
@@ -86,16 +168,23 @@ def create_stack(obj_trans=None, bottom_center_point=None, point_to_place=None):
     :param point_to_place: The point in space at which to place the object, given in
     form (x, y, z).
     :type: list
+
+    :param bbox_cache: The bounding box cache to keep up to date with the move.
+    :type: BoundingBoxCache
     """
     # Finding the amount to move the object in each axis relative to its current location
     x_move_amt = point_to_place[0] - bottom_center_point[0]
     y_move_amt = point_to_place[1] - bottom_center_point[1]
     z_move_amt = point_to_place[2] - bottom_center_point[2]
-    # Moving the object
-    cmds.move(x_move_amt, y_move_amt, z_move_amt, obj_trans, relative=True)
+    # Moving the object, shifting its cached bounding box by the same amount
+    if bbox_cache is not None:
+        bbox_cache.move(obj_trans, x_move_amt, y_move_amt, z_move_amt)
+    else:
+        cmds.move(x_move_amt, y_move_amt, z_move_amt, obj_trans, relative=True)
 
 
-def get_center_point(obj_trans=None, top_center_flag=None, bottom_center_flag=None):
+def get_center_point(obj_trans=None, top_center_flag=None, bottom_center_flag=None,
+                     bbox_cache=None, tight=False):
     """
     This function uses the bounding box of an object to return a list with either the top
     center coordinates (x, y, z) or the bottom center coordinates (x, y, z) of an object,
@@ -110,27 +199,31 @@ def get_center_point(obj_trans=None, top_center_flag=None, bottom_center_flag=No
     :param bottom_center_flag: True if returning the bottom center coordinates.
     :type: bool
 
+    :param bbox_cache: The bounding box cache to read the bounding box from.
+    :type: BoundingBoxCache
+
+    :param tight: Whether to measure the object from its mesh vertices, when no cache is
+    given.
+    :type: bool
+
     :return: Either the top center coordinates (x, y, z) or the bottom center coordinates
     (x, y, z) depending on the flags passed.
     :type: list
     """
     # Get the bounding box of the object passed in; note that bounding box is returned as
     #   a list with argument order [xmin, ymin, zmin, xmax, ymax, zmax]
-    bounding_box = cmds.xform(obj_trans, query=True, boundingBox=True)
-    # Calculate the X and Z center coordinates
-    center_point = [0, 0, 0]
-    center_point[0] = (bounding_box[0] + bounding_box[3]) / 2
-    center_point[2] = (bounding_box[2] + bounding_box[5]) / 2
-    # Set Y coordinate based on flags
-    if top_center_flag:
-        # Y coordinate is ymax, because we are looking for the top center point
-        center_point[1] = bounding_box[4]
+    if bbox_cache is None:
+        bbox_cache = BoundingBoxCache(tight=tight)
+    bounding_box = bbox_cache.get_bounding_box(obj_trans)
+    # The bottom center flag wins if both are set; with neither, Y is left at zero
+    center_point = bounding_box_point(bounding_box, 'y', 'max', 'center')
     if bottom_center_flag:
-        # Y coordinate is ymin, because we are looking for the bottom center point
-        center_point[1] = bounding_box[1]
+        center_point = bounding_box_point(bounding_box, 'y', 'min', 'center')
+    elif not top_center_flag:
+        center_point[1] = 0
     return center_point
 
-def offset_objs_in_x(stationary_obj=None, move_obj =None, offset=0):
+def offset_objs_in_x(stationary_obj=None, move_obj =None, offset=0, tight=False):
     """
     This function takes two transform nodes, where one will be moved to be a given offset
     away from the other along the x-axis by using the bounding box information of the
@@ -144,15 +237,196 @@ def offset_objs_in_x(stationary_obj=None, move_obj =None, offset=0):
 
     :param offset: The distance/separation between the two translational nodes.
     :type: float
+
+    :param tight: Whether to measure the objects from their mesh vertices.
+    :type: bool
     """
-    # Get the bounding box of both objects passed in; note that bounding box is returned
-    #   as a list with argument order [xmin, ymin, zmin, xmax, ymax, zmax]
-    bound_box_stat = cmds.xform(stationary_obj, query=True, boundingBox=True)
-    bound_box_move = cmds.xform(move_obj, query=True, boundingBox=True)
+    # Get the bounding box of both objects passed in with one query each
+    obj_trans_list = [stationary_obj, move_obj]
+    bounding_boxes = [measure_bounding_box(obj, tight) for obj in obj_trans_list]
     # Moving the object so the two objects are right next to each other
-    #    (stationary's xmax - move's xmin) then adding the offset
-    cmds.move(bound_box_stat[3] - bound_box_move[0] + offset, 0, 0, move_obj,
-              relative=True)
+    #    (stationary's xmax - move's xmin) then adding the offset, the same way
+    #    stack_along_axis lays objects out along x without lining them up; a single
+    #    move does not need its own undo chunk
+    translations = compute_axis_layout(bounding_boxes, 'x', offset, None)
+    apply_translations(obj_trans_list, translations)
+
+def arrange_stacks(stacks=None, offset=0, per_row=None, row_offset=None,
+                   bbox_cache=None):
+    """
+    This function lays all of the given stacks out along the x-axis in one pass, each
+    the given offset away from the stack before it, the way offset_objs_in_x does for
+    one pair of stacks. The bounding box of each stack is read once, every position is
+    computed with a running sum, and all of the stacks are moved together. The stacks
+    can also be wrapped into a grid of rows along the z-axis, so that large builds do
+    not make one very long line.
+
+    :param stacks: The translational nodes of the stacks, in order. The first stack
+    does not move.
+    :type: list
+
+    :param offset: The distance/separation between neighbouring stacks in a row.
+    :type: float
+
+    :param per_row: The number of stacks in each row. If not given, every stack is put
+    in one row.
+    :type: int
+
+    :param row_offset: The distance/separation between neighbouring rows. If not given,
+    the offset is used.
+    :type: float
+
+    :param bbox_cache: The bounding box cache to read from and update.
+    :type: BoundingBoxCache
+
+    :return: Indicates if the stacks were arranged successfully.
+    :type: bool
+    """
+    # Check to see if the correct arguments were passed
+    if not verify_args(stacks):
+        cmds.warning("You need to provide a list that contains the translational"
+                     " nodes of stacks.")
+        return None
+    # Measure and move inside one context, the way stack_along_axis does, so that the
+    #   bounding boxes stay cached from the query to the move
+    with BuildContext('arrange_stacks'):
+        # Read every bounding box once
+        if bbox_cache is None:
+            bbox_cache = BoundingBoxCache()
+        bbox_cache.fill(stacks)
+        bounding_boxes = [bbox_cache.get_bounding_box(stack) for stack in stacks]
+        # Compute every position, then move all of the stacks together
+        translations = compute_grid_layout(bounding_boxes, offset, per_row, row_offset)
+        apply_translations(stacks, translations, bbox_cache)
+    return True
+
+def apply_translations(obj_trans_list=None, translations=None, bbox_cache=None):
+    """
+    This function pushes the translations computed by the layout module to the scene in
+    one pass. Objects that do not move, or only move by rounding error, are skipped, and
+    objects that move by the same amount are moved together with a single command.
+
+    :param obj_trans_list: The translational nodes of the objects to move.
+    :type: list
+
+    :param translations: The relative (x, y, z) translation of each object, in the same
+    order as the objects.
+    :type: list
+
+    :param bbox_cache: The bounding box cache to keep up to date with the moves.
+    :type: BoundingBoxCache
+    """
+    # Gather the objects that move by each distinct amount
+    moves = {}
+    for obj_trans, translation in zip(obj_trans_list, translations):
+        translation = tuple(translation)
+        # Skip objects that do not move
+        if all(abs(value) < MOVE_TOLERANCE for value in translation):
+            continue
+        moves.setdefault(translation, []).append(obj_trans)
+    # Move every group of objects with one command
+    for translation, objs in moves.items():
+        cmds.move(translation[0], translation[1], translation[2], objs, relative=True)
+        # Shift the cached bounding boxes by the same amount
+        if bbox_cache is not None:
+            for obj_trans in objs:
+                bbox_cache.shift(obj_trans, translation)
+
+def apply_positions(obj_trans_list=None, positions=None):
+    """
+    This function places every object at the given world space translation in one pass.
+    Objects placed at the same translation are placed together with a single command,
+    so it does not matter where the objects were before.
+
+    :param obj_trans_list: The translational nodes of the objects to place.
+    :type: list
+
+    :param positions: The world space (x, y, z) translation of each object, in the same
+    order as the objects.
+    :type: list
+    """
+    # Gather the objects placed at each distinct translation
+    placements = {}
+    for obj_trans, position in zip(obj_trans_list, positions):
+        placements.setdefault(tuple(position), []).append(obj_trans)
+    # Place every group of objects with one command
+    for position, objs in placements.items():
+        cmds.xform(objs, worldSpace=True, translation=position)
+
+def get_local_bounding_boxes(obj_trans_list=None, tight=False):
+    """
+    This function measures the bounding box of each object around its world space
+    translation. Moving an object, or duplicating it, does not change this box, so an
+    object's duplicates can be laid out from it without measuring them. Rotating or
+    scaling the object does change it.
+
+    :param obj_trans_list: The translational nodes of the objects to measure.
+    :type: list
+
+    :param tight: Whether to measure the objects from their mesh vertices.
+    :type: bool
+
+    :return: The bounding box of each object, relative to its translation, in the order
+    [xmin, ymin, zmin, xmax, ymax, zmax].
+    :type: dict
+    """
+    local_boxes = {}
+    for obj_trans in obj_trans_list or []:
+        bounding_box = measure_bounding_box(obj_trans, tight)
+        translation = cmds.xform(obj_trans, query=True, worldSpace=True,
+                                 translation=True)
+        local_boxes[obj_trans] = offset_bounding_box(
+            bounding_box, [-value for value in translation])
+    return local_boxes
+
+def measure_bounding_box(obj_trans=None, tight=False):
+    """
+    This function queries the world space bounding box of an object from the scene.
+
+    :param obj_trans: The translational node of the object.
+    :type: str
+
+    :param tight: Whether to measure the object from its mesh vertices instead of its
+    world bounding box.
+    :type: bool
+
+    :return: The bounding box in the order [xmin, ymin, zmin, xmax, ymax, zmax].
+    :type: list
+    """
+    if tight:
+        return get_tight_bounding_box(obj_trans)
+    return cmds.xform(obj_trans, query=True, boundingBox=True)
+
+def get_tight_bounding_box(obj_trans=None):
+    """
+    This function measures the world space bounding box of an object from the vertices
+    of the meshes under it. The world bounding box from xform is a box around each
+    mesh's rotated bounding box, so rotated objects stack with gaps; measuring the
+    vertices gives the object's real lowest and highest points on every axis. The
+    extents of each mesh are cached by ShapeBoundsCache, so measuring an object again
+    after moving it does not scan its vertices again. Objects without meshes use their
+    world bounding box.
+
+    :param obj_trans: The translational node of the object.
+    :type: str
+
+    :return: The bounding box in the order [xmin, ymin, zmin, xmax, ymax, zmax].
+    :type: list
+    """
+    shapes = cmds.listRelatives(obj_trans, allDescendents=True, type='mesh',
+                                fullPath=True, noIntermediate=True)
+    if not shapes:
+        return cmds.xform(obj_trans, query=True, boundingBox=True)
+    bounding_boxes = []
+    for shape in shapes:
+        # The world matrix of the mesh's own DAG path, whose last row is its world
+        #   translation. An instanced mesh has a matrix for each instance, so it is read
+        #   from the transform above this path rather than from the shape
+        matrix = cmds.xform(shape.rsplit('|', 1)[0], query=True, worldSpace=True,
+                            matrix=True)
+        bounding_boxes.append(offset_bounding_box(
+            ShapeBoundsCache.get_extents(shape, matrix), matrix[12:15]))
+    return union_bounding_box(bounding_boxes)
 
 def verify_args(obj_trans_list=None):
     """
@@ -179,3 +453,205 @@ def verify_args(obj_trans_list=None):
 #----------------------------------------------------------------------------------------#
 #----------------------------------------------------------------------------- CLASSES --#
 
+class BoundingBoxCache(object):
+    """
+    A cache of world space bounding boxes keyed by transform name, so that each object
+    is only queried from the scene once. Moves made through the cache shift the stored
+    bounding boxes by the known amount instead of querying them again. A tight cache
+    measures objects from their mesh vertices instead of their world bounding boxes.
+
+    Nothing outside the code running a build can change the scene while its undo chunk
+    is open, so a bounding box is only trusted until the BuildContext it was measured,
+    stored, or moved in is closed. After that, or if it was cached outside of any
+    context, it is measured again the next time it is needed, so objects moved or edited
+    between builds are never read from stale boxes. Changes the running code makes to
+    cached objects without going through the cache must still be passed to invalidate.
+    """
+    def __init__(self, obj_trans_list=None, tight=False):
+        # The bounding boxes of the objects, each in the order
+        #   [xmin, ymin, zmin, xmax, ymax, zmax]
+        self.boxes = {}
+        # The BuildContext generation each bounding box was last known to be right in
+        self.generations = {}
+        # Whether objects are measured from their mesh vertices
+        self.tight = tight
+        # Fill the cache with the objects given
+        if obj_trans_list:
+            self.fill(obj_trans_list)
+
+    def fill(self, obj_trans_list=None):
+        """
+        Queries the bounding box of every object in the list that is not already cached.
+
+        :param obj_trans_list: The translational nodes of the objects to cache.
+        :type: list
+        """
+        for obj_trans in obj_trans_list:
+            # Skip objects that are already cached and still current
+            if self.is_current(obj_trans):
+                continue
+            self.store(obj_trans, measure_bounding_box(obj_trans, self.tight))
+
+    def get_bounding_box(self, obj_trans=None):
+        """
+        Returns the bounding box of the object, querying it from the scene only if it is
+        not already cached.
+
+        :param obj_trans: The translational node of the object.
+        :type: str
+
+        :return: The bounding box in the order [xmin, ymin, zmin, xmax, ymax, zmax].
+        :type: list
+        """
+        if not self.is_current(obj_trans):
+            self.store(obj_trans, measure_bounding_box(obj_trans, self.tight))
+        return self.boxes[obj_trans]
+
+    def is_current(self, obj_trans=None):
+        """
+        Returns whether the cached bounding box of an object can still be trusted, which
+        is only while the BuildContext it was cached in is open.
+
+        :param obj_trans: The translational node of the object.
+        :type: str
+
+        :return: Whether the object is cached and its bounding box is current.
+        :type: bool
+        """
+        if not BuildContext.depth or obj_trans not in self.boxes:
+            return False
+        return self.generations[obj_trans] == BuildContext.generation
+
+    def store(self, obj_trans=None, bounding_box=None):
+        """
+        Stores a bounding box that is already known, such as one computed from the
+        bounding boxes of a group's children, so that it is not queried.
+
+        :param obj_trans: The translational node of the object.
+        :type: str
+
+        :param bounding_box: The bounding box in the order [xmin, ymin, zmin, xmax, ymax,
+        zmax].
+        :type: list
+        """
+        self.boxes[obj_trans] = bounding_box
+        self.generations[obj_trans] = BuildContext.generation
+
+    def move(self, obj_trans=None, x_move_amt=0, y_move_amt=0, z_move_amt=0):
+        """
+        Moves the object relative to its current location and shifts its cached bounding
+        box by the same amount.
+
+        :param obj_trans: The translational node of the object.
+        :type: str
+
+        :param x_move_amt: The amount to move the object in x.
+        :type: float
+
+        :param y_move_amt: The amount to move the object in y.
+        :type: float
+
+        :param z_move_amt: The amount to move the object in z.
+        :type: float
+        """
+        cmds.move(x_move_amt, y_move_amt, z_move_amt, obj_trans, relative=True)
+        self.shift(obj_trans, (x_move_amt, y_move_amt, z_move_amt))
+
+    def shift(self, obj_trans=None, translation=None):
+        """
+        Shifts the cached bounding box of an object that has already been moved by the
+        given amount. Objects that are not cached are left alone, and objects whose
+        bounding box is no longer current are removed to be measured again.
+
+        :param obj_trans: The translational node of the object.
+        :type: str
+
+        :param translation: The (x, y, z) amount the object was moved.
+        :type: list
+        """
+        if self.is_current(obj_trans):
+            self.boxes[obj_trans] = offset_bounding_box(self.boxes[obj_trans],
+                                                        translation)
+        else:
+            self.invalidate(obj_trans)
+
+    def invalidate(self, obj_trans=None):
+        """
+        Removes an object from the cache, so that its bounding box is queried again the
+        next time it is needed. This must be called whenever the running build changes a
+        cached object without going through the cache. If no object is given, the whole
+        cache is cleared.
+
+        :param obj_trans: The translational node of the object.
+        :type: str
+        """
+        if obj_trans is None:
+            self.boxes.clear()
+            self.generations.clear()
+        else:
+            self.boxes.pop(obj_trans, None)
+            self.generations.pop(obj_trans, None)
+
+class ShapeBoundsCache(object):
+    """
+    A cache of the extents of mesh shapes, shared by every tight bounding box query. The
+    extents are the bounding box of a shape's vertices after its rotation and scale,
+    around its world translation, so moving a shape does not scan its vertices again.
+    They are keyed by the shape's UUID, its vertex count, and its rotation and scale, so
+    a renamed shape keeps its extents, a new shape given an old shape's name does not
+    read them, and a mesh that gains or loses vertices is scanned again. The cache is
+    emptied whenever a scene is opened or a new one is made. Clear it after moving a
+    mesh's vertices without changing how many there are.
+    """
+    # The extents of every shape measured, keyed by UUID, vertex count, and rotation and
+    #   scale
+    extents = {}
+    # The script jobs that empty the cache when a scene is opened or made
+    scene_jobs = []
+
+    @classmethod
+    def get_extents(cls, shape=None, matrix=None):
+        """
+        Returns the extents of a mesh shape, scanning its vertices only if the shape has
+        not been measured with the same rotation and scale.
+
+        :param shape: The full path of the mesh shape.
+        :type: str
+
+        :param matrix: The world matrix of the shape, as 16 values in row order.
+        :type: list
+
+        :return: The bounding box of the shape's vertices around its world translation,
+        in the order [xmin, ymin, zmin, xmax, ymax, zmax].
+        :type: list
+        """
+        # The rotation and scale are the top left 3x3 of the matrix
+        linear = [matrix[index] for index in (0, 1, 2, 4, 5, 6, 8, 9, 10)]
+        key = (cmds.ls(shape, uuid=True)[0], cmds.polyEvaluate(shape, vertex=True),
+               hash(tuple(round(value, SHAPE_KEY_DIGITS) for value in linear)))
+        if key not in cls.extents:
+            # Make sure the cache is emptied with the scene before filling it
+            cls.watch_scene()
+            # Read every vertex with one query and measure them as one array
+            points = cmds.xform(shape + '.vtx[*]', query=True, objectSpace=True,
+                                translation=True)
+            cls.extents[key] = compute_point_extents(points, linear)
+        return cls.extents[key]
+
+    @classmethod
+    def watch_scene(cls):
+        """
+        Starts the script jobs that empty the cache when a scene is opened or a new one
+        is made. They are only started once, and last for the rest of the session.
+        """
+        if cls.scene_jobs:
+            return
+        cls.scene_jobs = [cmds.scriptJob(event=[event, cls.clear])
+                          for event in SCENE_EVENTS]
+
+    @classmethod
+    def clear(cls):
+        """
+        Empties the cache, so that every shape's vertices are scanned again.
+        """
+        cls.extents.clear()
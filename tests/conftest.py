@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+#SETMODE 777
+
+#----------------------------------------------------------------------------------------#
+#------------------------------------------------------------------------------ HEADER --#
+
+"""
+:author:
+    kpm200000
+
+:synopsis:
+    This module sets up the tests to run outside of Maya.
+
+:description:
+    This module installs the in-memory fake of maya.cmds from the benchmarks before any
+    test imports the tools, and gives every test that asks for it an empty fake scene.
+
+    Example:
+        python -m pytest -q tests
+
+:applications:
+    Maya
+
+:see_also:
+    fake_maya
+"""
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- IMPORTS --#
+
+# Default Python Imports
+import os
+import sys
+import pytest
+
+# Imports That You Wrote
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'benchmarks'))
+import fake_maya
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- CONSTANTS --#
+
+# The fake commands, installed before any of the tools are imported
+FAKE_CMDS = fake_maya.install(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- FUNCTIONS --#
+
+@pytest.fixture
+def cmds():
+    """
+    Empties the fake scene and its command counts for a test.
+
+    :return: The fake commands.
+    :type: FakeCmds
+    """
+    FAKE_CMDS.reset()
+    return FAKE_CMDS
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+#SETMODE 777
+
+#----------------------------------------------------------------------------------------#
+#------------------------------------------------------------------------------ HEADER --#
+
+"""
+:author:
+    kpm200000
+
+:synopsis:
+    This module tests the general utilities.
+
+:description:
+    This module checks that transform tables are applied to the right nodes, however
+    the table names them, and that they round-trip through XML and binary layout files.
+
+:applications:
+    Maya
+
+:see_also:
+    gen_utils
+"""
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- IMPORTS --#
+
+# Default Python Imports
+import pytest
+
+# Imports That You Wrote
+from td_maya_tools.gen_utils import TransformTable
+from td_maya_tools.gen_utils import MappedLayout
+from td_maya_tools.gen_utils import apply_transform_table
+from td_maya_tools.gen_utils import read_stack_xml
+from td_maya_tools.gen_utils import write_stack_xml
+from td_maya_tools.gen_utils import read_stack_bin
+from td_maya_tools.gen_utils import write_stack_bin
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- FUNCTIONS --#
+
+def test_apply_repeated_and_dag_path_names(cmds):
+    """
+    A node named more than once, by name or by DAG path, gets the translation of its
+    last row, and the rows after it still land on their own nodes.
+    """
+    group = cmds.create_node('grp')
+    first = cmds.create_node('first', [-1, -1, -1, 1, 1, 1])
+    second = cmds.create_node('second', [-1, -1, -1, 1, 1, 1])
+    cmds.nodes[first].parent = cmds.nodes[group]
+    cmds.nodes[group].children.append(cmds.nodes[first])
+    table = TransformTable()
+    for obj, translation in (('first', (1, 1, 1)), ('second', (2, 2, 2)),
+                             ('|grp|first', (3, 3, 3)), ('missing', (0, 0, 0)),
+                             ('grp|first', (4, 4, 4)), ('second', (5, 5, 5))):
+        table.append('stack001', obj, translation)
+    report = apply_transform_table(table)
+    assert report == {'applied': 5, 'skipped': 0, 'missing': 1}
+    assert cmds.nodes[first].translate == [4.0, 4.0, 4.0]
+    assert cmds.nodes[second].translate == [5.0, 5.0, 5.0]
+    assert cmds.nodes[group].translate == [0.0, 0.0, 0.0]
+
+def test_apply_skips_bad_rows(cmds):
+    """
+    Rows for nodes that are not transforms, or with translations that are not numbers,
+    are skipped, and the layout is set with one undoable command.
+    """
+    obj = cmds.create_node('obj', [-1, -1, -1, 1, 1, 1])
+    cmds.create_node('light', node_type='pointLight')
+    table = TransformTable()
+    table.append('stack001', 'light', (1, 1, 1))
+    table.append('stack001', 'obj', (float('nan'), 0, 0))
+    table.append('stack001', 'obj', (1, 2, 3))
+    assert apply_transform_table(table) == {'applied': 1, 'skipped': 2, 'missing': 0}
+    assert cmds.nodes[obj].translate == [1.0, 2.0, 3.0]
+    assert cmds.calls['tdDoModifier'] == 1
+
+def make_table():
+    """
+    Makes a table whose names cannot all be XML element names and whose floats only
+    read back exactly if they are written exactly, with the rows of its stacks mixed.
+
+    :return: The table.
+    :type: TransformTable
+    """
+    table = TransformTable()
+    for stack, obj, translation in (
+            ('stack001', 'box1', (0.1, 1 / 3, -2.5)),
+            ('ns:stack002', 'ns:box1', (1e-300, -0.0, 12345.678)),
+            ('stack001', '|grp|box1', (float(2 ** 53), 0.2, 0.3)),
+            ('stack 3', 'caf\u00e9', (-1.0, 0.0, 1.0)),
+            ('stack001', 'box1', (7.0, 8.0, 9.0))):
+        table.append(stack, obj, translation)
+    return table
+
+def by_stack(table=None):
+    """
+    Returns the rows of a table with the rows of each stack next to each other, the
+    order layout files are written in.
+
+    :param table: The table.
+    :type: TransformTable
+
+    :return: The (stack, obj, (tx, ty, tz)) records of the table.
+    :type: list
+    """
+    return [(stack, table.objects[row], table.translation(row))
+            for stack, rows in table.rows_by_stack() for row in rows]
+
+def test_xml_round_trip(cmds, tmp_path):
+    """
+    A table written to XML reads back with the same names and exactly the same floats,
+    as a table or as a dictionary.
+    """
+    table = make_table()
+    file_path = str(tmp_path / 'layout.xml')
+    assert write_stack_xml(file_path, table)
+    assert list(read_stack_xml(file_path, compact=True).rows()) == by_stack(table)
+    stacks = read_stack_xml(file_path)
+    assert list(stacks) == ['stack001', 'ns:stack002', 'stack 3']
+    assert stacks['stack001']['|grp|box1'] == {'tx': 2.0 ** 53, 'ty': 0.2, 'tz': 0.3}
+    assert stacks['stack 3']['caf\u00e9']['tx'] == -1.0
+
+def test_bin_round_trip(cmds, tmp_path):
+    """
+    A table written to a binary layout file reads back the same, whether it is read
+    whole or memory-mapped.
+    """
+    table = make_table()
+    file_path = str(tmp_path / 'layout.bin')
+    assert write_stack_bin(file_path, table)
+    assert list(read_stack_bin(file_path).rows()) == by_stack(table)
+    with MappedLayout(file_path) as layout:
+        assert len(layout) == len(table)
+        assert layout.get_stack_names() == ['stack001', 'ns:stack002', 'stack 3']
+        assert layout.get_stack_objects('ns:stack002') == ['ns:box1']
+        assert list(layout.stack_translations(2)) == [-1.0, 0.0, 1.0]
+        assert list(layout.to_table().rows()) == by_stack(table)
+        subset = layout.to_table(['stack 3', 0])
+        assert list(subset.rows()) == by_stack(table)[4:] + by_stack(table)[:3]
+
+def test_mapped_layout_closes_under_views(cmds, tmp_path):
+    """
+    Closing a memory-mapped layout while a view of it is still in use closes the file,
+    and the view can still be read.
+    """
+    file_path = str(tmp_path / 'layout.bin')
+    write_stack_bin(file_path, make_table())
+    with MappedLayout(file_path) as layout:
+        view = layout.stack_translations('stack001')
+    assert layout.file_handle.closed
+    assert list(view)[:3] == [0.1, 1 / 3, -2.5]
+
+def test_bin_rejects_other_files(cmds, tmp_path):
+    """
+    Files that are not binary layout files of this version are not read.
+    """
+    file_path = tmp_path / 'layout.bin'
+    file_path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        read_stack_bin(str(file_path))
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+#SETMODE 777
+
+#----------------------------------------------------------------------------------------#
+#------------------------------------------------------------------------------ HEADER --#
+
+"""
+:author:
+    kpm200000
+
+:synopsis:
+    This module tests the layout engine.
+
+:description:
+    This module checks the translations the layout engine computes from bounding boxes
+    alone, and that the NumPy array layouts give the same translations as the layouts
+    computed one object at a time.
+
+:applications:
+    Maya
+
+:see_also:
+    layout
+"""
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- IMPORTS --#
+
+# Default Python Imports
+import random
+import pytest
+
+# Imports That You Wrote
+from td_maya_tools.layout import compute_axis_layout
+from td_maya_tools.layout import compute_stack_layout
+from td_maya_tools.layout import compute_grid_layout
+from td_maya_tools.layout import compute_stack_layouts_array
+from td_maya_tools.layout import compute_grid_layout_array
+from td_maya_tools.layout import array_to_points
+from td_maya_tools.layout import offset_bounding_box
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- FUNCTIONS --#
+
+def random_boxes(count=0, seed=0):
+    """
+    Makes bounding boxes of random sizes at random places.
+
+    :param count: The number of bounding boxes.
+    :type: int
+
+    :param seed: The seed for the sizes and places.
+    :type: int
+
+    :return: The bounding boxes, each in the order [xmin, ymin, zmin, xmax, ymax, zmax].
+    :type: list
+    """
+    rng = random.Random(seed)
+    boxes = []
+    for num in range(count):
+        low = [rng.uniform(-5, 5) for axis in range(3)]
+        boxes.append(low + [value + rng.uniform(0.1, 3) for value in low])
+    return boxes
+
+def assert_points_close(points=None, expected=None):
+    """
+    Checks that two lists of (x, y, z) points are the same, up to rounding.
+
+    :param points: The points to check.
+    :type: list
+
+    :param expected: The points they should be.
+    :type: list
+    """
+    assert len(points) == len(expected)
+    for point, expected_point in zip(points, expected):
+        assert list(point) == pytest.approx(list(expected_point), abs=1e-9)
+
+def test_stack_layout():
+    """
+    Each object sits on top of the one before it, centered on the first object, which
+    does not move.
+    """
+    boxes = [[0, 0, 0, 2, 1, 2], [5, 3, 5, 6, 5, 6], [-1, -1, -1, 1, 0, 1]]
+    assert_points_close(compute_stack_layout(boxes),
+                        [(0, 0, 0), (-4.5, -2, -4.5), (1, 4, 1)])
+
+def test_stack_layout_at_origin():
+    """
+    Given an origin, the bottom center of the whole stack is placed on it.
+    """
+    boxes = [[0, 2, 0, 2, 3, 2], [0, 0, 0, 1, 1, 1]]
+    translations = compute_stack_layout(boxes, [10, 0, -10])
+    moved_boxes = [offset_bounding_box(box, translation)
+                   for box, translation in zip(boxes, translations)]
+    assert moved_boxes[0] == pytest.approx([9, 0, -11, 11, 1, -9])
+    assert moved_boxes[1] == pytest.approx([9.5, 1, -10.5, 10.5, 2, -9.5])
+
+def test_axis_layout_along_negative_axis():
+    """
+    Laying out along -z with an offset puts each object the offset before the last,
+    lined up on the lower edges of the first object on the other axes.
+    """
+    boxes = [[0, 0, 0, 1, 1, 1], [3, 2, 3, 5, 4, 5]]
+    translations = compute_axis_layout(boxes, '-z', 0.5, 'min')
+    assert_points_close(translations, [(0, 0, 0), (-3, -2, -5.5)])
+
+def test_grid_layout_wraps_rows():
+    """
+    A new row starts level with the first object in x, and the row offset past the
+    deepest object of the row before it in z.
+    """
+    boxes = [[0, 0, 0, 1, 1, 1], [0, 0, 0, 2, 1, 3], [0, 0, 0, 1, 1, 1]]
+    translations = compute_grid_layout(boxes, 1.0, 2, 2.0)
+    assert_points_close(translations, [(0, 0, 0), (2, 0, -1), (0, 0, 4)])
+
+def test_empty_layouts():
+    """
+    Laying out nothing gives no translations.
+    """
+    assert compute_axis_layout([]) == []
+    assert compute_grid_layout([], 1.0, 2) == []
+
+def test_array_stack_layouts_match():
+    """
+    The array layout of stacks of different lengths, padded to the longest, matches
+    each stack laid out on its own.
+    """
+    numpy = pytest.importorskip('numpy')
+    stacks = [random_boxes(count, seed) for seed, count in enumerate((4, 2, 5, 1))]
+    padded = [stack + [[0.0] * 6] * (5 - len(stack)) for stack in stacks]
+    counts = numpy.array([len(stack) for stack in stacks])
+    for origin in (None, [1, 2, 3]):
+        translations = compute_stack_layouts_array(padded, counts, origin)
+        for stack_num, stack in enumerate(stacks):
+            assert_points_close(array_to_points(translations[stack_num, :len(stack)]),
+                                compute_stack_layout(stack, origin))
+            assert not translations[stack_num, len(stack):].any()
+
+def test_array_grid_layout_matches():
+    """
+    The array grid layout matches the grid laid out one object at a time, including a
+    last row that is not full.
+    """
+    pytest.importorskip('numpy')
+    boxes = random_boxes(23, 5)
+    for per_row, row_offset in ((None, None), (5, 0.25), (23, 2.0), (1, None)):
+        assert_points_close(
+            array_to_points(compute_grid_layout_array(boxes, 0.5, per_row, row_offset)),
+            compute_grid_layout(boxes, 0.5, per_row, row_offset))
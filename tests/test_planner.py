@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+#SETMODE 777
+
+#----------------------------------------------------------------------------------------#
+#------------------------------------------------------------------------------ HEADER --#
+
+"""
+:author:
+    kpm200000
+
+:synopsis:
+    This module tests the stack planner.
+
+:description:
+    This module checks that plans and layouts are the same for the same seed however
+    the stacks are split between processes, that stacks planned to a target height
+    reach it whenever the middle pieces allow, and that pieces with no height never
+    fill a stack on their own.
+
+:applications:
+    Maya
+
+:see_also:
+    planner
+"""
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- IMPORTS --#
+
+# Default Python Imports
+import random
+
+# Imports That You Wrote
+from td_maya_tools.planner import plan_stacks
+from td_maya_tools.planner import plan_stack_range
+from td_maya_tools.planner import layout_stacks
+from td_maya_tools.planner import layout_stack_range
+from td_maya_tools.planner import StackPlan
+from td_maya_tools.planner import MAX_FILL_PIECES
+from td_maya_tools.layout import ARRAY_LAYOUT_MIN
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- FUNCTIONS --#
+
+def plan_heights(bases=None, middles=None, tops=None, heights=None, count=1,
+                 target_height=0, tolerance=0):
+    """
+    Plans stacks to a target height and returns the plan and the height of each stack.
+
+    :param bases: The objects to choose the base of each stack from.
+    :type: list
+
+    :param middles: The objects to choose the middle pieces of each stack from.
+    :type: list
+
+    :param tops: The objects to choose the top of each stack from.
+    :type: list
+
+    :param heights: The height of each object, keyed by name.
+    :type: dict
+
+    :param count: The number of stacks.
+    :type: int
+
+    :param target_height: The height to build each stack to.
+    :type: float
+
+    :param tolerance: How far above or below the target height a stack may be.
+    :type: float
+
+    :return: The plan, and the height of each of its stacks.
+    :type: tuple
+    """
+    plan = plan_stacks(bases, middles, tops, count, 1, seed=7,
+                       target_height=target_height, tolerance=tolerance,
+                       heights=heights)
+    return plan, [sum(heights[source] for source in stack) for stack in plan.stacks]
+
+def test_same_seed_same_plan():
+    """
+    The same seed and inputs give the same plan, and another seed gives another plan.
+    """
+    args = (['b1', 'b2'], ['m1', 'm2', 'm3'], ['t1', 't2'], 300, 4)
+    plan = plan_stacks(*args, seed=11)
+    assert plan.stacks == plan_stacks(*args, seed=11).stacks
+    assert plan.stacks != plan_stacks(*args, seed=12).stacks
+    assert StackPlan.from_dict(plan.to_dict()).key == plan.key
+
+def test_slices_match_whole_plan():
+    """
+    Every slice of stacks, as planned by one process of a pool, is the same as that
+    slice of the plan planned in one process, with and without a target height.
+    """
+    heights = {'b': 1.0, 'm1': 0.3, 'm2': 0.7, 'm3': 1.1, 't': 0.5}
+    for target_height in (None, 4.0):
+        args = (['b'], ['m1', 'm2', 'm3'], ['t'], 3, 21, target_height, 0.05, heights)
+        whole = plan_stack_range(*args, 0, 90)
+        assert whole == plan_stack_range(*args, 0, 40) + plan_stack_range(*args, 40, 90)
+        assert whole == plan_stacks(['b'], ['m1', 'm2', 'm3'], ['t'], 90, 3, seed=21,
+                                    target_height=target_height, tolerance=0.05,
+                                    heights=heights).stacks
+
+def test_slices_match_whole_layout():
+    """
+    Laying out slices of the stacks, below and above the size laid out with arrays,
+    gives the same translations as laying them out together.
+    """
+    rng = random.Random(3)
+    source_boxes = {}
+    for source in ('b', 'm1', 'm2', 't'):
+        low = [rng.uniform(-2, 2) for axis in range(3)]
+        source_boxes[source] = low + [value + rng.uniform(0.5, 2) for value in low]
+    stacks = plan_stacks(['b'], ['m1', 'm2'], ['t'], ARRAY_LAYOUT_MIN + 10, 3,
+                         seed=2).stacks
+    whole = layout_stacks(stacks, source_boxes, [0, 0, 0])
+    parts = (layout_stack_range(source_boxes, [0, 0, 0], stacks[:10])
+             + layout_stack_range(source_boxes, [0, 0, 0], stacks[10:]))
+    assert len(whole) == len(parts) == len(stacks)
+    for stack_translations, part_translations in zip(whole, parts):
+        assert len(stack_translations) == len(part_translations)
+        for point, part_point in zip(stack_translations, part_translations):
+            assert all(abs(value - part_value) < 1e-9
+                       for value, part_value in zip(point, part_point))
+
+def test_reachable_targets_are_met():
+    """
+    Every stack reaches the target when some mix of middle pieces closes it, even when
+    picking pieces one at a time could leave a height no piece can close.
+    """
+    heights = {'b1': 1.0, 'b2': 1.5, 'm1': 0.3, 'm2': 0.7, 'm3': 1.1, 't': 0.5}
+    plan, stack_heights = plan_heights(['b1', 'b2'], ['m1', 'm2', 'm3'], ['t'],
+                                       heights, 500, 6.0, 0.05)
+    assert plan.count_missed() == 0
+    assert all(abs(height - 6.0) <= 0.05 + 1e-9 for height in stack_heights)
+
+def test_exact_targets_match_float_sums():
+    """
+    A tolerance of 0 is met by heights whose sum is only off by rounding.
+    """
+    heights = {'b': 1.0, 'm1': 0.3, 'm2': 0.7, 't': 0.5}
+    plan = plan_heights(['b'], ['m1', 'm2'], ['t'], heights, 200, 2.8, 0)[0]
+    assert plan.count_missed() == 0
+
+def test_pieces_with_no_height_do_not_fill_stacks():
+    """
+    A piece with no height is never added just to fill a stack, so a target that cannot
+    be met still gives short stacks, within a piece of the target.
+    """
+    heights = {'b': 1.0, 'plane': 0.0, 'box': 1.0, 't': 0.5}
+    for target_height in (5.0, 5.25):
+        plan, stack_heights = plan_heights(['b'], ['plane', 'box'], ['t'], heights, 20,
+                                           target_height, 0)
+        assert all(len(stack) < MAX_FILL_PIECES for stack in plan.stacks)
+        assert all(abs(height - target_height) <= heights['box'] + 1e-9
+                   for height in stack_heights)
+        assert all(stack.count('plane') <= 1 for stack in plan.stacks)
+
+def test_reachable_targets_with_pieces_of_no_height():
+    """
+    Stacks whose pieces include one with no height still reach a target they can.
+    """
+    heights = {'b': 1.0, 'plane': 0.0, 'box': 1.0, 't': 0.5}
+    plan = plan_heights(['b'], ['plane', 'box'], ['t'], heights, 20, 5.5, 0)[0]
+    assert plan.count_missed() == 0
+    assert all(len(stack) < 10 for stack in plan.stacks)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+#SETMODE 777
+
+#----------------------------------------------------------------------------------------#
+#------------------------------------------------------------------------------ HEADER --#
+
+"""
+:author:
+    kpm200000
+
+:synopsis:
+    This module is a Maya command plugin that runs OpenMaya DG modifiers as one
+    undoable command.
+
+:description:
+    Setting many attributes with a single OpenMaya DG modifier is much faster than one
+    command per attribute, but the changes a modifier makes when its doIt is called
+    directly are not added to the undo queue. This module registers the tdDoModifier
+    command, which runs the modifier handed to it by run_modifier and keeps it, so that
+    undoing and redoing the command call the modifier's undoIt and doIt. The module
+    loads itself as a plugin the first time run_modifier is called.
+
+:applications:
+    Maya
+
+:see_also:
+    gen_utils
+"""
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- IMPORTS --#
+
+# Default Python Imports
+import os
+import maya.cmds as cmds
+import maya.api.OpenMaya as om
+
+# Imports That You Wrote
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- CONSTANTS --#
+
+# The name of the command the plugin registers
+COMMAND_NAME = 'tdDoModifier'
+
+# The modifiers waiting for the command to run them. The plugin is loaded by Maya as a
+#   module of its own, so the command always reads them from the td_maya_tools module
+PENDING_MODIFIERS = []
+
+#----------------------------------------------------------------------------------------#
+#--------------------------------------------------------------------------- FUNCTIONS --#
+
+def run_modifier(modifier=None):
+    """
+    This function runs a DG modifier through the tdDoModifier command, so that its
+    changes undo and redo in one step, loading the plugin first if it is not loaded.
+
+    :param modifier: The modifier to run.
+    :type: om.MDGModifier
+    """
+    plugin_path = os.path.abspath(__file__)
+    if not cmds.pluginInfo(plugin_path, query=True, loaded=True):
+        cmds.loadPlugin(plugin_path, quiet=True)
+    PENDING_MODIFIERS.append(modifier)
+    try:
+        getattr(cmds, COMMAND_NAME)()
+    finally:
+        # Do not leave the modifier behind if the command failed before taking it
+        if modifier in PENDING_MODIFIERS:
+            PENDING_MODIFIERS.remove(modifier)
+
+def maya_useNewAPI():
+    """
+    Tells Maya that the plugin uses the Python API 2.0.
+    """
+    pass
+
+def initializePlugin(plugin=None):
+    """
+    Registers the tdDoModifier command when the plugin is loaded.
+
+    :param plugin: The plugin being loaded.
+    :type: om.MObject
+    """
+    om.MFnPlugin(plugin).registerCommand(COMMAND_NAME, DoModifierCommand.creator)
+
+def uninitializePlugin(plugin=None):
+    """
+    Removes the tdDoModifier command when the plugin is unloaded.
+
+    :param plugin: The plugin being unloaded.
+    :type: om.MObject
+    """
+    om.MFnPlugin(plugin).deregisterCommand(COMMAND_NAME)
+
+#----------------------------------------------------------------------------------------#
+#----------------------------------------------------------------------------- CLASSES --#
+
+class DoModifierCommand(om.MPxCommand):
+    """
+    The tdDoModifier command. It takes the modifier handed to run_modifier, runs it, and
+    keeps it so that the command can be undone and redone.
+    """
+    def __init__(self):
+        om.MPxCommand.__init__(self)
+        # The modifier this command ran
+        self.modifier = None
+
+    def doIt(self, args=None):
+        # Take the modifier from the td_maya_tools module, which run_modifier filled
+        from td_maya_tools.undo_modifier import PENDING_MODIFIERS as pending_modifiers
+        self.modifier = pending_modifiers.pop()
+        self.modifier.doIt()
+
+    def redoIt(self):
+        self.modifier.doIt()
+
+    def undoIt(self):
+        self.modifier.undoIt()
+
+    def isUndoable(self):
+        return True
+
+    @classmethod
+    def creator(cls):
+        """
+        Makes a new instance of the command for Maya.
+
+        :return: The command.
+        :type: DoModifierCommand
+        """
+        return cls()